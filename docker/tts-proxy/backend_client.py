@@ -0,0 +1,214 @@
+"""
+TTS 백엔드 HTTP 클라이언트
+
+keep-alive 연결 풀(requests.Session)과 동시 요청 수 제한(세마포어)으로
+openai-edge-tts 등 백엔드에 대한 연결을 재사용합니다.
+"""
+import time
+import random
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import STAGE_SECONDS, AUDIO_BYTES
+
+logger = logging.getLogger(__name__)
+
+_BACKEND_SECONDS = STAGE_SECONDS.labels('backend')
+_HEADERS_SECONDS = STAGE_SECONDS.labels('backend_headers')
+_BACKEND_BYTES = AUDIO_BYTES.labels('backend_in')
+# 재시도 지연에 더하는 무작위 지연 상한 (초)
+_RETRY_JITTER = 0.5
+
+
+def retry_budget(connect_timeout: float, read_timeout: float, max_retries: int,
+                 retry_base_delay: float) -> float:
+    """
+    synthesize()가 BackendError로 끝나기까지 걸릴 수 있는 최대 시간 (초)
+
+    시도마다 연결/응답 타임아웃을 모두 채우고, 시도 사이에 최대 지터를 더한 지수 백오프를
+    기다린다고 보고 계산합니다 (동시 요청 슬롯 대기는 제외).
+    """
+    attempts = max(1, max_retries)
+    backoff = sum(retry_base_delay * (2 ** attempt) + _RETRY_JITTER for attempt in range(attempts - 1))
+    return attempts * (connect_timeout + read_timeout) + backoff
+
+
+class BackendError(Exception):
+    """TTS 백엔드 요청 실패 (재시도 소진)"""
+
+
+class BackendStream:
+    """
+    스트리밍 백엔드 응답 래퍼
+
+    close() 시 응답을 닫고 동시 요청 슬롯을 반환합니다.
+    """
+
+    def __init__(self, response: requests.Response, release):
+        self._response = response
+        self._release = release
+        self._closed = False
+
+    def iter_content(self, chunk_size: int):
+        for chunk in self._response.iter_content(chunk_size=chunk_size):
+            _BACKEND_BYTES.inc(len(chunk))
+            yield chunk
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._response.close()
+        finally:
+            self._release()
+
+
+class BackendClient:
+    """
+    연결 풀 기반 TTS 백엔드 클라이언트
+
+    동시 요청 수는 max_in_flight로 제한되며, 슬롯 대기 시간과 풀 사용량을
+    get_metrics()로 확인할 수 있습니다.
+    """
+
+    def __init__(self, base_url: str, max_in_flight: int = 8,
+                 connect_timeout: float = 5.0, read_timeout: float = 120.0,
+                 max_retries: int = 3, retry_base_delay: float = 1.0):
+        """
+        Args:
+            base_url: 백엔드 기본 URL
+            max_in_flight: 동시 백엔드 요청 상한 (연결 풀 크기와 동일)
+            connect_timeout: TCP 연결 타임아웃 (초)
+            read_timeout: 응답 대기 타임아웃 (초)
+            max_retries: 최대 시도 횟수
+            retry_base_delay: 지수 백오프 기본 지연 (초)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.max_in_flight = max_in_flight
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+
+        self._session = requests.Session()
+        self._adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight)
+        self._session.mount('http://', self._adapter)
+        self._session.mount('https://', self._adapter)
+
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._metrics_lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._requests = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _acquire(self) -> None:
+        """동시 요청 슬롯 획득 (대기 시간 기록)"""
+        started = time.monotonic()
+        self._slots.acquire()
+        waited = time.monotonic() - started
+        with self._metrics_lock:
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            self._requests += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+    def _release(self) -> None:
+        with self._metrics_lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def synthesize(self, payload: dict, stream: bool = False):
+        """
+        지수 백오프 재시도로 /v1/audio/speech 요청
+
+        재시도 대기 중에는 슬롯을 반환하므로 다른 요청이 진행할 수 있습니다.
+
+        Args:
+            payload: 요청 본문
+            stream: True이면 본문을 읽지 않은 BackendStream 반환 (호출자가 close 책임)
+
+        Returns:
+            오디오 바이트, stream=True이면 BackendStream
+
+        Raises:
+            BackendError: 모든 재시도 실패 시
+        """
+        url = f"{self.base_url}/v1/audio/speech"
+        last_error = None
+        for attempt in range(self.max_retries):
+            self._acquire()
+            started = time.perf_counter()
+            response = None
+            try:
+                response = self._session.post(url, json=payload, timeout=self.timeout, stream=stream)
+                response.raise_for_status()
+                if stream:
+                    _HEADERS_SECONDS.observe(time.perf_counter() - started)
+                    return BackendStream(response, self._release)
+                audio_data = response.content
+                self._release()
+                _BACKEND_SECONDS.observe(time.perf_counter() - started)
+                _BACKEND_BYTES.inc(len(audio_data))
+                return audio_data
+            except requests.RequestException as e:
+                # 스트리밍 응답은 본문을 읽지 않았으므로 닫아야 연결이 풀로 돌아감
+                if response is not None:
+                    response.close()
+                self._release()
+                last_error = e
+                if attempt < self.max_retries - 1:
+                    delay = self.retry_base_delay * (2 ** attempt) + random.uniform(0, _RETRY_JITTER)
+                    logger.warning(
+                        f"TTS backend retry {attempt + 1}/{self.max_retries} "
+                        f"after {delay:.1f}s: {e}"
+                    )
+                    time.sleep(delay)
+            except BaseException:
+                if response is not None:
+                    response.close()
+                self._release()
+                raise
+
+        logger.error(f"TTS backend failed after {self.max_retries} retries: {last_error}")
+        raise BackendError(str(last_error))
+
+    def _pool_stats(self) -> dict:
+        """urllib3 연결 풀 상태 (생성된 연결 수, 유휴 연결 수)"""
+        created = 0
+        idle = 0
+        try:
+            pools = self._adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                created += pool.num_connections
+                if pool.pool is not None:
+                    # 풀 큐는 maxsize만큼 None 자리표시로 채워져 있으므로 실제 연결만 셈
+                    idle += sum(conn is not None for conn in list(pool.pool.queue))
+        except Exception as e:
+            logger.debug(f"Pool stats unavailable: {e}")
+        return {'connectionsCreated': created, 'idleConnections': idle}
+
+    def get_metrics(self) -> dict:
+        """풀 사용량 및 슬롯 대기 시간 지표"""
+        with self._metrics_lock:
+            requests_count = self._requests
+            metrics = {
+                'maxInFlight': self.max_in_flight,
+                'inFlight': self._in_flight,
+                'peakInFlight': self._peak_in_flight,
+                'requests': requests_count,
+                'waitTimeAvgMs': round(self._wait_total / requests_count * 1000, 2) if requests_count else 0.0,
+                'waitTimeMaxMs': round(self._wait_max * 1000, 2),
+            }
+        metrics['utilization'] = round(metrics['inFlight'] / self.max_in_flight, 3)
+        metrics.update(self._pool_stats())
+        metrics['connectTimeout'], metrics['readTimeout'] = self.timeout
+        return metrics
@@ -0,0 +1,123 @@
+"""
+HTTP 처리량 벤치마크
+
+실행 중인 tts-proxy에 keep-alive 연결로 동시 요청을 보내 처리량과 지연 분포를 측정합니다.
+--sse로 측정 동안 유휴 SSE 연결을 열어 두면 SSE 연결이 합성 요청 처리 용량을 얼마나
+차지하는지 함께 볼 수 있습니다. 표준 라이브러리만 사용합니다.
+
+실행:
+    python bench_http.py http://localhost:5051 [--path PATH] [--concurrency N] [--duration 초] [--sse N]
+
+기본 경로는 캐시 히트 GET /api/tts이므로 측정 전에 같은 요청을 한 번 보내 캐시를 채웁니다
+(백엔드 속도와 무관하게 프록시 자체의 처리량을 측정).
+"""
+import sys
+import time
+import argparse
+import threading
+import http.client
+from urllib.parse import urlsplit
+
+DEFAULT_PATH = '/api/tts?text=%EB%B2%A4%EC%B9%98%EB%A7%88%ED%81%AC&voice=ko-KR-SunHiNeural'
+
+
+def _connect(base):
+    cls = http.client.HTTPSConnection if base.scheme == 'https' else http.client.HTTPConnection
+    return cls(base.hostname, base.port, timeout=30)
+
+
+def _open_sse(base, path: str, count: int) -> list:
+    """유휴 SSE 연결 count개를 열어 둠 (리다이렉트는 한 번 따라감)"""
+    streams = []
+    for _ in range(count):
+        target, url = base, path
+        for _ in range(2):
+            conn = _connect(target)
+            conn.request('GET', url, headers={'Accept': 'text/event-stream'})
+            response = conn.getresponse()
+            if response.status in (301, 302, 307, 308):
+                location = urlsplit(response.getheader('Location'))
+                target, url = location, location.path + (f'?{location.query}' if location.query else '')
+                conn.close()
+                continue
+            break
+        if response.status != 200:
+            raise RuntimeError(f"SSE connect failed: HTTP {response.status}")
+        streams.append((conn, response))
+    return streams
+
+
+def _worker(base, path: str, deadline: float, latencies: list, errors: list) -> None:
+    conn = _connect(base)
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = _connect(base)
+            continue
+        latencies.append(time.perf_counter() - started)
+    conn.close()
+
+
+def _percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('url', help='서버 기본 URL (예: http://localhost:5051)')
+    parser.add_argument('--path', default=DEFAULT_PATH, help='측정할 GET 경로')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=20.0)
+    parser.add_argument('--sse', type=int, default=0, help='측정 동안 열어 둘 유휴 SSE 연결 수')
+    args = parser.parse_args()
+
+    base = urlsplit(args.url)
+
+    # 캐시 채우기 (첫 요청은 백엔드 합성)
+    conn = _connect(base)
+    conn.request('GET', args.path)
+    warmup = conn.getresponse()
+    warmup.read()
+    conn.close()
+    if warmup.status != 200:
+        sys.exit(f"warm-up request failed: HTTP {warmup.status}")
+
+    streams = _open_sse(base, '/api/events/playback', args.sse) if args.sse else []
+
+    per_thread = [([], []) for _ in range(args.concurrency)]
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(target=_worker, args=(base, args.path, deadline, latencies, errors))
+        for latencies, errors in per_thread
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    for conn, _ in streams:
+        conn.close()
+
+    latencies = sorted(value for thread_latencies, _ in per_thread for value in thread_latencies)
+    errors = [error for _, thread_errors in per_thread for error in thread_errors]
+    print(f"{args.url}{args.path[:40]}  concurrency={args.concurrency} duration={elapsed:.1f}s sse={args.sse}")
+    print(f"  requests: {len(latencies)}  errors: {len(errors)}  throughput: {len(latencies) / elapsed:.1f} req/s")
+    print(f"  latency ms: p50 {_percentile(latencies, 0.5) * 1000:.1f}  "
+          f"p90 {_percentile(latencies, 0.9) * 1000:.1f}  p99 {_percentile(latencies, 0.99) * 1000:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+VAD PCM 변환 마이크로벤치마크
+
+60초 16kHz mono 클립으로 vad_processor의 PCM → float32 변환(_pydub_to_array, VAD 입력 경로)을
+기존 구현(샘플별 Python 객체 경유)과 비교합니다. torch가 설치되어 있으면 텐서 변환도 비교합니다
+(텐서 변환 함수는 비교용으로 이 파일에만 있음).
+
+실행:
+    python bench_pcm.py [반복 횟수]
+"""
+import sys
+import struct
+import timeit
+
+import numpy as np
+from pydub import AudioSegment
+
+from vad_processor import _pydub_to_array
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+CLIP_SECONDS = 60
+SAMPLE_RATE = 16000
+
+
+def _legacy_pydub_to_array(audio_segment: AudioSegment) -> np.ndarray:
+    samples = audio_segment.get_array_of_samples()
+    max_val = float(2 ** (audio_segment.sample_width * 8 - 1))
+    return np.array(list(samples), dtype=np.float32) / max_val
+
+
+def _pydub_to_tensor(audio_segment: AudioSegment) -> "torch.Tensor":
+    """pydub AudioSegment → torch float32 텐서 [1, samples]"""
+    return torch.from_numpy(_pydub_to_array(audio_segment)).unsqueeze(0)
+
+
+def _tensor_to_pydub(tensor: "torch.Tensor", sample_rate: int) -> AudioSegment:
+    """torch float32 텐서 [1, samples] → pydub AudioSegment (16-bit mono)"""
+    samples = (tensor.squeeze().clamp(-1, 1) * 32767).to(torch.int16)
+    raw_data = samples.numpy().astype('<i2', copy=False).tobytes()
+    return AudioSegment(data=raw_data, sample_width=2, frame_rate=sample_rate, channels=1)
+
+
+def _legacy_pydub_to_tensor(audio_segment: AudioSegment) -> "torch.Tensor":
+    samples = audio_segment.get_array_of_samples()
+    max_val = float(2 ** (audio_segment.sample_width * 8 - 1))
+    tensor = torch.FloatTensor(list(samples)) / max_val
+    return tensor.unsqueeze(0)
+
+
+def _legacy_tensor_to_pydub(tensor: "torch.Tensor", sample_rate: int) -> AudioSegment:
+    samples = (tensor.squeeze().clamp(-1, 1) * 32767).to(torch.int16)
+    raw_data = struct.pack(f'<{len(samples)}h', *samples.tolist())
+    return AudioSegment(data=raw_data, sample_width=2, frame_rate=sample_rate, channels=1)
+
+
+def _make_clip() -> AudioSegment:
+    rng = np.random.default_rng(0)
+    pcm = rng.integers(-20000, 20000, CLIP_SECONDS * SAMPLE_RATE, dtype=np.int16)
+    return AudioSegment(data=pcm.astype('<i2').tobytes(), sample_width=2,
+                        frame_rate=SAMPLE_RATE, channels=1)
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    clip = _make_clip()
+
+    # 두 구현의 결과가 같은지 먼저 확인
+    assert np.allclose(_pydub_to_array(clip), _legacy_pydub_to_array(clip))
+    cases = [
+        ('pydub → array', lambda: _legacy_pydub_to_array(clip), lambda: _pydub_to_array(clip)),
+    ]
+    if torch is not None:
+        tensor = _pydub_to_tensor(clip)
+        assert torch.allclose(tensor, _legacy_pydub_to_tensor(clip))
+        assert _tensor_to_pydub(tensor, SAMPLE_RATE).raw_data == _legacy_tensor_to_pydub(tensor, SAMPLE_RATE).raw_data
+        cases += [
+            ('pydub → tensor', lambda: _legacy_pydub_to_tensor(clip), lambda: _pydub_to_tensor(clip)),
+            ('tensor → pydub', lambda: _legacy_tensor_to_pydub(tensor, SAMPLE_RATE),
+             lambda: _tensor_to_pydub(tensor, SAMPLE_RATE)),
+        ]
+    else:
+        print("torch not installed: skipping tensor conversions")
+
+    print(f"{CLIP_SECONDS}s clip @ {SAMPLE_RATE}Hz, best of {repeat}")
+    for name, legacy, current in cases:
+        legacy_s = min(timeit.repeat(legacy, number=1, repeat=repeat))
+        current_s = min(timeit.repeat(current, number=1, repeat=repeat))
+        print(f"  {name}: legacy {legacy_s * 1000:8.1f}ms  vectorized {current_s * 1000:8.2f}ms  "
+              f"({legacy_s / current_s:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
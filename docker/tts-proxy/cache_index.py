@@ -0,0 +1,249 @@
+"""
+TTS 캐시 항목 인덱스
+
+캐시 파일별 크기, 생성 시각, 마지막 접근 시각, 히트 수를 메모리에 유지합니다.
+정렬된 키 목록으로 축약형(접두사) 키를 O(log n)에 찾고, 디스크 용량 제한을 위한
+eviction 후보 선정과 크기/개수 통계에 사용합니다.
+
+메타데이터는 SQLite 파일에 배치로 기록되어 재시작 후에도 접근 기록이 유지됩니다.
+"""
+import time
+import heapq
+import bisect
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+EVICTION_POLICIES = ('lru', 'lfu')
+
+
+class CacheEntry:
+    """캐시 항목 메타데이터"""
+
+    __slots__ = ('size', 'created', 'last_access', 'hits')
+
+    def __init__(self, size: int, created: float, last_access: float = None, hits: int = 0):
+        self.size = size
+        self.created = created
+        self.last_access = last_access if last_access is not None else created
+        self.hits = hits
+
+
+class CacheIndex:
+    """
+    캐시 키 → CacheEntry 인덱스 (스레드 안전)
+
+    변경 사항은 flush() 호출 시 SQLite에 반영됩니다 (db_path가 없으면 메모리 전용).
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self._entries: Dict[str, CacheEntry] = {}
+        self._sorted_keys: List[str] = []
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+
+        self._db_path = db_path
+        self._db_lock = threading.Lock()
+        self._dirty: Set[str] = set()
+        self._deleted: Set[str] = set()
+        self._cleared = False
+
+    # -------------------------------------------------------------------------
+    # 영속화
+    # -------------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self._db_path), timeout=10)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'key TEXT PRIMARY KEY, size INTEGER, created REAL, last_access REAL, hits INTEGER)'
+        )
+        return conn
+
+    def _load_rows(self) -> Dict[str, CacheEntry]:
+        if self._db_path is None:
+            return {}
+        try:
+            with self._db_lock:
+                conn = self._connect()
+                try:
+                    rows = conn.execute('SELECT key, size, created, last_access, hits FROM entries').fetchall()
+                finally:
+                    conn.close()
+            return {key: CacheEntry(size, created, last_access, hits)
+                    for key, size, created, last_access, hits in rows}
+        except Exception as e:
+            logger.warning(f"Failed to load cache index, rebuilding from directory: {e}")
+            return {}
+
+    def load(self, files: Iterable[Tuple[str, int, float]]) -> None:
+        """
+        저장된 메타데이터를 읽고 디스크의 캐시 파일 목록과 대조해 인덱스 재구성
+
+        디스크에만 있는 파일은 mtime 기준으로 추가하고, 파일이 사라진 항목은 제거합니다.
+
+        Args:
+            files: 캐시 디렉토리의 (키, 크기, mtime) 목록
+        """
+        stored = self._load_rows()
+        entries = {}
+        total = 0
+        for key, size, mtime in files:
+            if key in entries:
+                total -= entries[key].size  # 이전 형식과 분산 경로에 모두 있음 (이동 중 중단)
+            entry = stored.get(key)
+            if entry is None or entry.size != size:
+                entry = CacheEntry(size, mtime)
+                self._dirty.add(key)
+            entries[key] = entry
+            total += size
+
+        with self._lock:
+            self._entries = entries
+            self._sorted_keys = sorted(entries)
+            self.total_bytes = total
+            self._deleted.update(key for key in stored if key not in entries)
+        self.flush()
+
+    def flush(self) -> None:
+        """변경된 항목을 SQLite에 기록"""
+        if self._db_path is None:
+            return
+        with self._lock:
+            if not (self._dirty or self._deleted or self._cleared):
+                return
+            cleared = self._cleared
+            deleted = list(self._deleted)
+            rows = [(key, e.size, e.created, e.last_access, e.hits)
+                    for key, e in ((key, self._entries.get(key)) for key in self._dirty) if e is not None]
+            self._dirty = set()
+            self._deleted = set()
+            self._cleared = False
+
+        try:
+            with self._db_lock:
+                conn = self._connect()
+                try:
+                    with conn:
+                        if cleared:
+                            conn.execute('DELETE FROM entries')
+                        conn.executemany('DELETE FROM entries WHERE key = ?', ((key,) for key in deleted))
+                        conn.executemany('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)', rows)
+                finally:
+                    conn.close()
+        except Exception as e:
+            logger.error(f"Failed to save cache index: {e}")
+
+    # -------------------------------------------------------------------------
+    # 조회/갱신
+    # -------------------------------------------------------------------------
+
+    def add(self, key: str, size: int) -> None:
+        """항목 추가 또는 덮어쓰기"""
+        now = time.time()
+        with self._lock:
+            old = self._entries.get(key)
+            if old is not None:
+                self.total_bytes -= old.size
+                old.size = size
+                old.last_access = now
+            else:
+                self._entries[key] = CacheEntry(size, now)
+                bisect.insort(self._sorted_keys, key)
+            self.total_bytes += size
+            self._dirty.add(key)
+            self._deleted.discard(key)
+
+    def touch(self, key: str) -> None:
+        """캐시 히트 기록"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.last_access = time.time()
+                entry.hits += 1
+                self._dirty.add(key)
+
+    def remove(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.total_bytes -= entry.size
+                i = bisect.bisect_left(self._sorted_keys, key)
+                if i < len(self._sorted_keys) and self._sorted_keys[i] == key:
+                    del self._sorted_keys[i]
+                self._dirty.discard(key)
+                self._deleted.add(key)
+            return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sorted_keys = []
+            self.total_bytes = 0
+            self._dirty = set()
+            self._deleted = set()
+            self._cleared = True
+
+    def size_of(self, key: str) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.size if entry is not None else None
+
+    def find_prefix(self, prefix: str) -> Optional[str]:
+        """접두사로 시작하는 첫 번째 키 (사전순). 없으면 None."""
+        with self._lock:
+            i = bisect.bisect_left(self._sorted_keys, prefix)
+            if i < len(self._sorted_keys) and self._sorted_keys[i].startswith(prefix):
+                return self._sorted_keys[i]
+            return None
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def is_dirty(self) -> bool:
+        with self._lock:
+            return bool(self._dirty or self._deleted or self._cleared)
+
+    def eviction_candidates(self, policy: str, bytes_to_free: int, files_to_free: int) -> List[str]:
+        """
+        가치가 낮은 순으로 제거 대상 키 선정
+
+        Args:
+            policy: 'lru' (오래 접근하지 않은 순) 또는 'lfu' (히트 수 적은 순, 동률이면 LRU)
+            bytes_to_free: 확보할 바이트 수
+            files_to_free: 줄일 파일 수
+
+        Returns:
+            제거할 키 목록
+        """
+        if bytes_to_free <= 0 and files_to_free <= 0:
+            return []
+
+        if policy == 'lfu':
+            rank = lambda item: (item[1].hits, item[1].last_access)
+        else:
+            rank = lambda item: item[1].last_access
+
+        with self._lock:
+            snapshot = list(self._entries.items())
+
+        # 대부분 소수만 제거하므로 전체 정렬 대신 부분 선택부터 시도
+        limit = max(files_to_free, 64)
+        while True:
+            ordered = heapq.nsmallest(limit, snapshot, key=rank)
+            selected = []
+            freed = 0
+            for key, entry in ordered:
+                if freed >= bytes_to_free and len(selected) >= files_to_free:
+                    break
+                selected.append(key)
+                freed += entry.size
+            if (freed >= bytes_to_free and len(selected) >= files_to_free) or limit >= len(snapshot):
+                return selected
+            limit *= 4
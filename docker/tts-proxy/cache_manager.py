@@ -1,110 +1,617 @@
 """
 TTS 캐시 및 사용량 추적 모듈
 
-캐시 키 생성, 통계 수집, 일별 사용량 추적을 담당합니다.
+캐시 키 생성, 캐시 파일 입출력, 통계 수집, 일별 사용량 추적을 담당합니다.
+
+캐시 파일은 키 앞 4글자로 2단계 분산한 tts-cache/ab/cd/<key>.mp3에 저장합니다. 한 디렉토리에
+수십만 개의 파일이 쌓이면 ext4/NFS의 디렉토리 조작이 느려지기 때문입니다. 이전 형식
+(tts-cache/<key>.mp3)의 파일은 서버 실행 중 백그라운드에서 옮기며(cache_migrate.py로 직접
+실행 가능), 옮기는 동안에는 두 위치를 모두 조회합니다.
 """
+import os
 import json
+import fcntl
 import time
+import zlib
 import hashlib
 import logging
 import threading
+from collections import OrderedDict
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+from cache_index import CacheIndex, EVICTION_POLICIES
+from metrics import STAGE_SECONDS, AUDIO_BYTES, ThreadShards
 
 logger = logging.getLogger(__name__)
 
+_LOOKUP_SECONDS = STAGE_SECONDS.labels('cache_lookup')
+_WRITE_SECONDS = STAGE_SECONDS.labels('cache_write')
+_WRITE_BYTES = AUDIO_BYTES.labels('cache_write')
+
+
+# 파일 식별 토큰 (inode, mtime_ns): 같은 경로의 파일이 교체되었는지 판단
+FileToken = Tuple[int, int]
+
+
+def file_token(st: os.stat_result) -> FileToken:
+    return st.st_ino, st.st_mtime_ns
+
+
+class HotCache:
+    """
+    바이트 예산 기반 인메모리 LRU (디스크 캐시 앞단의 hot tier)
+
+    예산의 1/4을 넘는 항목은 다른 항목을 과도하게 밀어내지 않도록 저장하지 않습니다.
+    항목마다 원본 파일의 (inode, mtime_ns)를 함께 보관해, 여러 프로세스가 같은 디렉토리를
+    쓸 때 다른 프로세스가 바꾸거나 지운 파일인지 확인할 수 있습니다.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[bytes, Optional[FileToken]]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[bytes, Optional[FileToken]]]:
+        """(데이터, 파일 토큰) 조회. 없으면 None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def accepts(self, size: int) -> bool:
+        """이 크기의 항목을 hot tier에 보관하는지 여부"""
+        return 0 < size <= self.max_bytes // 4
+
+    def put(self, key: str, data: bytes, token: Optional[FileToken] = None) -> None:
+        if not self.accepts(len(data)):
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[0])
+            self._entries[key] = (data, token)
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[0])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def size_of(self, key: str) -> Optional[int]:
+        """LRU 순서를 바꾸지 않고 항목 크기 조회"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return len(entry[0]) if entry is not None else None
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                'hotHits': self.hits,
+                'hotMisses': self.misses,
+                'hotEntries': len(self._entries),
+                'hotBytes': self._bytes,
+                'hotMaxBytes': self.max_bytes,
+            }
+
+
+# 요청 통계 항목 (스레드별 배열의 인덱스 순서)
+STAT_FIELDS = (
+    'totalRequests', 'cacheHits', 'cacheMisses', 'backendRequests',
+    'errors', 'coalescedRequests', 'evictions', 'evictedBytes', 'checksumFailures',
+)
+(_TOTAL, _HITS, _MISSES, _BACKEND, _ERRORS, _COALESCED,
+ _EVICTIONS, _EVICTED_BYTES, _CHECKSUM_FAILURES) = range(len(STAT_FIELDS))
+
+CACHE_SUFFIX = '.mp3'
+# 파일과 함께 rename되는 확장 속성에 내용의 CRC32를 기록 (임시 파일에 기록 후 교체)
+_CHECKSUM_ATTR = 'user.tts.crc32'
+# 백그라운드 VAD 트리밍 전 오디오 표시 (트리밍 결과로 교체되면 새 파일에는 없음)
+_UNTRIMMED_ATTR = 'user.tts.untrimmed'
+_HEX_CHARS = frozenset('0123456789abcdef')
+# 이 시간보다 오래된 임시 파일은 기록 중 중단된 것으로 보고 시작 시 삭제
+_STALE_TMP_SECONDS = 3600
+
+
+def shard_path(cache_dir: Path, key: str) -> Path:
+    """캐시 키의 분산 경로 (ab/cd/<key>.mp3, 4글자보다 짧은 키는 '_'로 채움)"""
+    prefix = key[:4].ljust(4, '_')
+    return cache_dir / prefix[:2] / prefix[2:] / f"{key}{CACHE_SUFFIX}"
+
+
+def scan_cache_dir(cache_dir: Path, stale_tmp_seconds: float = _STALE_TMP_SECONDS
+                   ) -> Iterator[Tuple[str, str, os.stat_result, bool]]:
+    """
+    캐시 파일 순회 (분산 경로와 이전 형식 모두)
+
+    기록 중 중단되어 남은 오래된 임시 파일은 순회하면서 삭제합니다.
+
+    Returns:
+        (키, 파일 경로, stat, 이전 형식 여부) 이터레이터
+    """
+    now = time.time()
+
+    def visit(directory: str, depth: int):
+        with os.scandir(directory) as it:
+            for dirent in it:
+                name = dirent.name
+                if dirent.is_dir(follow_symlinks=False):
+                    if depth < 2 and len(name) == 2:
+                        yield from visit(dirent.path, depth + 1)
+                    continue
+                if name.endswith('.tmp'):
+                    try:
+                        if now - dirent.stat().st_mtime > stale_tmp_seconds:
+                            os.unlink(dirent.path)
+                            logger.info(f"Removed stale temp file: {name}")
+                    except OSError:
+                        pass
+                    continue
+                if depth in (0, 2) and name.endswith(CACHE_SUFFIX) and dirent.is_file():
+                    yield name[:-len(CACHE_SUFFIX)], dirent.path, dirent.stat(), depth == 0
+
+    yield from visit(str(cache_dir), 0)
+
+
+def migrate_flat_layout(cache_dir: Path, batch: int = 200, pause: float = 0.01,
+                        stop: Optional[threading.Event] = None) -> int:
+    """
+    이전 형식(tts-cache/<key>.mp3) 파일을 분산 경로로 이동 (서버 실행 중에도 안전)
+
+    하드 링크 후 원본을 지우므로 이동 중에도 어느 한쪽 경로에는 파일이 있고, 분산 경로에 이미
+    파일이 있으면(이전 형식보다 나중에 기록됨) 덮어쓰지 않고 원본만 지웁니다. 여러 프로세스가
+    동시에 실행해도 됩니다. 하드 링크를 지원하지 않는 파일시스템에서는 rename으로 옮깁니다.
+
+    Args:
+        cache_dir: 캐시 디렉토리
+        batch: 이 개수만큼 옮길 때마다 pause초 쉼 (디스크 I/O 양보)
+        pause: 쉬는 시간 (초)
+        stop: 설정되면 중단
+
+    Returns:
+        옮긴(또는 정리한) 파일 수
+    """
+    with os.scandir(cache_dir) as it:
+        names = [dirent.name for dirent in it if dirent.name.endswith(CACHE_SUFFIX) and dirent.is_file()]
+
+    moved = 0
+    for name in names:
+        if stop is not None and stop.is_set():
+            break
+        source = cache_dir / name
+        target = shard_path(cache_dir, name[:-len(CACHE_SUFFIX)])
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(source, target)
+        except FileExistsError:
+            pass
+        except FileNotFoundError:
+            continue  # 다른 프로세스가 옮겼거나 삭제함
+        except OSError:
+            # 하드 링크를 지원하지 않는 파일시스템 (일부 네트워크/FUSE 마운트): rename으로 이동.
+            # 확인과 rename 사이에 기록된 분산 경로 파일은 같은 키의 이전 오디오로 덮일 수 있음
+            if not target.exists():
+                try:
+                    os.replace(source, target)
+                except FileNotFoundError:
+                    continue
+                moved += 1
+                if moved % batch == 0:
+                    time.sleep(pause)
+                continue
+        try:
+            source.unlink()
+        except FileNotFoundError:
+            continue
+        moved += 1
+        if moved % batch == 0:
+            time.sleep(pause)
+    return moved
+
+
+def _xattr_supported(cache_dir: Path) -> bool:
+    """캐시 디렉토리의 파일 시스템이 사용자 확장 속성을 지원하는지 확인"""
+    if not hasattr(os, 'setxattr'):
+        return False
+    probe = cache_dir / f".xattr-probe.{os.getpid()}.tmp"
+    try:
+        with open(probe, 'wb') as f:
+            os.setxattr(f.fileno(), _CHECKSUM_ATTR, b'0')
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.unlink(missing_ok=True)
+
+
+def stored_checksum(fd: int) -> Optional[int]:
+    """파일에 기록된 CRC32 (없으면 None: 체크섬 도입 전 파일)"""
+    try:
+        return int(os.getxattr(fd, _CHECKSUM_ATTR), 16)
+    except (OSError, ValueError):
+        return None
+
+
+class ChecksumError(Exception):
+    """캐시 파일 내용이 기록된 체크섬과 다름 (잘린 파일 등)"""
+
+
+def _atomic_write_json(path: Path, data) -> None:
+    """한 줄 JSON을 임시 파일에 쓴 뒤 rename (읽는 쪽은 이전 내용 또는 새 내용만 봄)"""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class UsageTracker:
+    """
+    일별 사용량 (문자 수, 요청 수)
+
+    요청 경로에서는 날짜별 스레드 배열에 락 없이 누적합니다. 기록할 때는 마지막 기록 이후 늘어난
+    양만 usage.json의 현재 내용에 더하므로(merge → commit), 여러 워커 프로세스가 같은 파일을
+    기록해도 서로의 사용량을 덮어쓰지 않습니다. 지난 날짜의 배열은 한 번 더 기록 주기를 기다린 뒤
+    (자정 직후 늦게 도착한 기록 포함) 정리되고, retention_days보다 오래된 날짜는 월별
+    합계(monthlyUsage)로 압축하므로 파일 크기가 일정하게 유지됩니다.
+    """
+
+    def __init__(self, retention_days: int = 90):
+        """
+        Args:
+            retention_days: 일별로 보관할 일수 (0이면 압축하지 않음)
+        """
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        # 마지막으로 기록(또는 읽은) 파일 내용: [문자 수, 요청 수]
+        self._total = [0, 0]
+        self._daily: Dict[str, list] = {}
+        self._monthly: Dict[str, list] = {}
+        # 날짜별 스레드 배열과 그중 이미 파일에 반영한 양
+        self._live: Dict[str, ThreadShards] = {}
+        self._flushed: Dict[str, list] = {}
+        self._stale = set()
+        self._today = ''
+        self._next_day_at = 0.0
+
+    def _current_day(self) -> str:
+        """오늘 날짜 문자열 (자정까지 캐시)"""
+        if time.time() >= self._next_day_at:
+            now = datetime.now()
+            midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+            self._today = now.strftime('%Y-%m-%d')
+            self._next_day_at = midnight.timestamp()
+        return self._today
+
+    def add(self, characters: int) -> None:
+        day = self._current_day()
+        shards = self._live.get(day)
+        if shards is None:
+            with self._lock:
+                shards = self._live.setdefault(day, ThreadShards(2))
+        values = shards.shard()
+        values[0] += characters
+        values[1] += 1
+
+    @staticmethod
+    def _parse(data: dict) -> Tuple[list, Dict[str, list], Dict[str, list]]:
+        """usage.json 내용 → (합계, 일별, 월별) (이전의 들여쓰기 형식도 그대로 읽음)"""
+        total = [int(data.get('totalCharacters', 0)), int(data.get('totalRequests', 0))]
+        daily, monthly = {}, {}
+        for target, source in ((daily, data.get('dailyUsage', {})), (monthly, data.get('monthlyUsage', {}))):
+            for period, value in source.items():
+                target[period] = [int(value.get('characters', 0)), int(value.get('requests', 0))]
+        return total, daily, monthly
+
+    @staticmethod
+    def _as_dict(total: list, daily: Dict[str, list], monthly: Dict[str, list]) -> dict:
+        def periods(values):
+            return {period: {'characters': c, 'requests': r} for period, (c, r) in sorted(values.items())}
+
+        return {
+            'totalCharacters': total[0],
+            'totalRequests': total[1],
+            'dailyUsage': periods(daily),
+            'monthlyUsage': periods(monthly),
+        }
+
+    def load(self, data: dict) -> None:
+        """usage.json 내용을 기준값으로 반영"""
+        with self._lock:
+            self._total, self._daily, self._monthly = self._parse(data)
+
+    def _compact(self, daily: Dict[str, list], monthly: Dict[str, list]) -> None:
+        if self.retention_days <= 0:
+            return
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime('%Y-%m-%d')
+        for day in [day for day in daily if day < cutoff]:
+            month = monthly.setdefault(day[:7], [0, 0])
+            chars, requests = daily.pop(day)
+            month[0] += chars
+            month[1] += requests
+
+    def _add_pending_locked(self, total: list, daily: Dict[str, list]) -> Dict[str, list]:
+        """아직 파일에 반영하지 않은 양을 total/daily에 더하고, 날짜별 현재 누적값 반환"""
+        taken = {}
+        for day, shards in self._live.items():
+            totals = shards.totals()
+            flushed = self._flushed.get(day, (0, 0))
+            value = daily.setdefault(day, [0, 0])
+            for i in range(2):
+                value[i] += totals[i] - flushed[i]
+                total[i] += totals[i] - flushed[i]
+            taken[day] = totals
+        return taken
+
+    def merge(self, stored: Optional[dict]) -> Tuple[dict, Dict[str, list]]:
+        """
+        파일의 현재 내용(없으면 마지막 기준값)에 아직 반영하지 않은 양을 더한 기록 내용 계산
+
+        호출자는 파일 잠금을 잡은 채 파일을 읽고, 결과를 기록한 뒤 commit()을 호출합니다.
+
+        Returns:
+            (기록할 usage.json 내용, commit()에 넘길 날짜별 누적값)
+        """
+        with self._lock:
+            if stored is None:
+                total, daily, monthly = list(self._total), dict(self._daily), dict(self._monthly)
+            else:
+                total, daily, monthly = self._parse(stored)
+            daily = {day: list(value) for day, value in daily.items()}
+            monthly = {month: list(value) for month, value in monthly.items()}
+            taken = self._add_pending_locked(total, daily)
+            self._compact(daily, monthly)
+            return self._as_dict(total, daily, monthly), taken
+
+    def commit(self, merged: dict, taken: Dict[str, list]) -> None:
+        """merge() 결과를 기록했으면 새 기준값으로 삼고, 더 이상 기록되지 않는 지난 날짜 배열을 정리"""
+        with self._lock:
+            self._total, self._daily, self._monthly = self._parse(merged)
+            today = self._current_day()
+            for day, totals in taken.items():
+                self._flushed[day] = list(totals)
+                if day == today:
+                    continue
+                if day in self._stale and self._live[day].totals() == self._flushed[day]:
+                    # 한 주기 전부터 지난 날짜이고 모두 반영됨
+                    del self._live[day]
+                    del self._flushed[day]
+                    self._stale.discard(day)
+                else:
+                    self._stale.add(day)
+
+    def snapshot(self) -> dict:
+        """
+        현재 사용량 (기준값 + 아직 기록하지 않은 양, 보관 기간 압축 적용)
+
+        Returns:
+            {totalCharacters, totalRequests, dailyUsage, monthlyUsage}
+        """
+        return self.merge(None)[0]
+
 
 class CacheManager:
     """TTS 캐시 통계 및 사용량 관리"""
 
-    def __init__(self, data_dir: Path):
+    def __init__(self, data_dir: Path, hot_cache_bytes: int = 0,
+                 max_bytes: int = 0, max_files: int = 0,
+                 eviction_policy: str = 'lru', eviction_interval: float = 60,
+                 usage_retention_days: int = 90, checksum: bool = False,
+                 migrate_legacy: bool = True, shared: bool = False):
+        """
+        Args:
+            data_dir: 데이터 디렉토리 (캐시 파일은 하위 tts-cache/에 저장)
+            hot_cache_bytes: 인메모리 hot tier 예산 (0이면 비활성화)
+            max_bytes: 디스크 캐시 최대 크기 (0이면 무제한)
+            max_files: 디스크 캐시 최대 파일 수 (0이면 무제한)
+            eviction_policy: 'lru' 또는 'lfu'
+            eviction_interval: 백그라운드 eviction 점검 주기 (초)
+            usage_retention_days: 일별 사용량 보관 일수 (이전 날짜는 월별로 압축, 0이면 무제한)
+            checksum: 파일에 CRC32를 기록하고 디스크에서 읽을 때 검증 (확장 속성 미지원 시 비활성화)
+            migrate_legacy: 이전 형식(평면 디렉토리) 파일을 백그라운드에서 분산 경로로 이동
+            shared: 여러 프로세스(gunicorn 워커)가 같은 디렉토리를 사용. 인덱스는 디스크로 확인하고
+                (다른 프로세스가 저장/삭제한 파일 반영), hot tier 항목은 파일이 그대로인지 확인하며,
+                eviction은 잠금 파일을 잡은 프로세스 하나만 실행합니다.
+        """
         self.data_dir = data_dir
         self.cache_dir = data_dir / 'tts-cache'
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hot = HotCache(hot_cache_bytes)
+        self.shared = shared
+
+        self._xattrs = _xattr_supported(self.cache_dir)
+        if checksum and not self._xattrs:
+            logger.warning(f"Extended attributes not supported on {self.cache_dir}, cache checksums disabled")
+            checksum = False
+        self.checksum = checksum
+        # 확장 속성 미지원 시 트리밍 전 항목 표시를 프로세스 메모리에만 유지 (재시작/다른 워커와 공유 안 됨)
+        self._untrimmed = set()
+        # 큰 파일(경로로 응답)의 검증 결과: 키 → (inode, mtime_ns). 교체되면 다시 검증
+        self._verified: Dict[str, Tuple[int, int]] = {}
+
+        if eviction_policy not in EVICTION_POLICIES:
+            logger.warning(f"Unknown eviction policy '{eviction_policy}', using lru")
+            eviction_policy = 'lru'
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.eviction_policy = eviction_policy
+        self._eviction_interval = eviction_interval
+        self._eviction_wakeup = threading.Event()
+        self._eviction_lock = threading.Lock()
+        self._eviction_lock_fd: Optional[int] = None
+        # 파일 교체/삭제 직렬화 (replace()의 확인-교체가 그 사이 삭제/덮어쓰기와 겹치지 않도록)
+        self._write_lock = threading.Lock()
+
+        # 캐시 항목 인덱스 (접두사 조회, 크기/개수 통계, eviction 후보)
+        self.index = CacheIndex(data_dir / 'cache-index.db')
+        self._legacy_files = 0
+        self.index.load(self._scan_files())
+        logger.info(f"Cache index loaded: {self.index.count()} entries, "
+                    f"{self.index.total_bytes / 1024 / 1024:.1f}MB")
 
         self._stats_file = data_dir / 'stats.json'
         self._usage_file = data_dir / 'usage.json'
 
-        self._stats_lock = threading.Lock()
-        self._usage_lock = threading.Lock()
-
-        # 통계 초기화
-        self.stats = {
-            'totalRequests': 0,
-            'cacheHits': 0,
-            'cacheMisses': 0,
-            'backendRequests': 0,
-            'errors': 0,
-            'startTime': int(time.time())
-        }
+        # 통계: 파일에서 읽은 값 + 스레드별 배열 중 아직 기록하지 않은 양 (요청 경로에서 락을 잡지 않음)
+        self._stats_base = dict.fromkeys(STAT_FIELDS, 0)
+        self._start_time = int(time.time())
+        self._stat_shards = ThreadShards(len(STAT_FIELDS))
+        self._stats_flushed = [0] * len(STAT_FIELDS)
 
-        # 사용량 초기화
-        self.usage = {
-            'totalCharacters': 0,
-            'totalRequests': 0,
-            'dailyUsage': {}
-        }
+        # 사용량: 날짜별 스레드 배열 + 보관 기간 지난 날짜는 월별 압축
+        self.usage_tracker = UsageTracker(usage_retention_days)
 
-        # 배치 쓰기 설정 (매 요청마다 디스크 쓰기 방지)
-        self._dirty_stats = False
-        self._dirty_usage = False
+        # 배치 쓰기: 백그라운드 스레드가 주기적으로 변경분만 기록 (요청마다 타이머를 만들지 않음)
         self._flush_interval = 10  # 초
-        self._flush_timer = None
         self._flush_lock = threading.Lock()
+        self._flush_stop = threading.Event()
+        # 여러 프로세스의 stats.json/usage.json 읽기-병합-기록 직렬화
+        self._merge_lock_path = data_dir / 'stats.lock'
 
         # 기존 데이터 로드
         self._load_stats()
         self._load_usage()
 
+        thread = threading.Thread(target=self._flush_loop, name='cache-flush', daemon=True)
+        thread.start()
+
+        # 이전 형식 파일 이동 (끝날 때까지 두 위치를 모두 조회)
+        if self._legacy_files and migrate_legacy:
+            thread = threading.Thread(target=self._migrate_loop, name='cache-migrate', daemon=True)
+            thread.start()
+
+        # 용량 제한이 설정되면 백그라운드 eviction 시작
+        if self.max_bytes > 0 or self.max_files > 0:
+            thread = threading.Thread(target=self._eviction_loop, name='cache-eviction', daemon=True)
+            thread.start()
+            logger.info(
+                f"Cache eviction enabled: policy={self.eviction_policy}, "
+                f"max_bytes={self.max_bytes}, max_files={self.max_files}"
+            )
+
+    def _scan_files(self) -> Iterator[Tuple[str, int, float]]:
+        """인덱스 재구성용 (키, 크기, mtime) 순회 (이전 형식 파일 수 집계)"""
+        for key, _, st, legacy in scan_cache_dir(self.cache_dir):
+            if legacy:
+                self._legacy_files += 1
+            yield key, st.st_size, st.st_mtime
+
+    def _migrate_loop(self):
+        logger.info(f"Migrating {self._legacy_files} cache file(s) to sharded layout...")
+        started = time.monotonic()
+        try:
+            moved = migrate_flat_layout(self.cache_dir, stop=self._flush_stop)
+        except Exception as e:
+            logger.error(f"Cache layout migration failed (legacy paths stay readable): {e}")
+            return
+        if not self._flush_stop.is_set():
+            self._legacy_files = 0
+        logger.info(f"Cache layout migration done: {moved} file(s) in {time.monotonic() - started:.1f}s")
+
+    @staticmethod
+    def _read_json(path: Path) -> Optional[dict]:
+        """JSON 파일 읽기 (없거나 손상되었으면 None)"""
+        try:
+            return json.loads(path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to read {path.name}: {e}")
+            return None
+
+    def _apply_stats(self, stored: dict) -> None:
+        for field in STAT_FIELDS:
+            self._stats_base[field] = int(stored.get(field, 0))
+        self._start_time = int(stored.get('startTime', self._start_time))
+
     def _load_stats(self):
-        if self._stats_file.exists():
-            try:
-                self.stats.update(json.loads(self._stats_file.read_text(encoding='utf-8')))
-            except Exception as e:
-                logger.warning(f"Failed to load stats: {e}")
+        stored = self._read_json(self._stats_file)
+        if stored is not None:
+            self._apply_stats(stored)
 
     def _load_usage(self):
-        if self._usage_file.exists():
+        stored = self._read_json(self._usage_file)
+        if stored is not None:
+            self.usage_tracker.load(stored)
+
+    def _flush_loop(self):
+        while not self._flush_stop.wait(self._flush_interval):
             try:
-                self.usage.update(json.loads(self._usage_file.read_text(encoding='utf-8')))
+                self.flush()
             except Exception as e:
-                logger.warning(f"Failed to load usage: {e}")
+                logger.error(f"Cache flush failed: {e}")
+
+    def flush(self):
+        """
+        바뀐 통계/사용량/인덱스를 디스크에 기록 (종료 시에도 호출)
+
+        통계와 사용량은 파일 잠금(stats.lock)을 잡고 파일을 다시 읽어, 마지막 기록 이후 이 프로세스에서
+        늘어난 양만 더해 기록합니다. 다른 워커가 기록한 값은 기준값으로 가져오므로 조회 결과에도 반영됩니다.
+        """
+        with self._flush_lock:
+            fd = os.open(self._merge_lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                self._merge_stats()
+                self._merge_usage()
+            finally:
+                os.close(fd)
+            if self.index.is_dirty():
+                self.index.flush()
 
-    def _save_stats(self):
+    def _merge_stats(self) -> None:
+        totals = self._stat_shards.totals()
+        stored = self._read_json(self._stats_file)
+        if stored is not None:
+            self._apply_stats(stored)
+        delta = [total - flushed for total, flushed in zip(totals, self._stats_flushed)]
+        if not any(delta) and stored is not None:
+            return
+        merged = {field: self._stats_base[field] + delta[i] for i, field in enumerate(STAT_FIELDS)}
+        merged['startTime'] = self._start_time
         try:
-            self._stats_file.write_text(
-                json.dumps(self.stats, ensure_ascii=False, indent=2), encoding='utf-8'
-            )
+            _atomic_write_json(self._stats_file, merged)
         except Exception as e:
             logger.error(f"Failed to save stats: {e}")
+            return
+        self._apply_stats(merged)
+        self._stats_flushed = totals
 
-    def _save_usage(self):
+    def _merge_usage(self) -> None:
+        stored = self._read_json(self._usage_file)
+        merged, taken = self.usage_tracker.merge(stored)
+        if stored is not None and merged == stored:
+            self.usage_tracker.commit(merged, taken)
+            return
         try:
-            self._usage_file.write_text(
-                json.dumps(self.usage, ensure_ascii=False, indent=2), encoding='utf-8'
-            )
+            _atomic_write_json(self._usage_file, merged)
         except Exception as e:
             logger.error(f"Failed to save usage: {e}")
-
-    def _schedule_flush(self):
-        """변경사항이 있으면 타이머 기반 배치 쓰기 예약"""
-        with self._flush_lock:
-            if self._flush_timer is not None:
-                return  # 이미 예약됨
-            self._flush_timer = threading.Timer(self._flush_interval, self._flush)
-            self._flush_timer.daemon = True
-            self._flush_timer.start()
-
-    def _flush(self):
-        """더티 플래그에 따라 디스크에 실제 기록"""
-        with self._flush_lock:
-            self._flush_timer = None
-            if self._dirty_stats:
-                self._save_stats()
-                self._dirty_stats = False
-            if self._dirty_usage:
-                self._save_usage()
-                self._dirty_usage = False
+            return
+        self.usage_tracker.commit(merged, taken)
 
     @staticmethod
     def generate_cache_key(text: str, voice: str, rate: str = None) -> str:
@@ -113,43 +620,500 @@ class CacheManager:
         return hashlib.sha256(key_data.encode('utf-8')).hexdigest()
 
     def cache_path(self, key: str) -> Path:
-        """캐시 키에 대응하는 파일 경로"""
-        return self.cache_dir / f"{key}.mp3"
-
-    def update_stats(self, cache_hit: bool = False, backend_request: bool = False, error: bool = False):
-        """통계 업데이트"""
-        with self._stats_lock:
-            self.stats['totalRequests'] += 1
-            if cache_hit:
-                self.stats['cacheHits'] += 1
-            else:
-                self.stats['cacheMisses'] += 1
-            if backend_request:
-                self.stats['backendRequests'] += 1
-            if error:
-                self.stats['errors'] += 1
-            self._dirty_stats = True
-        self._schedule_flush()
+        """캐시 키에 대응하는 파일 경로 (분산 경로)"""
+        return shard_path(self.cache_dir, key)
+
+    def _candidate_paths(self, key: str) -> Tuple[Path, ...]:
+        """
+        조회할 경로 순서
+
+        이전 형식 파일을 옮기는 중이면 분산 경로 → 이전 경로 → 분산 경로(그 사이 옮겨진 경우) 순서로 봅니다.
+        """
+        path = self.cache_path(key)
+        if not self._legacy_files:
+            return (path,)
+        return (path, self.cache_dir / f"{key}{CACHE_SUFFIX}", path)
+
+    def _read_file(self, path: Path) -> Tuple[bytes, FileToken]:
+        """파일 읽기 (체크섬 사용 시 같은 파일 디스크립터의 확장 속성과 대조). (데이터, 파일 토큰) 반환."""
+        with open(path, 'rb') as f:
+            data = f.read()
+            st = os.fstat(f.fileno())
+            if self.checksum:
+                expected = stored_checksum(f.fileno())
+                if expected is not None and expected != zlib.crc32(data):
+                    self._discard_corrupt(path, st)
+                    raise ChecksumError(path.name)
+        return data, file_token(st)
+
+    def _verify_file(self, key: str, path: Path) -> bool:
+        """큰 파일을 경로로 응답하기 전 검증 (inode/mtime이 같으면 한 번만). 손상되었으면 False."""
+        try:
+            with open(path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                if self._verified.get(key) == file_token(st):
+                    return True
+                expected = stored_checksum(f.fileno())
+                if expected is not None:
+                    crc = 0
+                    for block in iter(lambda: f.read(1024 * 1024), b''):
+                        crc = zlib.crc32(block, crc)
+                    if crc != expected:
+                        self._discard_corrupt(path, st)
+                        return False
+        except FileNotFoundError:
+            return False
+        self._verified[key] = file_token(st)
+        return True
+
+    def _discard_corrupt(self, path: Path, st: os.stat_result) -> None:
+        """체크섬이 맞지 않는 파일 삭제 (그 사이 다른 파일로 교체되었으면 건드리지 않음)"""
+        self._stat_shards.shard()[_CHECKSUM_FAILURES] += 1
+        logger.warning(f"Cache checksum mismatch, discarding {path.name[:16]}...")
+        key = path.name[:-len(CACHE_SUFFIX)]
+        self.hot.discard(key)
+        self._verified.pop(key, None)
+        try:
+            with self._write_lock:
+                current = os.stat(path)
+                if file_token(current) == file_token(st):
+                    os.unlink(path)
+                    self.index.remove(key)
+        except FileNotFoundError:
+            self.index.remove(key)
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        """디스크에서 읽어 hot tier에 적재. 없거나 손상되었으면 None."""
+        for path in self._candidate_paths(key):
+            try:
+                data, token = self._read_file(path)
+                break
+            except FileNotFoundError:
+                continue
+            except ChecksumError:
+                return None
+        else:
+            return None
+        self.hot.put(key, data, token)
+        # 다른 프로세스가 저장한 파일이면 인덱스에 등록
+        if self.index.size_of(key) is None:
+            self.index.add(key, len(data))
+        return data
+
+    def read(self, key: str) -> Optional[bytes]:
+        """캐시 오디오 조회 (hot tier → 디스크). 없으면 None."""
+        with _LOOKUP_SECONDS.time():
+            return self._read(key)
+
+    def _disk_stat(self, key: str) -> Optional[os.stat_result]:
+        for path in self._candidate_paths(key):
+            try:
+                return os.stat(path)
+            except FileNotFoundError:
+                continue
+        return None
+
+    def _hot_get(self, key: str) -> Optional[bytes]:
+        """hot tier 조회 (공유 모드에서는 다른 프로세스가 파일을 교체/삭제했으면 버리고 None)"""
+        entry = self.hot.get_entry(key)
+        if entry is None:
+            return None
+        data, token = entry
+        if self.shared:
+            st = self._disk_stat(key)
+            if st is None or file_token(st) != token:
+                self.hot.discard(key)
+                return None
+        return data
+
+    def _read(self, key: str) -> Optional[bytes]:
+        data = self._hot_get(key)
+        if data is None:
+            data = self._read_disk(key)
+            if data is None:
+                return None
+        self.index.touch(key)
+        return data
+
+    def lookup(self, key: str) -> Union[bytes, Path, None]:
+        """
+        HTTP 응답용 캐시 조회
+
+        hot tier에 있거나 보관 대상 크기이면 메모리의 bytes를, 그보다 크거나
+        hot tier가 꺼져 있으면 내용을 읽지 않고 파일 경로를 반환합니다
+        (파일 전송은 WSGI file wrapper/sendfile에 맡김). 없으면 None.
+        """
+        with _LOOKUP_SECONDS.time():
+            return self._lookup(key)
+
+    def _lookup(self, key: str) -> Union[bytes, Path, None]:
+        data = self._hot_get(key)
+        if data is None:
+            size = self.entry_size(key)
+            if size is not None and not self.hot.accepts(size):
+                path = self._existing_path(key)
+                if path is None or (self.checksum and not self._verify_file(key, path)):
+                    return None
+                self.index.touch(key)
+                return path
+            data = self._read_disk(key)
+            if data is None:
+                return None
+        self.index.touch(key)
+        return data
+
+    def _existing_path(self, key: str) -> Optional[Path]:
+        if not self._legacy_files:
+            return self.cache_path(key)
+        for path in self._candidate_paths(key):
+            if path.exists():
+                return path
+        return None
+
+    def _write_tmp(self, tmp_path: Path, data: bytes, untrimmed: bool) -> FileToken:
+        """임시 파일 기록. rename 후에도 같은 (inode, mtime_ns) 토큰 반환."""
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()  # 토큰의 mtime이 close 시점의 버퍼 기록으로 바뀌지 않도록
+            if self.checksum:
+                os.setxattr(f.fileno(), _CHECKSUM_ATTR, b'%08x' % zlib.crc32(data))
+            if untrimmed and self._xattrs:
+                os.setxattr(f.fileno(), _UNTRIMMED_ATTR, b'1')
+            return file_token(os.fstat(f.fileno()))
+
+    def write(self, key: str, data: bytes, untrimmed: bool = False) -> FileToken:
+        """
+        캐시 오디오 저장 (디스크 + hot tier)
+
+        같은 디렉토리의 임시 파일에 쓴 뒤 rename하므로 읽는 쪽은 이전 내용 또는 새 내용만
+        보게 됩니다. 체크섬과 트리밍 전 표시는 rename 전에 임시 파일에 기록되어 내용과 함께 교체됩니다.
+
+        Args:
+            untrimmed: VAD 트리밍 전 오디오 (is_untrimmed()/untrimmed_entries()에 반영)
+
+        Returns:
+            저장된 파일의 토큰 (replace()/mark_trimmed()에 전달)
+        """
+        return self._write(key, data, untrimmed=untrimmed)
+
+    def replace(self, key: str, data: bytes, expected: FileToken) -> bool:
+        """
+        write()가 반환한 토큰의 파일이 그대로일 때만 내용 교체 (백그라운드 트리밍 결과 반영용)
+
+        그 사이 삭제/덮어쓰기/eviction된 항목은 건너뜁니다. 확인과 rename은 쓰기 락 안에서
+        수행합니다 (다른 프로세스의 쓰기와는 직렬화되지 않음).
+
+        Returns:
+            교체했으면 True
+        """
+        return self._write(key, data, expected) is not None
+
+    def mark_trimmed(self, key: str, expected: FileToken) -> bool:
+        """
+        트리밍할 무음이 없던 항목의 트리밍 전 표시 제거 (토큰의 파일이 그대로일 때만)
+
+        Returns:
+            표시를 제거했으면 True
+        """
+        with self._write_lock:
+            st = self._disk_stat(key)
+            if st is None or file_token(st) != expected:
+                return False
+            self._untrimmed.discard(key)
+            if self._xattrs:
+                try:
+                    os.removexattr(self._existing_path(key), _UNTRIMMED_ATTR)
+                except OSError:
+                    pass
+        return True
+
+    def is_untrimmed(self, key: str) -> bool:
+        """
+        VAD 트리밍 전 오디오인지 (저장 시 untrimmed=True이고 아직 교체/표시 제거 전)
+
+        표시는 파일의 확장 속성이므로 재시작 후나 다른 워커가 저장한 항목에도 적용됩니다.
+        """
+        if not self._xattrs:
+            return key in self._untrimmed
+        for path in self._candidate_paths(key):
+            try:
+                os.getxattr(path, _UNTRIMMED_ATTR)
+                return True
+            except FileNotFoundError:
+                continue
+            except OSError:
+                return False
+        return False
+
+    def untrimmed_entries(self) -> Iterator[Tuple[str, bytes, FileToken]]:
+        """
+        디스크의 트리밍 전 항목 순회: (키, 데이터, 파일 토큰) (시작 시 백그라운드 트리밍 재등록용)
+
+        여러 프로세스가 같은 디렉토리를 쓰면 잠금 파일을 잡은 프로세스 하나만 순회하고,
+        나머지는 아무것도 반환하지 않습니다. 확장 속성 미지원 시에도 빈 순회입니다.
+        """
+        if not self._xattrs:
+            return
+        fd = os.open(self.data_dir / 'vad-requeue.lock', os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return
+            for key, path, _, _ in scan_cache_dir(self.cache_dir):
+                try:
+                    os.getxattr(path, _UNTRIMMED_ATTR)
+                    data, token = self._read_file(path)
+                except (OSError, ChecksumError):
+                    continue
+                yield key, data, token
+        finally:
+            os.close(fd)
+
+    def _write(self, key: str, data: bytes, expected: Optional[FileToken] = None,
+               untrimmed: bool = False) -> Optional[FileToken]:
+        path = self.cache_path(key)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with _WRITE_SECONDS.time():
+            try:
+                try:
+                    token = self._write_tmp(tmp_path, data, untrimmed)
+                except FileNotFoundError:
+                    # 분산 디렉토리의 첫 파일
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    token = self._write_tmp(tmp_path, data, untrimmed)
+                with self._write_lock:
+                    if expected is not None:
+                        st = self._disk_stat(key)
+                        if st is None or file_token(st) != expected:
+                            tmp_path.unlink(missing_ok=True)
+                            return None
+                    os.replace(tmp_path, path)
+                    if untrimmed:
+                        self._untrimmed.add(key)
+                    else:
+                        self._untrimmed.discard(key)
+                    self.hot.put(key, data, token)
+                    self.index.add(key, len(data))
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+        _WRITE_BYTES.inc(len(data))
+        if self._over_limit():
+            self._eviction_wakeup.set()
+        return token
+
+    def contains(self, key: str) -> bool:
+        """캐시 존재 여부 (인덱스 기준, 공유 모드에서는 파일 stat 한 번)"""
+        return self.entry_size(key) is not None
+
+    def entry_size(self, key: str) -> Optional[int]:
+        """
+        캐시 항목 크기 (바이트). 없으면 None.
+
+        단독 모드에서는 인덱스만 보며, 공유 모드에서는 디스크를 확인해 다른 프로세스가
+        저장/삭제한 결과를 인덱스에 반영합니다.
+        """
+        if not self.shared:
+            return self.index.size_of(key)
+        st = self._disk_stat(key)
+        if st is None:
+            if self.index.remove(key) is not None:
+                self.hot.discard(key)
+            return None
+        if self.index.size_of(key) != st.st_size:
+            self.index.add(key, st.st_size)
+        return st.st_size
+
+    def resolve_key(self, key: str) -> Optional[str]:
+        """전체 키 또는 축약형(접두사) 키를 실제 캐시 키로 변환 (O(log n)). 없으면 None."""
+        if self.contains(key):
+            return key
+        found = self.index.find_prefix(key)
+        if not self.shared:
+            return found
+        # 다른 프로세스가 지운 항목은 건너뛰고, 인덱스에 없으면 분산 디렉토리에서 찾음
+        while found is not None and not self.contains(found):
+            found = self.index.find_prefix(key)
+        return found if found is not None else self._find_prefix_on_disk(key)
+
+    def _find_prefix_on_disk(self, prefix: str) -> Optional[str]:
+        """접두사가 4글자 이상이면 해당 분산 디렉토리 하나만 읽어 첫 번째 키 반환"""
+        if len(prefix) < 4 or not _HEX_CHARS.issuperset(prefix):
+            return None
+        try:
+            names = os.listdir(shard_path(self.cache_dir, prefix).parent)
+        except FileNotFoundError:
+            return None
+        keys = sorted(name[:-len(CACHE_SUFFIX)] for name in names
+                      if name.startswith(prefix) and name.endswith(CACHE_SUFFIX))
+        for key in keys:
+            if self.contains(key):
+                return key
+        return None
+
+    def _unlink(self, key: str) -> bool:
+        """캐시 파일 삭제 (이전 형식 경로 포함). 삭제했으면 True."""
+        self._verified.pop(key, None)
+        self._untrimmed.discard(key)
+        deleted = False
+        with self._write_lock:
+            for path in set(self._candidate_paths(key)):
+                try:
+                    path.unlink()
+                    deleted = True
+                except FileNotFoundError:
+                    pass
+        return deleted
+
+    def delete(self, key: str) -> bool:
+        """캐시 항목 삭제 (hot tier 포함). 삭제했으면 True."""
+        self.hot.discard(key)
+        self.index.remove(key)
+        return self._unlink(key)
+
+    def clear(self) -> int:
+        """전체 캐시 삭제 (hot tier 포함). 삭제된 파일 수 반환."""
+        self.hot.clear()
+        self.index.clear()
+        self._verified.clear()
+        self._untrimmed.clear()
+        deleted_count = 0
+        for _, path, _, _ in scan_cache_dir(self.cache_dir):
+            try:
+                with self._write_lock:
+                    os.unlink(path)
+                deleted_count += 1
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Failed to delete {os.path.basename(path)}: {e}")
+        return deleted_count
+
+    def _over_limit(self) -> bool:
+        return ((self.max_bytes > 0 and self.index.total_bytes > self.max_bytes) or
+                (self.max_files > 0 and self.index.count() > self.max_files))
+
+    def evict(self) -> int:
+        """
+        용량 제한을 넘으면 가치가 낮은 항목부터 제거
+
+        한도의 90%까지 줄여 매 쓰기마다 eviction이 반복되지 않도록 합니다.
+
+        Returns:
+            제거된 파일 수
+        """
+        with self._eviction_lock:
+            if not self._over_limit():
+                return 0
+            bytes_to_free = 0
+            files_to_free = 0
+            if self.max_bytes > 0 and self.index.total_bytes > self.max_bytes:
+                bytes_to_free = self.index.total_bytes - int(self.max_bytes * 0.9)
+            if self.max_files > 0 and self.index.count() > self.max_files:
+                files_to_free = self.index.count() - int(self.max_files * 0.9)
+
+            evicted = 0
+            reclaimed = 0
+            for key in self.index.eviction_candidates(self.eviction_policy, bytes_to_free, files_to_free):
+                entry = self.index.remove(key)
+                self.hot.discard(key)
+                try:
+                    self._unlink(key)
+                except Exception as e:
+                    logger.warning(f"Failed to evict {key[:16]}...: {e}")
+                    continue
+                evicted += 1
+                reclaimed += entry.size if entry is not None else 0
+
+        if evicted:
+            values = self._stat_shards.shard()
+            values[_EVICTIONS] += evicted
+            values[_EVICTED_BYTES] += reclaimed
+            logger.info(f"Cache eviction ({self.eviction_policy}): {evicted} files, {reclaimed / 1024 / 1024:.1f}MB reclaimed")
+        return evicted
+
+    def _holds_eviction_lock(self) -> bool:
+        """
+        공유 모드의 eviction 담당 프로세스인지 (잠금 파일을 잡은 프로세스 하나만 실행)
+
+        잡은 프로세스가 종료되면 잠금이 풀려 다음 점검 때 다른 프로세스가 이어받습니다.
+        """
+        if self._eviction_lock_fd is not None:
+            return True
+        fd = os.open(self.data_dir / 'cache-eviction.lock', os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._eviction_lock_fd = fd
+        logger.info(f"Cache eviction owner: pid {os.getpid()}")
+        return True
+
+    def _reload_index(self) -> None:
+        """다른 프로세스의 저장/삭제와 접근 기록을 반영해 인덱스 재구성 (공유 모드 eviction 전)"""
+        self.index.flush()
+        self.index.load((key, st.st_size, st.st_mtime) for key, _, st, _ in scan_cache_dir(self.cache_dir))
+
+    def _eviction_loop(self):
+        """주기적으로(또는 쓰기로 한도 초과 시 즉시) eviction 실행"""
+        while True:
+            self._eviction_wakeup.wait(self._eviction_interval)
+            self._eviction_wakeup.clear()
+            if self.shared and not self._holds_eviction_lock():
+                continue
+            try:
+                if self.shared:
+                    self._reload_index()
+                self.evict()
+            except Exception as e:
+                logger.error(f"Cache eviction failed: {e}")
+
+    def update_stats(self, cache_hit: bool = False, backend_request: bool = False, error: bool = False,
+                     coalesced: bool = False):
+        """통계 업데이트 (coalesced: 진행 중인 동일 키 요청의 결과를 공유한 미스)"""
+        values = self._stat_shards.shard()
+        values[_TOTAL] += 1
+        values[_HITS if cache_hit else _MISSES] += 1
+        if backend_request:
+            values[_BACKEND] += 1
+        if error:
+            values[_ERRORS] += 1
+        if coalesced:
+            values[_COALESCED] += 1
 
     def update_usage(self, text: str):
         """사용량 업데이트"""
-        with self._usage_lock:
-            self.usage['totalCharacters'] += len(text)
-            self.usage['totalRequests'] += 1
-
-            today = datetime.now().strftime('%Y-%m-%d')
-            if today not in self.usage['dailyUsage']:
-                self.usage['dailyUsage'][today] = {'characters': 0, 'requests': 0}
-            self.usage['dailyUsage'][today]['characters'] += len(text)
-            self.usage['dailyUsage'][today]['requests'] += 1
-            self._dirty_usage = True
-        self._schedule_flush()
+        self.usage_tracker.add(len(text))
+
+    @property
+    def stats(self) -> dict:
+        """누적 통계 (파일에서 읽은 값 + 스레드별 배열 합계)"""
+        totals = self._stat_shards.totals()
+        stats = {field: self._stats_base[field] + totals[i] - self._stats_flushed[i]
+                 for i, field in enumerate(STAT_FIELDS)}
+        stats['startTime'] = self._start_time
+        return stats
+
+    def get_usage(self) -> dict:
+        """사용량 (전체 합계, 일별, 보관 기간이 지난 월별 합계)"""
+        return self.usage_tracker.snapshot()
 
     def get_stats_summary(self) -> dict:
         """통계 요약 (캐시 히트율 포함)"""
-        with self._stats_lock:
-            stats = self.stats.copy()
+        stats = self.stats
         stats['uptime'] = int(time.time()) - stats['startTime']
         total = stats['cacheHits'] + stats['cacheMisses']
         stats['cacheHitRate'] = round((stats['cacheHits'] / total) * 100, 2) if total > 0 else 0.0
+        stats.update(self.hot.get_stats())
+        stats.update({
+            'cacheEntries': self.index.count(),
+            'cacheBytes': self.index.total_bytes,
+            'cacheMaxBytes': self.max_bytes,
+            'cacheMaxFiles': self.max_files,
+            'evictionPolicy': self.eviction_policy,
+            'checksumEnabled': self.checksum,
+            'legacyLayoutFiles': self._legacy_files,
+        })
         return stats
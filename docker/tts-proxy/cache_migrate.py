@@ -0,0 +1,64 @@
+"""
+캐시 디렉토리 형식 이전 도구
+
+이전 형식(tts-cache/<key>.mp3)의 캐시 파일을 분산 경로(tts-cache/ab/cd/<key>.mp3)로 옮깁니다.
+서버는 시작 시 같은 작업을 백그라운드로 수행하므로(TTS_CACHE_MIGRATE), 이 도구는 서버를
+띄우기 전에 미리 옮기거나 TTS_CACHE_MIGRATE=false로 운영할 때 사용합니다. 서버 실행 중에
+실행해도 안전합니다. 표준 라이브러리만 사용합니다.
+
+실행:
+    python cache_migrate.py ./data/tts-cache/tts-cache [--verify] [--pause 초]
+
+--verify는 옮긴 뒤 모든 캐시 파일을 읽어 기록된 체크섬(TTS_CACHE_CHECKSUM)과 대조하고,
+맞지 않는 파일 목록을 출력합니다 (삭제하지 않음).
+"""
+import os
+import sys
+import time
+import zlib
+import argparse
+from pathlib import Path
+
+from cache_manager import scan_cache_dir, migrate_flat_layout, stored_checksum
+
+
+def _verify(cache_dir: Path) -> int:
+    """체크섬이 맞지 않는 파일 수 (체크섬이 없는 파일은 건너뜀)"""
+    checked = 0
+    corrupt = 0
+    for _, path, _, _ in scan_cache_dir(cache_dir):
+        with open(path, 'rb') as f:
+            expected = stored_checksum(f.fileno())
+            if expected is None:
+                continue
+            if zlib.crc32(f.read()) != expected:
+                corrupt += 1
+                print(f"  checksum mismatch: {path}")
+        checked += 1
+    print(f"verified {checked} file(s) with checksums, {corrupt} mismatch(es)")
+    return corrupt
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('cache_dir', help='캐시 디렉토리 (TTS_DATA_DIR/tts-cache)')
+    parser.add_argument('--verify', action='store_true', help='체크섬 검증')
+    parser.add_argument('--pause', type=float, default=0.01, help='200개마다 쉬는 시간 (초)')
+    args = parser.parse_args()
+
+    cache_dir = Path(args.cache_dir)
+    if not cache_dir.is_dir():
+        sys.exit(f"not a directory: {cache_dir}")
+
+    started = time.monotonic()
+    moved = migrate_flat_layout(cache_dir, pause=args.pause)
+    print(f"moved {moved} file(s) to sharded layout in {time.monotonic() - started:.1f}s")
+
+    if args.verify and not hasattr(os, 'getxattr'):
+        sys.exit("--verify requires extended attribute support (Linux)")
+    if args.verify and _verify(cache_dir):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+gunicorn 설정 (프로덕션 실행)
+
+    gunicorn -c gunicorn.conf.py server:app
+
+워커 모델:
+- 기본은 워커 프로세스 1개 × 스레드 16개 (gthread). 합성 요청은 백엔드/VAD 대기가 대부분이라
+  스레드로 충분하며, 위치 저장소와 SSE 구독이 프로세스 메모리에 있으므로 워커 1개가 가장 단순합니다.
+- 워커를 2개 이상 두려면 REDIS_ENABLED=true로 워커 간 위치 변경을 중계해야 합니다.
+  이때 각 워커의 asyncio SSE 엔진은 SO_REUSEPORT로 같은 포트를 나눠 받습니다.
+- TTS_ASYNC_PORT를 설정하면 asyncio TTS 엔진이 합성 요청을 워커 스레드 밖(이벤트 루프)에서
+  처리하므로, 느린 백엔드를 기다리는 요청 수만큼 GUNICORN_THREADS를 늘릴 필요가 없습니다.
+- SSE 연결은 asyncio SSE 엔진(SSE_ASYNC_PORT)이 워커 스레드 밖에서 처리합니다. 엔진을 끄면
+  SSE 연결마다 워커 스레드 하나를 점유하므로 GUNICORN_THREADS를 연결 수보다 크게 잡아야 합니다.
+- 워커가 2개 이상이면 TTS_CACHE_SHARED=true가 기본값이 됩니다. 워커마다 hot tier와 캐시 인덱스를
+  따로 가지므로, 인덱스 미스와 hot tier 히트를 디스크로 확인해 다른 워커의 저장/삭제를 반영하고
+  용량 eviction은 잠금 파일을 잡은 워커 하나만 실행합니다.
+- TTS_PROXY_ROLE=tts / sse로 합성과 SSE를 별도 gunicorn 인스턴스(워커 풀)로 나눌 수 있습니다.
+
+앱은 워커마다 import합니다 (preload_app=False). 캐시 기록/Redis 구독 스레드는 import 시점에
+시작되므로 fork 전에 만들면 워커에서 사라집니다.
+"""
+import os
+import secrets
+
+bind = f"{os.environ.get('TTS_PROXY_HOST', '0.0.0.0')}:{os.environ.get('TTS_PROXY_PORT', '5051')}"
+workers = int(os.environ.get('GUNICORN_WORKERS', '1'))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', '16'))
+# gthread의 timeout은 워커 heartbeat 기준 (요청 길이 제한 아님)
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '60'))
+# SIGTERM 후 진행 중인 요청을 기다리는 시간 (열린 SSE 스트림은 이 시간이 지나면 끊김)
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+preload_app = False
+accesslog = '-' if os.environ.get('GUNICORN_ACCESS_LOG', 'false').lower() == 'true' else None
+errorlog = '-'
+
+if workers > 1:
+    os.environ.setdefault('SSE_ASYNC_REUSE_PORT', 'true')
+    os.environ.setdefault('TTS_ASYNC_REUSE_PORT', 'true')
+    # 리다이렉트한 워커와 SSE 연결을 받는 워커가 다를 수 있으므로 토큰 서명 키를 공유
+    os.environ.setdefault('SSE_ASYNC_REDIRECT_SECRET', secrets.token_hex(32))
+    # 워커마다 hot tier/인덱스를 따로 가지므로 다른 워커의 저장/삭제를 디스크로 확인
+    os.environ.setdefault('TTS_CACHE_SHARED', 'true')
+
+
+def on_starting(server):
+    if workers > 1 and os.environ.get('REDIS_ENABLED', 'false').lower() != 'true':
+        server.log.warning(
+            "GUNICORN_WORKERS > 1 without REDIS_ENABLED=true: position updates and SSE events "
+            "stay inside the worker that received them"
+        )
+
+
+def post_worker_init(worker):
+    import server as tts_server
+    tts_server.start_services()
+
+
+def worker_exit(server, worker):
+    import server as tts_server
+    tts_server.shutdown_services()
@@ -0,0 +1,334 @@
+"""
+Prometheus 텍스트 형식 지표
+
+외부 의존성 없이 카운터/게이지/히스토그램을 제공합니다. 값은 스레드별 배열(shard)에
+기록하므로 기록 경로에는 락이 없고, 수집(render) 시점에 합산합니다. 종료된 스레드의
+배열은 수집 시 누적값으로 합쳐 스레드가 계속 생성되어도 메모리가 늘지 않습니다.
+"""
+import time
+import bisect
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 기본 지연 시간 버킷 (초): 1ms ~ 30s
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class ThreadShards:
+    """
+    스레드별 값 배열
+
+    각 스레드는 자기 배열만 수정하므로 락이 필요 없습니다. 읽기는 모든 배열을 합산하며,
+    기록 중인 값과 겹치면 직전/직후 값 중 하나를 보게 됩니다.
+    """
+
+    __slots__ = ('size', '_local', '_shards', '_retired', '_lock')
+
+    def __init__(self, size: int):
+        self.size = size
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, list]] = []
+        self._retired = [0] * size
+        self._lock = threading.Lock()
+
+    def shard(self) -> list:
+        """현재 스레드의 배열 (처음 호출 시 등록)"""
+        try:
+            return self._local.values
+        except AttributeError:
+            values = [0] * self.size
+            with self._lock:
+                self._shards.append((threading.current_thread(), values))
+            self._local.values = values
+            return values
+
+    def totals(self) -> list:
+        """모든 스레드 배열의 합 (종료된 스레드의 배열은 누적값으로 합침)"""
+        with self._lock:
+            alive = []
+            for thread, values in self._shards:
+                if thread.is_alive():
+                    alive.append((thread, values))
+                else:
+                    for i, value in enumerate(values):
+                        self._retired[i] += value
+            self._shards = alive
+            totals = list(self._retired)
+            for _, values in alive:
+                for i, value in enumerate(values):
+                    totals[i] += value
+        return totals
+
+
+class _Timer:
+    """with 블록 실행 시간을 히스토그램에 기록"""
+
+    __slots__ = ('_histogram', '_started')
+
+    def __init__(self, histogram: "_HistogramChild"):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._started)
+        return False
+
+
+class _CounterChild:
+    __slots__ = ('_shards',)
+
+    def __init__(self):
+        self._shards = ThreadShards(1)
+
+    def inc(self, amount: float = 1) -> None:
+        self._shards.shard()[0] += amount
+
+    def value(self) -> float:
+        return self._shards.totals()[0]
+
+
+class _GaugeChild(_CounterChild):
+    """증감 게이지 (증가/감소가 다른 스레드에서 일어나도 합은 정확함)"""
+
+    __slots__ = ()
+
+    def dec(self, amount: float = 1) -> None:
+        self._shards.shard()[0] -= amount
+
+    def track(self) -> "_Tracked":
+        """with 블록 동안 1 증가"""
+        return _Tracked(self)
+
+
+class _Tracked:
+    __slots__ = ('_gauge',)
+
+    def __init__(self, gauge: _GaugeChild):
+        self._gauge = gauge
+
+    def __enter__(self):
+        self._gauge.inc()
+        return self
+
+    def __exit__(self, *exc):
+        self._gauge.dec()
+        return False
+
+
+class _HistogramChild:
+    # 배열: [버킷별 개수..., +Inf 개수, 합계, 전체 개수]
+    __slots__ = ('bounds', '_shards')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self._shards = ThreadShards(len(self.bounds) + 3)
+
+    def observe(self, value: float) -> None:
+        values = self._shards.shard()
+        values[bisect.bisect_left(self.bounds, value)] += 1
+        values[-2] += value
+        values[-1] += 1
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        """(누적 버킷 개수, 합계, 전체 개수)"""
+        totals = self._shards.totals()
+        cumulative = []
+        running = 0
+        for count in totals[:len(self.bounds) + 1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, totals[-2], totals[-1]
+
+
+class _Metric:
+    """라벨별 자식 지표를 가진 지표 계열"""
+
+    kind = ''
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 registry: Optional["Registry"] = None):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """라벨 값에 해당하는 자식 (처음 한 번만 락을 잡고 생성)"""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name}: expected labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _default(self):
+        return self.labels()
+
+    def _label_str(self, key: Tuple[str, ...], extra: str = '') -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return '{' + ','.join(pairs) + '}' if pairs else ''
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(self._render_child(key, child))
+        return lines
+
+    def _render_child(self, key, child) -> List[str]:
+        return [f"{self.name}{self._label_str(key)} {_format(child.value())}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._default().dec(amount)
+
+    def track(self) -> _Tracked:
+        return self._default().track()
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Optional["Registry"] = None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help_text, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def time(self) -> _Timer:
+        return self._default().time()
+
+    def _render_child(self, key, child) -> List[str]:
+        cumulative, total, count = child.snapshot()
+        lines = []
+        for bound, value in zip(self.buckets + (float('inf'),), cumulative):
+            le = 'le="+Inf"' if bound == float('inf') else f'le="{_format(bound)}"'
+            lines.append(f"{self.name}_bucket{self._label_str(key, le)} {value}")
+        lines.append(f"{self.name}_sum{self._label_str(key)} {_format(total)}")
+        lines.append(f"{self.name}_count{self._label_str(key)} {count}")
+        return lines
+
+
+class CallbackMetric:
+    """
+    수집 시점에 함수를 호출해 값을 얻는 지표 (다른 모듈이 이미 관리하는 값 노출용)
+
+    func는 숫자 또는 {라벨 값 튜플: 숫자} dict를 반환합니다. None은 생략합니다.
+    """
+
+    def __init__(self, name: str, help_text: str, func: Callable[[], object],
+                 kind: str = 'gauge', labelnames: Sequence[str] = (),
+                 registry: Optional["Registry"] = None):
+        self.name = name
+        self.help = help_text
+        self.func = func
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        (registry or REGISTRY).register(self)
+
+    def render(self) -> List[str]:
+        value = self.func()
+        samples = value if isinstance(value, dict) else {(): value}
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, sample in samples.items():
+            if sample is None:
+                continue
+            if not isinstance(key, tuple):
+                key = (key,)
+            pairs = ','.join(f'{n}="{_escape(str(v))}"' for n, v in zip(self.labelnames, key))
+            lines.append(f"{self.name}{'{' + pairs + '}' if pairs else ''} {_format(sample)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list = []
+        self._lock = threading.Lock()
+
+    def register(self, metric) -> None:
+        with self._lock:
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (수집 함수 오류는 해당 지표만 생략)"""
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                lines.append(f"# {metric.name} unavailable: {_escape(str(e))}")
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int):
+        return str(value)
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+REGISTRY = Registry()
+
+# -----------------------------------------------------------------------------
+# 여러 모듈이 함께 기록하는 TTS 처리 지표
+# -----------------------------------------------------------------------------
+
+# 단계: cache_lookup, cache_write, backend, backend_headers(스트리밍 응답 헤더까지),
+# vad_decode, vad_queue, vad_inference, frame_cut(무손실 절단), reencode(디코딩 후 재인코딩)
+STAGE_SECONDS = Histogram(
+    'tts_proxy_stage_seconds', 'Latency of each TTS pipeline stage', ('stage',)
+)
+
+# 방향: backend_in, cache_hit_out, cache_write, vad_removed
+AUDIO_BYTES = Counter(
+    'tts_proxy_audio_bytes_total', 'Audio bytes moved through the proxy', ('direction',)
+)
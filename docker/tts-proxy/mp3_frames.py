@@ -0,0 +1,188 @@
+"""
+MP3 프레임 파서
+
+압축된 MP3 비트스트림을 디코딩하지 않고 프레임 경계 단위로 탐색/절단합니다.
+VAD 무음 트리밍과 스트리밍 응답의 선행 무음 제거를 재인코딩 없이 수행하는 데 사용합니다.
+"""
+from typing import Iterator, NamedTuple, Optional
+
+# 비트레이트 테이블 (kbps) — [MPEG1 여부][레이어]
+_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# 샘플레이트 테이블 — 버전 비트 (3=MPEG1, 2=MPEG2, 0=MPEG2.5)
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+
+_HEADER_SIZE = 4
+# Layer III side information 크기 (바이트) — [MPEG1 여부][모노 여부]. Xing/Info 태그는 바로 뒤에 위치
+_SIDE_INFO_SIZES = {(True, False): 32, (True, True): 17, (False, False): 17, (False, True): 9}
+# VBRI 태그는 헤더 뒤 32바이트 고정 위치 (Fraunhofer 인코더)
+_VBRI_OFFSET = _HEADER_SIZE + 32
+
+
+class Frame(NamedTuple):
+    """MP3 프레임 하나의 위치와 재생 길이"""
+    offset: int
+    size: int
+    samples: int
+    sample_rate: int
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.size
+
+    @property
+    def duration_ms(self) -> float:
+        return self.samples * 1000.0 / self.sample_rate
+
+
+def parse_header(data: bytes, offset: int) -> Optional[Frame]:
+    """
+    offset 위치의 프레임 헤더 해석
+
+    Returns:
+        유효한 헤더이면 Frame, 아니면 None (free-format 비트레이트 미지원)
+    """
+    if offset + _HEADER_SIZE > len(data):
+        return None
+    b1, b2 = data[offset + 1], data[offset + 2]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_idx = (b2 >> 4) & 0x0F
+    rate_idx = (b2 >> 2) & 0x03
+    if version == 1 or layer_bits == 0 or bitrate_idx in (0, 15) or rate_idx == 3:
+        return None
+
+    layer = 4 - layer_bits
+    mpeg1 = version == 3
+    bitrate = _BITRATES[(mpeg1, layer)][bitrate_idx] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_idx]
+    padding = (b2 >> 1) & 0x01
+
+    if layer == 1:
+        samples = 384
+        size = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or mpeg1) else 576
+        size = samples // 8 * bitrate // sample_rate + padding
+
+    return Frame(offset, size, samples, sample_rate)
+
+
+def audio_start(data: bytes) -> int:
+    """ID3v2 태그를 건너뛴 첫 오디오 바이트 위치"""
+    if len(data) >= 10 and data[:3] == b'ID3':
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        footer = 10 if data[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def iter_frames(data: bytes) -> Iterator[Frame]:
+    """
+    완전한 프레임을 순서대로 순회
+
+    버퍼 끝의 잘린 프레임이나 해석할 수 없는 바이트를 만나면 멈춥니다.
+    """
+    offset = audio_start(data)
+    while True:
+        frame = parse_header(data, offset)
+        if frame is None or frame.size <= 0 or frame.end > len(data):
+            return
+        yield frame
+        offset = frame.end
+
+
+def duration_ms(data: bytes) -> float:
+    """완전한 오디오 프레임들의 총 재생 길이 (밀리초, Xing/Info/VBRI 프레임 제외)"""
+    return sum(frame.duration_ms for frame in iter_frames(data) if not is_info_frame(data, frame))
+
+
+def is_info_frame(data: bytes, frame: Frame) -> bool:
+    """
+    Xing/Info/VBRI 메타데이터 프레임 여부 (디코더가 오디오로 재생하지 않는 프레임)
+
+    태그는 정해진 위치에만 있으므로(Xing/Info: side information 바로 뒤, VBRI: 헤더 뒤 32바이트)
+    그 위치만 확인합니다. 오디오 데이터에 우연히 같은 바이트가 있어도 오디오 프레임으로 봅니다.
+    """
+    b1, b3 = data[frame.offset + 1], data[frame.offset + 3]
+    if (b1 >> 1) & 0x03 != 1:  # Layer III만 태그를 가짐
+        return False
+    mpeg1 = (b1 >> 3) & 0x03 == 3
+    mono = (b3 >> 6) & 0x03 == 3
+    offset = frame.offset + _HEADER_SIZE + _SIDE_INFO_SIZES[(mpeg1, mono)]
+    if not b1 & 0x01:
+        offset += 2  # 헤더 뒤 CRC
+    if data[offset:offset + 4] in (b'Xing', b'Info'):
+        return True
+    return data[frame.offset + _VBRI_OFFSET:frame.offset + _VBRI_OFFSET + 4] == b'VBRI'
+
+
+def has_frames(data: bytes) -> bool:
+    """해석 가능한 MP3 프레임이 하나 이상 있는지 여부"""
+    return next(iter_frames(data), None) is not None
+
+
+def cut(data: bytes, start_ms: float, end_ms: float = None) -> bytes:
+    """
+    [start_ms, end_ms) 구간에서 시작하는 프레임만 남기고 잘라냄 (재인코딩 없음)
+
+    ID3v2 태그는 보존하고, 절단 후 총 길이가 맞지 않게 되는 Xing/Info 프레임은
+    제거합니다. end_ms가 없으면 마지막 완전 프레임 뒤의 잔여 바이트(스트리밍 중
+    아직 도착하지 않은 프레임의 앞부분)도 그대로 보존합니다.
+
+    비트 저장소(bit reservoir)를 참조하는 첫 프레임은 디코딩이 불완전할 수 있으나,
+    호출자가 두는 여유 구간(padding) 안에 있으므로 들리는 음성에는 영향이 없습니다.
+    """
+    prefix_end = audio_start(data)
+    elapsed = 0.0
+    first = None
+    last_end = None
+    tail = prefix_end
+    for frame in iter_frames(data):
+        tail = frame.end
+        if is_info_frame(data, frame):
+            continue
+        if end_ms is not None and elapsed >= end_ms:
+            break
+        if elapsed >= start_ms:
+            if first is None:
+                first = frame.offset
+            last_end = frame.end
+        elapsed += frame.duration_ms
+
+    if end_ms is None:
+        return data[:prefix_end] + data[first if first is not None else tail:]
+    if first is None:
+        return data[:prefix_end]
+    return data[:prefix_end] + data[first:last_end]
+
+
+def frame_start_ms(data: bytes, ms: float) -> float:
+    """ms 이후 처음 시작하는 오디오 프레임의 시작 시각 (cut(data, ms)의 실제 시작점)"""
+    elapsed = 0.0
+    for frame in iter_frames(data):
+        if is_info_frame(data, frame):
+            continue
+        if elapsed >= ms:
+            return elapsed
+        elapsed += frame.duration_ms
+    return elapsed
+
+
+def cut_head(data: bytes, start_ms: float) -> bytes:
+    """start_ms 이전에 시작하는 프레임을 제거 (cut의 시작 구간만 자르는 형태)"""
+    return cut(data, start_ms)
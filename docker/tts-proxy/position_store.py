@@ -0,0 +1,233 @@
+"""
+재생/스크롤 위치 저장소
+
+노트(notePath)별 위치를 버전이 붙은 레코드로 메모리에 보관하고, 디스크에는 타이머/종료
+시점에만 기록합니다 (write-behind). 시작 시 파일을 한 번만 읽으며, 조회와 SSE 초기 상태
+전송은 디스크에 접근하지 않습니다.
+
+버전은 저장소 전체에서 단조 증가하므로 클라이언트는 마지막으로 받은 버전 이후 바뀐
+레코드만 요청할 수 있습니다 (GET ?since=, SSE Last-Event-ID).
+"""
+import os
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 레코드 키: (user, notePath)
+RecordKey = Tuple[str, str]
+
+
+def _record_key(data: dict) -> RecordKey:
+    return (data.get('user') or '', data.get('notePath') or '')
+
+
+class PositionStore:
+    """
+    위치 한 종류(재생 또는 스크롤)의 노트별 메모리 저장소
+
+    레코드는 버전 순서로 유지되며(가장 최근 변경이 마지막), max_entries를 넘으면 가장
+    오래 바뀌지 않은 노트부터 제거합니다. set()은 메모리만 갱신하고 flush_interval 뒤
+    한 번 기록을 예약합니다. 기록은 임시 파일 작성 후 os.replace로 교체합니다.
+    """
+
+    def __init__(self, path: Path, default: dict, flush_interval: float = 5.0, max_entries: int = 1000):
+        """
+        Args:
+            path: 저장 파일 경로
+            default: 저장된 위치가 없을 때 조회 결과
+            flush_interval: 변경 후 디스크 기록까지 대기 시간 (초)
+            max_entries: 보관할 최대 노트 수
+        """
+        self.path = path
+        self.default = default
+        self.flush_interval = flush_interval
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._records: "OrderedDict[RecordKey, dict]" = OrderedDict()
+        # SSE 전송용 한 줄 JSON (연결마다 직렬화하지 않음)
+        self._json: Dict[RecordKey, str] = {}
+        self._version = 0
+        self._dirty = False
+        self._flush_timer = None
+        self._flush_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+        self._load()
+
+    # -------------------------------------------------------------------------
+    # 영속화
+    # -------------------------------------------------------------------------
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            stored = json.loads(self.path.read_text(encoding='utf-8'))
+        except Exception as e:
+            logger.warning(f"Failed to load position from {self.path.name}: {e}")
+            return
+
+        if 'entries' in stored:
+            records = stored['entries']
+            version = int(stored.get('version', 0))
+        else:
+            # 이전 형식: 전역 위치 하나
+            records = [dict(stored, version=1)]
+            version = 1
+
+        with self._lock:
+            for record in sorted(records, key=lambda r: r.get('version', 0)):
+                self._put_locked(record)
+            self._version = max([version] + [r.get('version', 0) for r in records])
+        logger.info(f"Loaded {len(self._records)} position(s) from {self.path.name} (version={self._version})")
+
+    def _schedule_flush(self) -> None:
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                return  # 이미 예약됨
+            self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self) -> None:
+        """변경된 위치를 원자적으로 기록 (종료 시에도 호출)"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+
+        # 기록 중에도 set()은 막히지 않음 (그 사이 변경은 다음 flush에서 기록)
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = {'version': self._version, 'entries': list(self._records.values())}
+                self._dirty = False
+
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            try:
+                tmp_path.write_text(json.dumps(snapshot, ensure_ascii=False), encoding='utf-8')
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logger.error(f"Failed to save position to {self.path.name}: {e}")
+                with self._lock:
+                    self._dirty = True
+                try:
+                    tmp_path.unlink()
+                except OSError:
+                    pass
+                self._schedule_flush()
+
+    # -------------------------------------------------------------------------
+    # 조회/갱신
+    # -------------------------------------------------------------------------
+
+    def _put_locked(self, record: dict) -> None:
+        key = _record_key(record)
+        self._records.pop(key, None)
+        self._records[key] = record
+        self._json[key] = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+        while len(self._records) > self.max_entries:
+            old_key, _ = self._records.popitem(last=False)
+            self._json.pop(old_key, None)
+
+    def _find_locked(self, note_path: Optional[str], user: Optional[str]) -> Optional[RecordKey]:
+        """필터와 맞는 가장 최근 레코드 키"""
+        if note_path is not None and user is not None:
+            key = (user, note_path)
+            return key if key in self._records else None
+        for key in reversed(self._records):
+            if (user is None or key[0] == user) and (note_path is None or key[1] == note_path):
+                return key
+        return None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def set(self, data: dict) -> dict:
+        """
+        위치 갱신 (디스크 기록은 예약만 함)
+
+        Returns:
+            version이 붙은 저장 레코드 (브로드캐스트에 그대로 사용)
+        """
+        with self._lock:
+            self._version += 1
+            record = dict(data, version=self._version)
+            self._put_locked(record)
+            self._dirty = True
+        self._schedule_flush()
+        return record
+
+    def apply(self, record: dict) -> Optional[dict]:
+        """
+        다른 워커에서 저장된 위치 반영 (Redis 중계)
+
+        버전은 Lamport 시계처럼 max(로컬 + 1, 원본 버전)으로 정해 이 저장소 안에서 단조
+        증가를 유지합니다. 같은 노트의 로컬 위치가 더 최근(timestamp)이면 무시합니다.
+
+        Returns:
+            반영된 레코드 (무시하면 None)
+        """
+        key = _record_key(record)
+        with self._lock:
+            current = self._records.get(key)
+            if current is not None and current.get('timestamp', 0) > record.get('timestamp', 0):
+                return None
+            self._version = max(self._version + 1, int(record.get('version') or 0))
+            record = dict(record, version=self._version)
+            self._put_locked(record)
+            self._dirty = True
+        self._schedule_flush()
+        return record
+
+    def get(self, note_path: Optional[str] = None, user: Optional[str] = None) -> dict:
+        """필터와 맞는 가장 최근 위치 사본 (없으면 기본값)"""
+        with self._lock:
+            key = self._find_locked(note_path, user)
+            return dict(self._records[key] if key is not None else self.default)
+
+    def get_json(self, note_path: Optional[str] = None, user: Optional[str] = None) -> Optional[Tuple[str, int]]:
+        """필터와 맞는 가장 최근 위치의 (한 줄 JSON, 버전). 없으면 None."""
+        with self._lock:
+            key = self._find_locked(note_path, user)
+            if key is None:
+                return None
+            return self._json[key], self._records[key]['version']
+
+    def changes_since(self, version: int, note_path: Optional[str] = None,
+                      user: Optional[str] = None, as_json: bool = False) -> List:
+        """
+        version 이후 바뀐 레코드 (버전 오름차순)
+
+        Args:
+            version: 클라이언트가 마지막으로 받은 버전
+            note_path: 이 노트만 (선택)
+            user: 이 사용자만 (선택)
+            as_json: True이면 (한 줄 JSON, 버전) 목록 반환
+
+        Returns:
+            레코드 목록
+        """
+        changes = []
+        with self._lock:
+            # 레코드는 버전 순서이므로 끝에서부터 version 이하를 만나면 중단
+            for key in reversed(self._records):
+                record = self._records[key]
+                if record['version'] <= version:
+                    break
+                if (user is None or key[0] == user) and (note_path is None or key[1] == note_path):
+                    changes.append((self._json[key], record['version']) if as_json else dict(record))
+        changes.reverse()
+        return changes
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._records)
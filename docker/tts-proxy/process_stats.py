@@ -0,0 +1,45 @@
+"""
+프로세스 시작 시간/메모리 사용량 조회
+
+/proc 기반이라 Linux(컨테이너)에서만 값이 채워지며, 다른 OS에서는 None을 반환합니다.
+"""
+import os
+import resource
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def process_age() -> Optional[float]:
+    """프로세스가 시작된 뒤 지난 시간 (초, 인터프리터 기동 포함)"""
+    try:
+        with open('/proc/self/stat') as f:
+            # comm 필드에 공백/괄호가 있을 수 있으므로 마지막 ')' 뒤부터 분리 (starttime = 22번째 필드)
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError) as e:
+        logger.debug(f"Process start time unavailable: {e}")
+        return None
+
+
+def rss_bytes() -> Optional[int]:
+    """현재 RSS (바이트)"""
+    try:
+        with open('/proc/self/statm') as f:
+            rss_pages = int(f.read().split()[1])
+        return rss_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError) as e:
+        logger.debug(f"RSS unavailable: {e}")
+        return None
+
+
+def memory_usage() -> dict:
+    """현재/최대 RSS (MB)"""
+    rss = rss_bytes()
+    rss_mb = round(rss / 1024 / 1024, 1) if rss is not None else None
+    # Linux에서 ru_maxrss는 KB 단위
+    peak_mb = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return {'rssMB': rss_mb, 'peakRssMB': peak_mb}
@@ -11,20 +11,37 @@ TTS 백엔드: http://localhost:5050 (openai-edge-tts)
 """
 import os
 import re
+import sys
 import json
 import time
 import queue
-import random
+import atexit
+import signal
 import logging
-import requests
+import secrets
+import threading
 from pathlib import Path
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from flask import Flask, request, jsonify, Response
+from flask import Flask, request, jsonify, Response, send_file, redirect
 from flask_cors import CORS
 
-from sse_manager import SSEManager, RedisSSEManager
-from vad_processor import trim_silence, VAD_ENABLED, is_loaded as vad_is_loaded, preload as vad_preload
+from sse_manager import SSEManager, RedisSSEManager, Mailbox, format_event
+from sse_server import AsyncSSEServer, REDIRECT_TOKEN_PARAM
+from vad_processor import (
+    trim_silence, trim_leading_silence, BackgroundTrimmer, UntrimmedAudio,
+    VAD_ENABLED, VAD_STREAM_HEAD_MS, VAD_ASYNC, VAD_ASYNC_WORKERS,
+    is_loaded as vad_is_loaded, preload as vad_preload, get_service_metrics as vad_service_metrics,
+    get_runtime_info as vad_runtime_info
+)
+import mp3_frames
+import metrics
+import process_stats
 from cache_manager import CacheManager
+from single_flight import SingleFlight
+from backend_client import BackendClient, BackendError, retry_budget
+from position_store import PositionStore
 
 # 로깅 설정
 logging.basicConfig(
@@ -62,19 +79,86 @@ def _validate_cache_key(key: str) -> bool:
     """캐시 키 검증: Path Traversal 방지."""
     return bool(CACHE_KEY_PATTERN.match(key))
 
+
+def _parse_stream_flag(value):
+    """stream 파라미터 해석 (bool 또는 'true'/'1' 문자열). 없으면 None."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ('1', 'true', 'yes')
+
 # 설정
 PORT = int(os.environ.get('TTS_PROXY_PORT', 5051))
 DATA_DIR = Path(os.environ.get('TTS_DATA_DIR', './data/tts-cache'))
 REDIS_ENABLED = os.environ.get('REDIS_ENABLED', 'false').lower() == 'true'
 REDIS_HOST = os.environ.get('REDIS_HOST', 'localhost')
 REDIS_PORT = int(os.environ.get('REDIS_PORT', 6379))
+# 프로세스 역할: all(기본), tts(합성/캐시만), sse(SSE/위치 동기화만). 역할별로 워커 풀을 나눌 때 사용
+TTS_PROXY_ROLE = os.environ.get('TTS_PROXY_ROLE', 'all').lower()
 
 # TTS 백엔드 설정
 TTS_BACKEND_URL = os.environ.get('TTS_BACKEND_URL', 'http://localhost:5050')
-TTS_TIMEOUT = int(os.environ.get('TTS_TIMEOUT', '120'))
+TTS_TIMEOUT = int(os.environ.get('TTS_TIMEOUT', '120'))  # 레거시: TTS_READ_TIMEOUT 기본값
+TTS_CONNECT_TIMEOUT = float(os.environ.get('TTS_CONNECT_TIMEOUT', '5'))
+TTS_READ_TIMEOUT = float(os.environ.get('TTS_READ_TIMEOUT', str(TTS_TIMEOUT)))
+TTS_MAX_IN_FLIGHT = int(os.environ.get('TTS_MAX_IN_FLIGHT', '8'))
 TTS_MODEL = os.environ.get('TTS_MODEL', '')  # 빈 값이면 클라이언트 요청 그대로 전달
 TTS_MAX_RETRIES = int(os.environ.get('TTS_MAX_RETRIES', '3'))
 TTS_RETRY_BASE_DELAY = float(os.environ.get('TTS_RETRY_BASE_DELAY', '1.0'))
+# 캐시 미스 시 백엔드 오디오를 도착하는 대로 전달 (요청별 stream 파라미터로 재정의 가능)
+TTS_STREAM_DEFAULT = os.environ.get('TTS_STREAM_DEFAULT', 'false').lower() == 'true'
+# 진행 중인 동일 요청(single-flight leader) 대기 한도 (초). 넘으면 직접 합성.
+# 기본값은 leader의 백엔드 요청이 재시도를 모두 소진하는 데 걸릴 수 있는 최대 시간
+TTS_FLIGHT_WAIT_TIMEOUT = float(os.environ.get('TTS_FLIGHT_WAIT_TIMEOUT') or retry_budget(
+    TTS_CONNECT_TIMEOUT, TTS_READ_TIMEOUT, TTS_MAX_RETRIES, TTS_RETRY_BASE_DELAY))
+TTS_STREAM_CHUNK_SIZE = int(os.environ.get('TTS_STREAM_CHUNK_SIZE', '8192'))
+# 배치 합성: 요청당 최대 항목 수, 동시 합성 워커 수
+TTS_BATCH_MAX_ITEMS = int(os.environ.get('TTS_BATCH_MAX_ITEMS', '500'))
+TTS_BATCH_CONCURRENCY = int(os.environ.get('TTS_BATCH_CONCURRENCY', str(TTS_MAX_IN_FLIGHT)))
+
+# 캐시 설정: 인메모리 hot tier 예산 (0이면 비활성화)
+TTS_HOT_CACHE_MB = int(os.environ.get('TTS_HOT_CACHE_MB', '64'))
+# 디스크 캐시 용량 제한 (0이면 무제한) 및 eviction 정책 (lru/lfu)
+TTS_CACHE_MAX_MB = int(os.environ.get('TTS_CACHE_MAX_MB', '0'))
+TTS_CACHE_MAX_FILES = int(os.environ.get('TTS_CACHE_MAX_FILES', '0'))
+TTS_CACHE_EVICTION_POLICY = os.environ.get('TTS_CACHE_EVICTION_POLICY', 'lru').lower()
+TTS_CACHE_EVICTION_INTERVAL = float(os.environ.get('TTS_CACHE_EVICTION_INTERVAL', '60'))
+# 캐시 파일 체크섬: 저장 시 CRC32를 확장 속성에 기록하고 디스크에서 읽을 때 검증 (손상 파일은 미스로 처리)
+TTS_CACHE_CHECKSUM = os.environ.get('TTS_CACHE_CHECKSUM', 'false').lower() == 'true'
+# 이전 형식(평면 디렉토리) 캐시 파일을 시작 후 백그라운드에서 분산 경로로 이동
+TTS_CACHE_MIGRATE = os.environ.get('TTS_CACHE_MIGRATE', 'true').lower() == 'true'
+# 여러 워커 프로세스가 캐시 디렉토리를 공유 (gunicorn 워커 2개 이상이면 gunicorn.conf.py가 켬):
+# 인덱스 미스/hot tier 히트를 디스크로 확인하고 eviction은 한 워커만 실행
+TTS_CACHE_SHARED = os.environ.get('TTS_CACHE_SHARED', 'false').lower() == 'true'
+# 일별 사용량 보관 일수 (이전 날짜는 월별 합계로 압축, 0이면 무제한)
+TTS_USAGE_RETENTION_DAYS = int(os.environ.get('TTS_USAGE_RETENTION_DAYS', '90'))
+
+# asyncio SSE 엔진: 모든 SSE 연결을 한 이벤트 루프 스레드에서 처리 (0이면 비활성화, 요청 스레드 방식 사용)
+SSE_ASYNC_PORT = int(os.environ.get('SSE_ASYNC_PORT', '0'))
+SSE_ASYNC_HOST = os.environ.get('SSE_ASYNC_HOST', '0.0.0.0')
+# 기존 /api/events/* 요청을 SSE 엔진으로 리다이렉트 (공개 URL이 비어 있으면 요청 호스트 + SSE_ASYNC_PORT)
+SSE_ASYNC_REDIRECT = os.environ.get('SSE_ASYNC_REDIRECT', 'true').lower() == 'true'
+SSE_ASYNC_PUBLIC_URL = os.environ.get('SSE_ASYNC_PUBLIC_URL', '').rstrip('/')
+# 리다이렉트 토큰 서명 키 (워커가 여러 개이면 gunicorn.conf.py가 공통 값을 생성)
+SSE_ASYNC_REDIRECT_SECRET = (os.environ.get('SSE_ASYNC_REDIRECT_SECRET', '').encode('utf-8')
+                             or secrets.token_bytes(32))
+# 여러 워커 프로세스가 SSE 엔진 포트를 SO_REUSEPORT로 공유 (gunicorn.conf.py가 워커 2개 이상이면 켬)
+SSE_ASYNC_REUSE_PORT = os.environ.get('SSE_ASYNC_REUSE_PORT', 'false').lower() == 'true'
+# asyncio TTS 엔진: /api/tts, /api/tts-stream, /v1/audio/speech를 이벤트 루프 하나에서 처리
+# (0이면 비활성화). 백엔드 대기 중인 요청이 스레드를 점유하지 않음, aiohttp 필요
+TTS_ASYNC_PORT = int(os.environ.get('TTS_ASYNC_PORT', '0'))
+TTS_ASYNC_HOST = os.environ.get('TTS_ASYNC_HOST', '0.0.0.0')
+# 엔진의 백엔드 동시 요청 상한은 Flask 경로(TTS_MAX_IN_FLIGHT)와 별도이므로 워커당 백엔드 부하는
+# 최대 두 값의 합. 엔진만 쓸 때가 아니면 두 값을 나눠 설정
+TTS_ASYNC_MAX_IN_FLIGHT = int(os.environ.get('TTS_ASYNC_MAX_IN_FLIGHT', str(TTS_MAX_IN_FLIGHT)))
+TTS_ASYNC_CPU_WORKERS = int(os.environ.get('TTS_ASYNC_CPU_WORKERS', '4'))  # VAD 트리밍 스레드 수
+TTS_ASYNC_REUSE_PORT = os.environ.get('TTS_ASYNC_REUSE_PORT', 'false').lower() == 'true'
+# 위치 브로드캐스트 최소 간격 (ms, 노트별). 간격 안의 업데이트는 최신 값 하나로 합쳐 간격 끝에 전송
+SSE_THROTTLE_MS = {
+    'playback': float(os.environ.get('SSE_PLAYBACK_THROTTLE_MS', '0')),
+    'scroll': float(os.environ.get('SSE_SCROLL_THROTTLE_MS', '100')),
+}
 
 # 데이터 디렉토리 생성
 DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -83,16 +167,101 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 PLAYBACK_POSITION_FILE = DATA_DIR / 'playback-position.json'
 SCROLL_POSITION_FILE = DATA_DIR / 'scroll-position.json'
 
+# 위치 저장소: 메모리가 원본, 디스크에는 변경 후 POSITION_FLUSH_INTERVAL초 뒤/종료 시 기록
+POSITION_FLUSH_INTERVAL = float(os.environ.get('POSITION_FLUSH_INTERVAL', '5'))
+POSITION_MAX_ENTRIES = int(os.environ.get('POSITION_MAX_ENTRIES', '1000'))  # 종류별 보관 노트 수
+playback_store = PositionStore(PLAYBACK_POSITION_FILE, default={
+    'lastPlayedIndex': -1,
+    'notePath': '',
+    'noteTitle': '',
+    'timestamp': 0,
+    'deviceId': ''
+}, flush_interval=POSITION_FLUSH_INTERVAL, max_entries=POSITION_MAX_ENTRIES)
+scroll_store = PositionStore(SCROLL_POSITION_FILE, default={
+    'scrollTop': 0,
+    'notePath': '',
+    'timestamp': 0,
+    'deviceId': ''
+}, flush_interval=POSITION_FLUSH_INTERVAL, max_entries=POSITION_MAX_ENTRIES)
+POSITION_STORES = {
+    'playback': playback_store,
+    'scroll': scroll_store,
+}
+
+
+def _flush_positions():
+    """종료 시 미기록 위치 저장"""
+    for store in POSITION_STORES.values():
+        store.flush()
+
+
 # 캐시 매니저 초기화
-cache_mgr = CacheManager(DATA_DIR)
+cache_mgr = CacheManager(
+    DATA_DIR,
+    hot_cache_bytes=TTS_HOT_CACHE_MB * 1024 * 1024,
+    max_bytes=TTS_CACHE_MAX_MB * 1024 * 1024,
+    max_files=TTS_CACHE_MAX_FILES,
+    eviction_policy=TTS_CACHE_EVICTION_POLICY,
+    eviction_interval=TTS_CACHE_EVICTION_INTERVAL,
+    usage_retention_days=TTS_USAGE_RETENTION_DAYS,
+    checksum=TTS_CACHE_CHECKSUM,
+    migrate_legacy=TTS_CACHE_MIGRATE,
+    shared=TTS_CACHE_SHARED
+)
+
+# 동일 캐시 키 동시 미스 병합 레지스트리
+tts_flight = SingleFlight()
+
+# TTS 백엔드 클라이언트 (keep-alive 연결 풀 + 동시 요청 제한)
+backend_client = BackendClient(
+    TTS_BACKEND_URL,
+    max_in_flight=TTS_MAX_IN_FLIGHT,
+    connect_timeout=TTS_CONNECT_TIMEOUT,
+    read_timeout=TTS_READ_TIMEOUT,
+    max_retries=TTS_MAX_RETRIES,
+    retry_base_delay=TTS_RETRY_BASE_DELAY
+)
+
+# 백그라운드 VAD 트리밍 워커 (VAD_ASYNC 모드 및 스트리밍 후속 트리밍)
+vad_trimmer = BackgroundTrimmer(VAD_ASYNC_WORKERS)
+
+# 배치 합성 워커 풀 (모든 배치 요청이 공유)
+batch_executor = ThreadPoolExecutor(max_workers=TTS_BATCH_CONCURRENCY, thread_name_prefix='tts-batch')
+
+# 콜드 스타트 시간 (VAD 모델 사전 로딩 후 기록)
+cold_start_seconds = None
 
 # SSE 매니저 초기화
 if REDIS_ENABLED:
     logger.info(f"Initializing Redis SSE Manager (redis://{REDIS_HOST}:{REDIS_PORT})")
-    sse_manager = RedisSSEManager(redis_host=REDIS_HOST, redis_port=REDIS_PORT)
+    sse_manager = RedisSSEManager(redis_host=REDIS_HOST, redis_port=REDIS_PORT, throttle_ms=SSE_THROTTLE_MS)
 else:
     logger.info("Initializing in-memory SSE Manager")
-    sse_manager = SSEManager()
+    sse_manager = SSEManager(throttle_ms=SSE_THROTTLE_MS)
+
+
+def _on_remote_position(event: str, data: dict) -> None:
+    """다른 워커에서 저장된 위치를 로컬 저장소에 반영하고 이 워커의 구독자에게 전달"""
+    store = POSITION_STORES.get(event)
+    if store is None or not isinstance(data, dict):
+        return
+    record = store.apply(data)
+    if record is not None:
+        sse_manager.deliver_position(event, record)
+
+
+# 워커 간 중계: 워커당 구독 스레드 하나 (Redis가 다운되면 백오프로 재연결)
+if REDIS_ENABLED:
+    sse_manager.subscribe_to_redis(
+        [RedisSSEManager.CHANNEL_PREFIX + event for event in POSITION_STORES],
+        _on_remote_position
+    )
+
+# asyncio SSE 엔진 (SSE_ASYNC_PORT 설정 시 서버 시작 단계에서 생성)
+async_sse = None
+
+# asyncio TTS 엔진 (TTS_ASYNC_PORT 설정 시 서버 시작 단계에서 생성)
+async_tts = None
 
 
 # =============================================================================
@@ -106,46 +275,133 @@ def health_check():
         'status': 'healthy',
         'timestamp': int(time.time() * 1000),
         'sse_clients': sse_manager.get_client_count(),
+        'sse_topics': sse_manager.get_topic_count(),
+        'sse_delivery': sse_manager.get_delivery_stats(),
+        'sse_async': async_sse.get_stats() if async_sse is not None else None,
+        'tts_async': async_tts.get_stats() if async_tts is not None else None,
         'redis_enabled': REDIS_ENABLED,
+        'redis': sse_manager.get_redis_stats() if REDIS_ENABLED else None,
         'tts_backend': TTS_BACKEND_URL,
+        'backend_pool': backend_client.get_metrics(),
         'vad_enabled': VAD_ENABLED,
-        'vad_loaded': vad_is_loaded()
+        'vad_loaded': vad_is_loaded(),
+        'vad_async': VAD_ASYNC,
+        'vad_pending': vad_trimmer.pending_count(),
+        'vad_inference': vad_service_metrics(),
+        'vad_runtime': vad_runtime_info(),
+        'startup': {
+            'coldStartSeconds': cold_start_seconds,
+            'uptimeSeconds': round(process_stats.process_age() or 0, 1),
+        },
+        'memory': process_stats.memory_usage()
     })
 
 
 # =============================================================================
-# TTS 공통 핸들러
+# Prometheus 지표
 # =============================================================================
 
-def _handle_tts_request(text: str, voice: str, model: str = 'tts-1',
-                        rate: str = None, use_cache: bool = True) -> Response:
-    """
-    모든 TTS 엔드포인트의 공통 로직.
+# 단계별 지연/바이트는 각 모듈이 metrics.STAGE_SECONDS/AUDIO_BYTES에 직접 기록하고,
+# 나머지는 이미 관리 중인 값을 수집 시점에 읽음
+_CACHE_HIT_BYTES = metrics.AUDIO_BYTES.labels('cache_hit_out')
 
-    1. 캐시 확인 → 2. 백엔드 요청 → 3. VAD 트리밍 → 4. 캐시 저장 → 5. 응답
-    """
-    # TTS_MODEL 환경변수가 설정되면 모델명 오버라이드 (MLX 등 로컬 백엔드용)
-    effective_model = TTS_MODEL if TTS_MODEL else model
 
-    cache_key = cache_mgr.generate_cache_key(text, voice, rate)
-    cache_file = cache_mgr.cache_path(cache_key)
-
-    # 캐시 히트
-    if use_cache and cache_file.exists():
-        logger.info(f"Cache HIT: {cache_key[:16]}...")
-        cache_mgr.update_stats(cache_hit=True)
-        audio_data = cache_file.read_bytes()
-        return Response(audio_data, mimetype='audio/mpeg', headers={
-            'Content-Length': str(len(audio_data)),
-            'X-Cache': 'HIT',
-            'X-Content-Type-Options': 'nosniff'
-        })
+def _request_counts() -> dict:
+    stats = cache_mgr.stats
+    return {(result,): stats[field] for result, field in (
+        ('hit', 'cacheHits'), ('miss', 'cacheMisses'), ('coalesced', 'coalescedRequests'), ('error', 'errors'))}
 
-    # 캐시 미스 → 백엔드 요청
-    logger.info(f"Cache MISS: {cache_key[:16]}..., requesting backend...")
-    cache_mgr.update_stats(cache_hit=False, backend_request=True)
-    cache_mgr.update_usage(text)
 
+metrics.CallbackMetric(
+    'tts_proxy_requests_total', 'TTS requests by cache result', _request_counts,
+    kind='counter', labelnames=('result',)
+)
+metrics.CallbackMetric(
+    'tts_proxy_backend_requests_total', 'Synthesis requests sent to the TTS backend',
+    lambda: cache_mgr.stats['backendRequests'], kind='counter'
+)
+metrics.CallbackMetric(
+    'tts_proxy_backend_in_flight', 'Backend requests currently holding a connection slot',
+    lambda: backend_client.get_metrics()['inFlight']
+)
+metrics.CallbackMetric(
+    'tts_proxy_async_backend_in_flight', 'Backend requests in flight from the asyncio TTS engine',
+    lambda: async_tts.backend.get_metrics()['inFlight'] if async_tts is not None else None
+)
+metrics.CallbackMetric(
+    'tts_proxy_synthesis_in_flight', 'Cache keys with a synthesis in progress (single-flight leaders)',
+    tts_flight.in_flight
+)
+metrics.CallbackMetric(
+    'tts_proxy_vad_queue_depth', 'Waveforms waiting for VAD inference',
+    lambda: vad_service_metrics().get('queueDepth', 0)
+)
+metrics.CallbackMetric(
+    'tts_proxy_vad_trim_pending', 'Cache entries waiting for background VAD trimming',
+    vad_trimmer.pending_count
+)
+metrics.CallbackMetric(
+    'tts_proxy_cache_entries', 'Audio files in the disk cache', lambda: cache_mgr.index.count()
+)
+metrics.CallbackMetric(
+    'tts_proxy_cache_bytes', 'Cached audio bytes by tier', lambda: {
+        ('disk',): cache_mgr.index.total_bytes,
+        ('memory',): cache_mgr.hot.get_stats()['hotBytes'],
+    }, labelnames=('tier',)
+)
+metrics.CallbackMetric(
+    'tts_proxy_sse_clients', 'Connected SSE clients by engine', lambda: {
+        ('thread',): len(sse_manager.client_topics),
+        ('async',): async_sse.get_client_count() if async_sse is not None else None,
+    }, labelnames=('engine',)
+)
+metrics.CallbackMetric(
+    'tts_proxy_sse_topics', 'Subscription keys with at least one SSE client', sse_manager.get_topic_count
+)
+metrics.CallbackMetric(
+    'tts_proxy_sse_events_total', 'Position events by outcome', lambda: {
+        (outcome,): value for outcome, value in sse_manager.get_delivery_stats().items()
+        if outcome in ('delivered', 'coalesced', 'throttled', 'droppedClients')
+    }, kind='counter', labelnames=('outcome',)
+)
+metrics.CallbackMetric(
+    'process_resident_memory_bytes', 'Resident memory size in bytes', process_stats.rss_bytes
+)
+metrics.CallbackMetric(
+    'tts_proxy_uptime_seconds', 'Seconds since the process started', process_stats.process_age
+)
+
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus 텍스트 형식 지표 (워커 프로세스별 값)"""
+    return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
+
+# =============================================================================
+# 프로세스 역할 (SSE/합성 워커 풀 분리)
+# =============================================================================
+
+# sse 역할이 처리하는 경로 (나머지는 tts 역할). /health, /metrics는 모든 역할에서 응답
+SYNC_PATH_PREFIXES = ('/api/events/', '/api/playback-position', '/api/scroll-position')
+
+
+@app.before_request
+def _enforce_role():
+    """TTS_PROXY_ROLE이 tts/sse이면 다른 역할의 경로는 404"""
+    if TTS_PROXY_ROLE == 'all' or request.path in ('/health', '/metrics'):
+        return None
+    if (TTS_PROXY_ROLE == 'sse') != request.path.startswith(SYNC_PATH_PREFIXES):
+        return jsonify({'error': f'Not served by this worker pool (role={TTS_PROXY_ROLE})'}), 404
+    return None
+
+
+# =============================================================================
+# TTS 공통 핸들러
+# =============================================================================
+
+def _build_payload(text: str, voice: str, effective_model: str, rate: str = None) -> dict:
+    """백엔드 /v1/audio/speech 요청 본문 구성"""
     payload = {'model': effective_model, 'input': text, 'voice': voice}
     if rate:
         payload['speed'] = rate
@@ -157,45 +413,325 @@ def _handle_tts_request(text: str, voice: str, model: str = 'tts-1',
             'top_p': 0.8,
             'gender': 'female',
         })
+    return payload
+
+
+def _replace_trimmed(cache_key: str, audio_data: bytes, trimmed: bytes, token) -> None:
+    """
+    백그라운드 트리밍 결과로 캐시 항목을 원자적으로 교체 (그 사이 삭제/덮어쓰기된 항목은 건너뜀)
+
+    트리밍할 무음이 없었으면 파일은 그대로 두고 트리밍 전 표시만 제거합니다.
+    """
+    if trimmed is audio_data or trimmed == audio_data:
+        cache_mgr.mark_trimmed(cache_key, token)
+    elif cache_mgr.replace(cache_key, trimmed, token):
+        logger.info(f"Replaced with trimmed audio: {cache_key[:16]}...")
+
+
+def _schedule_trim(cache_key: str, audio_data: bytes, token) -> None:
+    """
+    캐시에 저장된 미트리밍 오디오(write(..., untrimmed=True))의 백그라운드 트리밍 예약
+
+    Args:
+        token: 저장 시 cache_mgr.write()가 반환한 파일 토큰 (교체 시 파일이 그대로인지 확인)
+    """
+    if VAD_ENABLED:
+        vad_trimmer.submit(cache_key, audio_data,
+                           lambda key, trimmed: _replace_trimmed(key, audio_data, trimmed, token),
+                           version=token)
+
+
+def _requeue_untrimmed() -> None:
+    """
+    이전 실행에서 트리밍하지 못한 캐시 항목(재시작, 트리밍 실패 등)을 백그라운드 트리밍에 다시 등록
+
+    대기열이 쌓이지 않도록 트리밍 워커 수의 몇 배까지만 채우며 등록합니다.
+    """
+    requeued = 0
+    try:
+        for key, audio_data, token in cache_mgr.untrimmed_entries():
+            while vad_trimmer.pending_count() >= VAD_ASYNC_WORKERS * 4:
+                time.sleep(0.5)
+            _schedule_trim(key, audio_data, token)
+            requeued += 1
+    except Exception as e:
+        logger.error(f"Untrimmed cache requeue failed: {e}")
+    if requeued:
+        logger.info(f"Requeued {requeued} untrimmed cache entries for VAD trimming")
+
+
+def _vad_header(cache_key: str = None, fresh: bool = False, stream: bool = False,
+                use_cache: bool = True, audio_data: bytes = None) -> str:
+    """
+    X-VAD-Trim 헤더 값: 응답 오디오의 트리밍 상태
+
+    trimmed(앞뒤 트리밍), leading(스트리밍: 선행 무음만), untrimmed(백그라운드 트리밍 전),
+    disabled(VAD 비활성화). 캐시 항목은 파일에 기록된 트리밍 전 표시로 판단하므로 재시작 후나
+    다른 워커가 저장한 항목에도 맞는 값이 나갑니다.
+
+    Args:
+        audio_data: 새로 합성한 응답 오디오 (트리밍 실패로 원본 그대로면 untrimmed)
+    """
+    if not VAD_ENABLED:
+        return 'disabled'
+    if fresh:
+        if (VAD_ASYNC and use_cache) or isinstance(audio_data, UntrimmedAudio):
+            return 'untrimmed'
+        return 'leading' if stream else 'trimmed'
+    return 'untrimmed' if cache_mgr.is_untrimmed(cache_key) else 'trimmed'
 
-    # 지수 백오프 재시도 (네트워크/일시적 백엔드 오류 대응)
-    response = None
-    last_error = None
-    for attempt in range(TTS_MAX_RETRIES):
-        try:
-            response = requests.post(
-                f"{TTS_BACKEND_URL}/v1/audio/speech",
-                json=payload,
-                timeout=TTS_TIMEOUT
-            )
-            response.raise_for_status()
-            break  # 성공
-        except requests.RequestException as e:
-            last_error = e
-            if attempt < TTS_MAX_RETRIES - 1:
-                delay = TTS_RETRY_BASE_DELAY * (2 ** attempt) + random.uniform(0, 0.5)
-                logger.warning(
-                    f"TTS backend retry {attempt + 1}/{TTS_MAX_RETRIES} "
-                    f"after {delay:.1f}s: {e}"
-                )
-                time.sleep(delay)
-
-    if response is None or last_error and not response:
-        logger.error(f"TTS backend failed after {TTS_MAX_RETRIES} retries: {last_error}")
-        cache_mgr.update_stats(error=True)
-        return jsonify({'error': f'TTS backend error: {str(last_error)}'}), 502
 
-    # VAD 트리밍 + 캐시 저장
-    audio_data = trim_silence(response.content)
+def _synthesize(text: str, voice: str, effective_model: str, rate: str,
+                cache_key: str, use_cache: bool) -> bytes:
+    """
+    캐시 미스 처리: 백엔드 요청 → VAD 트리밍 → 캐시 저장
+
+    VAD_ASYNC 모드에서는 미트리밍 오디오를 저장/반환하고 트리밍은 백그라운드로 넘깁니다.
+    동기 트리밍이 실패(추론 시간 초과 등)한 오디오도 트리밍 전으로 저장하고 백그라운드로 넘깁니다.
+    """
+    # 레지스트리 등록 직전에 다른 요청이 저장을 마쳤을 수 있음
+    if use_cache:
+        audio_data = cache_mgr.read(cache_key)
+        if audio_data is not None:
+            cache_mgr.update_stats(cache_hit=True)
+            return audio_data
+
+    cache_mgr.update_stats(cache_hit=False, backend_request=True)
+    cache_mgr.update_usage(text)
+
+    payload = _build_payload(text, voice, effective_model, rate)
+    audio_data = backend_client.synthesize(payload)
+    if not (VAD_ASYNC and use_cache):
+        audio_data = trim_silence(audio_data)
     if use_cache:
-        cache_file.write_bytes(audio_data)
+        untrimmed = VAD_ASYNC or isinstance(audio_data, UntrimmedAudio)
+        token = cache_mgr.write(cache_key, audio_data, untrimmed=untrimmed)
         logger.info(f"Saved to cache: {cache_key[:16]}...")
+        if untrimmed:
+            _schedule_trim(cache_key, audio_data, token)
+    return audio_data
+
+
+def _cached_audio_response(cache_key: str, source, headers: dict) -> Response:
+    """
+    캐시 히트 응답 (Range/206, ETag/If-None-Match/304 지원)
+
+    백그라운드 트리밍 대기 중인 항목은 ETag를 달리해 교체 후 재검증 시 새 버전을 받도록 합니다.
+
+    Args:
+        cache_key: ETag로 사용할 전체 캐시 키
+        source: CacheManager.lookup() 결과 (bytes 또는 파일 경로)
+        headers: 추가 응답 헤더
+    """
+    vad_state = _vad_header(cache_key)
+    etag = cache_key if vad_state != 'untrimmed' else f"{cache_key}-untrimmed"
+    if isinstance(source, Path):
+        response = send_file(source, mimetype='audio/mpeg', conditional=True, etag=etag)
+    else:
+        response = Response(source, mimetype='audio/mpeg')
+        response.set_etag(etag)
+        response = response.make_conditional(request, accept_ranges=True, complete_length=len(source))
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-VAD-Trim'] = vad_state
+    response.headers.update(headers)
+    return response
+
+
+def _iter_trimmed_stream(backend_response):
+    """
+    백엔드 청크를 읽어 클라이언트로 보낼 조각을 순서대로 생성
+
+    첫 VAD_STREAM_HEAD_MS 구간만 모아서 선행 무음을 프레임 단위로 자르고,
+    이후 청크는 그대로 통과시킵니다. 전체 길이가 첫 구간보다 짧으면
+    버퍼 전체에 일반 트리밍(앞뒤)을 적용합니다. VAD_ASYNC 모드에서는
+    트리밍 없이 그대로 통과시킵니다.
+    """
+    head = bytearray()
+    head_done = not VAD_ENABLED or VAD_ASYNC
+    for chunk in backend_response.iter_content(chunk_size=TTS_STREAM_CHUNK_SIZE):
+        if not chunk:
+            continue
+        if head_done:
+            yield chunk
+            continue
+        head.extend(chunk)
+        if mp3_frames.duration_ms(head) >= VAD_STREAM_HEAD_MS:
+            head_done = True
+            yield trim_leading_silence(bytes(head))
+
+    if not head_done and head:
+        yield trim_silence(bytes(head))
+
+
+def _stream_tts_response(text: str, voice: str, effective_model: str, rate: str,
+                         cache_key: str, use_cache: bool, call=None) -> Response:
+    """
+    캐시 미스 스트리밍 응답
 
-    return Response(audio_data, mimetype='audio/mpeg', headers={
+    백엔드 응답 헤더를 받는 즉시 스트리밍을 시작하고, 마지막 조각까지 받으면
+    캐시에 저장한 뒤 single-flight follower(call)에게 전체 결과를 게시합니다.
+    클라이언트가 중간에 끊어도 나머지를 끝까지 읽어 캐시를 완성합니다.
+    저장된 항목은 후행 무음까지 제거하도록 백그라운드 트리밍을 예약합니다.
+    """
+    published = False
+    started = False
+    backend_response = None
+
+    def publish(result=None, error=None):
+        # 생성기 종료와 응답 close 콜백 중 먼저 도달한 쪽만 게시
+        nonlocal published
+        if published:
+            return
+        published = True
+        if call is not None:
+            tts_flight.resolve(cache_key, call, result=result, error=error)
+
+    try:
+        cache_mgr.update_stats(cache_hit=False, backend_request=True)
+        cache_mgr.update_usage(text)
+
+        payload = _build_payload(text, voice, effective_model, rate)
+        try:
+            backend_response = backend_client.synthesize(payload, stream=True)
+        except BackendError as e:
+            publish(error=e)
+            cache_mgr.update_stats(error=True)
+            return jsonify({'error': f'TTS backend error: {e}'}), 502
+
+        pieces = _iter_trimmed_stream(backend_response)
+
+        def generate():
+            nonlocal started
+            started = True
+            parts = []
+            error = None
+            try:
+                for piece in pieces:
+                    parts.append(piece)
+                    yield piece
+            except GeneratorExit:
+                logger.info(f"Stream client disconnected: {cache_key[:16]}..., finishing backend read")
+            except Exception as e:
+                error = e
+                logger.error(f"TTS stream error: {e}")
+                # 잘린 오디오가 정상 응답처럼 끝나지 않도록 다시 발생시켜 WSGI 서버가 종료 청크 없이 연결을 끊게 함
+                raise
+            finally:
+                try:
+                    if error is None:
+                        parts.extend(pieces)
+                except Exception as e:
+                    error = e
+                    logger.error(f"TTS stream drain error: {e}")
+                finally:
+                    backend_response.close()
+
+                if error is not None:
+                    publish(error=BackendError(str(error)))
+                else:
+                    audio_data = b''.join(parts)
+                    if use_cache:
+                        token = cache_mgr.write(cache_key, audio_data, untrimmed=VAD_ENABLED)
+                        logger.info(f"Saved to cache (stream): {cache_key[:16]}...")
+                        _schedule_trim(cache_key, audio_data, token)
+                    publish(result=audio_data)
+
+        def on_close():
+            # 본문을 한 번도 보내지 못하고 닫힌 응답 (헤더 전송 중 끊김 등): 생성기의 finally가 실행되지 않음
+            if not started:
+                backend_response.close()
+                publish(error=BackendError('stream response closed before it was sent'))
+
+        response = Response(generate(), mimetype='audio/mpeg', headers={
+            'X-Cache': 'MISS',
+            'X-Stream': 'true',
+            'X-VAD-Trim': _vad_header(fresh=True, stream=True, use_cache=use_cache),
+            'X-Content-Type-Options': 'nosniff'
+        })
+        response.call_on_close(on_close)
+        return response
+    except BaseException as e:
+        # 응답을 만들기 전에 실패하면 follower가 무한정 기다리지 않도록 여기서 게시
+        if backend_response is not None:
+            backend_response.close()
+        publish(error=BackendError(str(e) or type(e).__name__))
+        raise
+
+
+def _handle_tts_request(text: str, voice: str, model: str = 'tts-1',
+                        rate: str = None, use_cache: bool = True,
+                        stream: bool = None) -> Response:
+    """
+    모든 TTS 엔드포인트의 공통 로직.
+
+    1. 캐시 확인 → 2. 백엔드 요청 → 3. VAD 트리밍 → 4. 캐시 저장 → 5. 응답
+
+    같은 캐시 키의 동시 미스는 single-flight로 병합되어 백엔드 요청과
+    VAD 트리밍을 한 번만 수행합니다 (useCache=false 요청은 병합하지 않음).
+    stream이 참이면 (None이면 TTS_STREAM_DEFAULT) 미스 시 백엔드 오디오를
+    도착하는 대로 전달합니다. 진행 중인 요청에 합류한 follower는 항상
+    완성된 결과를 한 번에 받습니다.
+    """
+    # TTS_MODEL 환경변수가 설정되면 모델명 오버라이드 (MLX 등 로컬 백엔드용)
+    effective_model = TTS_MODEL if TTS_MODEL else model
+    if stream is None:
+        stream = TTS_STREAM_DEFAULT
+
+    cache_key = cache_mgr.generate_cache_key(text, voice, rate)
+
+    # 캐시 히트 (hot tier → 디스크, 파일은 내용을 읽지 않고 전송)
+    source = cache_mgr.lookup(cache_key) if use_cache else None
+    if source is not None:
+        try:
+            response = _cached_audio_response(cache_key, source, {
+                'X-Cache': 'HIT',
+                'X-Content-Type-Options': 'nosniff'
+            })
+        except FileNotFoundError:
+            # 인덱스 조회 후 다른 프로세스가 삭제한 경우 → 미스로 처리
+            response = None
+        if response is not None:
+            logger.info(f"Cache HIT: {cache_key[:16]}...")
+            cache_mgr.update_stats(cache_hit=True)
+            _CACHE_HIT_BYTES.inc(len(source) if isinstance(source, bytes) else cache_mgr.entry_size(cache_key) or 0)
+            return response
+
+    # 캐시 미스 → 백엔드 요청 (동일 키 진행 중이면 결과 대기)
+    logger.info(f"Cache MISS: {cache_key[:16]}..., requesting backend...")
+
+    def synthesize():
+        return _synthesize(text, voice, effective_model, rate, cache_key, use_cache)
+
+    call, leader = tts_flight.acquire(cache_key) if use_cache else (None, True)
+    try:
+        if not leader:
+            try:
+                audio_data = tts_flight.wait(call, TTS_FLIGHT_WAIT_TIMEOUT)
+            except TimeoutError:
+                # leader가 멈춘 경우: 더 기다리지 않고 직접 합성 (레지스트리 키는 leader가 정리)
+                logger.warning(f"Single-flight leader timed out: {cache_key[:16]}..., synthesizing independently")
+                call, leader = None, True
+        if leader and stream:
+            return _stream_tts_response(text, voice, effective_model, rate, cache_key, use_cache, call)
+        if leader:
+            audio_data = tts_flight.run(cache_key, call, synthesize) if call is not None else synthesize()
+    except BackendError as e:
+        cache_mgr.update_stats(error=True)
+        return jsonify({'error': f'TTS backend error: {e}'}), 502
+    coalesced = not leader
+
+    headers = {
         'Content-Length': str(len(audio_data)),
         'X-Cache': 'MISS',
+        'X-VAD-Trim': _vad_header(fresh=True, use_cache=use_cache, audio_data=audio_data),
         'X-Content-Type-Options': 'nosniff'
-    })
+    }
+    if coalesced:
+        logger.info(f"Coalesced MISS: {cache_key[:16]}... (shared leader result)")
+        cache_mgr.update_stats(cache_hit=False, coalesced=True)
+        headers['X-Coalesced'] = 'true'
+
+    return Response(audio_data, mimetype='audio/mpeg', headers=headers)
 
 
 # =============================================================================
@@ -210,7 +746,8 @@ def tts_hybrid_get():
         if not text:
             return jsonify({'error': 'text is required'}), 400
         voice = _validate_voice(request.args.get('voice', 'alloy'))
-        return _handle_tts_request(text, voice)
+        stream = _parse_stream_flag(request.args.get('stream'))
+        return _handle_tts_request(text, voice, stream=stream)
     except Exception as e:
         logger.error(f"TTS request error: {e}")
         cache_mgr.update_stats(error=True)
@@ -230,7 +767,8 @@ def tts_hybrid():
         voice = _validate_voice(body.get('voice', 'alloy'))
         rate = body.get('rate')
         use_cache = body.get('useCache', True)
-        return _handle_tts_request(text, voice, rate=rate, use_cache=use_cache)
+        stream = _parse_stream_flag(body.get('stream', request.args.get('stream')))
+        return _handle_tts_request(text, voice, rate=rate, use_cache=use_cache, stream=stream)
     except Exception as e:
         logger.error(f"TTS request error: {e}")
         cache_mgr.update_stats(error=True)
@@ -248,7 +786,8 @@ def tts_azure_compatible():
         if not text:
             return jsonify({'error': 'text is required'}), 400
         voice = _validate_voice(body.get('voice', 'alloy'))
-        return _handle_tts_request(text, voice)
+        stream = _parse_stream_flag(body.get('stream', request.args.get('stream')))
+        return _handle_tts_request(text, voice, stream=stream)
     except Exception as e:
         logger.error(f"TTS request error: {e}")
         cache_mgr.update_stats(error=True)
@@ -267,13 +806,128 @@ def tts_openai_compatible():
         voice = _validate_voice(body.get('voice', 'alloy'))
         if not text:
             return jsonify({'error': 'input is required'}), 400
-        return _handle_tts_request(text, voice, model=model)
+        stream = _parse_stream_flag(body.get('stream', request.args.get('stream')))
+        return _handle_tts_request(text, voice, model=model, stream=stream)
     except Exception as e:
         logger.error(f"TTS request error: {e}")
         cache_mgr.update_stats(error=True)
         return jsonify({'error': str(e)}), 500
 
 
+# =============================================================================
+# 배치 TTS 엔드포인트
+# =============================================================================
+
+def _synthesize_batch_item(index: int, text: str, voice: str, rate: str, cache_key: str) -> dict:
+    """배치 미스 항목 합성 (single-flight 공유). 오디오는 캐시에만 저장."""
+    effective_model = TTS_MODEL if TTS_MODEL else 'tts-1'
+    try:
+        audio_data, coalesced = tts_flight.do(cache_key, lambda: _synthesize(
+            text, voice, effective_model, rate, cache_key, True), TTS_FLIGHT_WAIT_TIMEOUT)
+    except BackendError as e:
+        cache_mgr.update_stats(error=True)
+        return {'index': index, 'key': cache_key, 'status': 'error', 'error': f'TTS backend error: {e}'}
+    except Exception as e:
+        logger.error(f"Batch item {index} error: {e}")
+        cache_mgr.update_stats(error=True)
+        return {'index': index, 'key': cache_key, 'status': 'error', 'error': str(e)}
+
+    if coalesced:
+        cache_mgr.update_stats(cache_hit=False, coalesced=True)
+    return {
+        'index': index,
+        'key': cache_key,
+        'status': 'coalesced' if coalesced else 'miss',
+        'size': len(audio_data)
+    }
+
+
+def _resolve_batch(items: list):
+    """
+    배치 항목을 캐시 히트와 미스로 분류
+
+    Returns:
+        (즉시 확정된 결과 목록, 미스 합성 Future 목록)
+    """
+    results = []
+    futures = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results.append({'index': index, 'status': 'error', 'error': 'item must be an object'})
+            continue
+        text = str(item.get('text') or '').strip()
+        if not text:
+            results.append({'index': index, 'status': 'error', 'error': 'text is required'})
+            continue
+        voice = _validate_voice(item.get('voice', 'alloy'))
+        rate = item.get('rate')
+
+        cache_key = cache_mgr.generate_cache_key(text, voice, rate)
+        size = cache_mgr.entry_size(cache_key)
+        if size is not None:
+            cache_mgr.update_stats(cache_hit=True)
+            results.append({'index': index, 'key': cache_key, 'status': 'hit', 'size': size})
+            continue
+
+        futures.append(batch_executor.submit(_synthesize_batch_item, index, text, voice, rate, cache_key))
+    return results, futures
+
+
+@app.route('/api/tts/batch', methods=['POST'])
+def tts_batch():
+    """
+    배치 TTS 생성 (노트 전체 사전 합성)
+
+    Request Body:
+        {
+            "items": [{"text": string, "voice": string, "rate": string}, ...],
+            "stream": bool  (true면 완료되는 항목부터 NDJSON으로 전송)
+        }
+
+    Returns:
+        항목별 캐시 키와 상태 (hit/miss/coalesced/error).
+        오디오는 /api/cache/<key>로 조회합니다.
+    """
+    try:
+        body = request.get_json()
+        if not body:
+            return jsonify({'error': 'No data provided'}), 400
+        items = body.get('items')
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'items must be a non-empty array'}), 400
+        if len(items) > TTS_BATCH_MAX_ITEMS:
+            return jsonify({'error': f'too many items (max {TTS_BATCH_MAX_ITEMS})'}), 400
+
+        stream = _parse_stream_flag(body.get('stream', request.args.get('stream')))
+        results, futures = _resolve_batch(items)
+        logger.info(f"Batch TTS: {len(items)} items, {len(futures)} to synthesize")
+
+        if stream:
+            def generate():
+                for result in results:
+                    yield json.dumps(result, ensure_ascii=False) + '\n'
+                for future in as_completed(futures):
+                    yield json.dumps(future.result(), ensure_ascii=False) + '\n'
+
+            return Response(generate(), mimetype='application/x-ndjson', headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no',
+                'X-Content-Type-Options': 'nosniff'
+            })
+
+        results.extend(future.result() for future in futures)
+        results.sort(key=lambda r: r['index'])
+        summary = {status: 0 for status in ('hit', 'miss', 'coalesced', 'error')}
+        for result in results:
+            summary[result['status']] += 1
+        return jsonify({'results': results, 'summary': summary})
+
+    except Exception as e:
+        logger.error(f"Batch TTS error: {e}")
+        cache_mgr.update_stats(error=True)
+        return jsonify({'error': str(e)}), 500
+
+
 # =============================================================================
 # 캐시 관리 엔드포인트
 # =============================================================================
@@ -287,35 +941,24 @@ def get_cache(key: str):
         key: 캐시 키 (SHA256 해시 또는 축약형)
 
     Returns:
-        캐시된 오디오 또는 404
+        캐시된 오디오 (Range → 206, If-None-Match 일치 → 304) 또는 404
     """
     try:
         # Path Traversal 방지: 캐시 키 검증
         if not _validate_cache_key(key):
             return jsonify({'error': 'Invalid cache key'}), 400
 
-        # 전체 키 또는 축약형 키 검색
-        cache_file = cache_mgr.cache_dir / f"{key}.mp3"
-
-        if not cache_file.exists():
-            # 축약형 키로 검색 (startswith + 검증된 키만)
-            for f in cache_mgr.cache_dir.glob(f"{key}*.mp3"):
-                cache_file = f
-                break
+        # 전체 키 또는 축약형 키 검색 (검증된 키만)
+        cache_key = cache_mgr.resolve_key(key)
+        source = cache_mgr.lookup(cache_key) if cache_key else None
 
-        if not cache_file.exists():
+        if source is None:
             return jsonify({'error': 'Cache not found'}), 404
 
-        audio_data = cache_file.read_bytes()
+        return _cached_audio_response(cache_key, source, {'X-Content-Type-Options': 'nosniff'})
 
-        return Response(
-            audio_data,
-            mimetype='audio/mpeg',
-            headers={
-                'Content-Length': str(len(audio_data)),
-                'X-Content-Type-Options': 'nosniff'
-            }
-        )
+    except FileNotFoundError:
+        return jsonify({'error': 'Cache not found'}), 404
 
     except Exception as e:
         logger.error(f"Cache get error: {e}")
@@ -338,13 +981,12 @@ def put_cache(key: str):
         if not _validate_cache_key(key):
             return jsonify({'error': 'Invalid cache key'}), 400
 
-        cache_file = cache_mgr.cache_dir / f"{key}.mp3"
         audio_data = request.get_data()
 
         if not audio_data:
             return jsonify({'error': 'No data provided'}), 400
 
-        cache_file.write_bytes(audio_data)
+        cache_mgr.write(key, audio_data)
         logger.info(f"Cache saved: {key[:16]}...")
 
         return jsonify({'success': True, 'key': key})
@@ -370,19 +1012,11 @@ def delete_cache(key: str):
         if not _validate_cache_key(key):
             return jsonify({'error': 'Invalid cache key'}), 400
 
-        # 전체 키 또는 축약형 키 검색
-        cache_file = cache_mgr.cache_dir / f"{key}.mp3"
-
-        if not cache_file.exists():
-            # 축약형 키로 검색 (startswith + 검증된 키만)
-            for f in cache_mgr.cache_dir.glob(f"{key}*.mp3"):
-                cache_file = f
-                break
+        # 전체 키 또는 축약형 키 검색 (검증된 키만)
+        cache_key = cache_mgr.resolve_key(key)
 
-        if not cache_file.exists():
+        if not cache_key or not cache_mgr.delete(cache_key):
             return jsonify({'error': 'Cache not found'}), 404
-
-        cache_file.unlink()
         logger.info(f"Cache deleted: {key[:16]}...")
 
         return jsonify({'success': True, 'key': key})
@@ -401,13 +1035,7 @@ def clear_all_cache():
         삭제된 파일 수
     """
     try:
-        deleted_count = 0
-        for cache_file in cache_mgr.cache_dir.glob("*.mp3"):
-            try:
-                cache_file.unlink()
-                deleted_count += 1
-            except Exception as e:
-                logger.warning(f"Failed to delete {cache_file.name}: {e}")
+        deleted_count = cache_mgr.clear()
 
         logger.info(f"Cache cleared: {deleted_count} files deleted")
 
@@ -425,15 +1053,15 @@ def clear_all_cache():
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """통계 조회"""
-    return jsonify(cache_mgr.get_stats_summary())
+    stats = cache_mgr.get_stats_summary()
+    stats['inFlightSyntheses'] = tts_flight.in_flight()
+    return jsonify(stats)
 
 
 @app.route('/api/usage', methods=['GET'])
 def get_usage():
     """사용량 조회"""
-    with cache_mgr._usage_lock:
-        usage = cache_mgr.usage.copy()
-    return jsonify(usage)
+    return jsonify(cache_mgr.get_usage())
 
 
 @app.route('/api/cache-stats', methods=['GET'])
@@ -446,39 +1074,106 @@ def get_cache_stats():
 # SSE 엔드포인트
 # =============================================================================
 
-@app.route('/api/events/playback', methods=['GET'])
-def sse_playback():
+def _parse_version(value):
+    """버전 문자열 (Last-Event-ID, since) → int. 없거나 잘못되면 None."""
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _initial_position_events(event: str, note_path: str = None, user: str = None,
+                             last_event_id: str = None) -> list:
     """
-    SSE 엔드포인트 - 재생 위치 실시간 스트림
+    연결 직후 보낼 위치 이벤트 [(한 줄 JSON, 버전), ...]
 
-    Returns:
-        text/event-stream 응답
+    Last-Event-ID가 있으면 그 이후 바뀐 구독 범위의 레코드 전부(델타), 없으면 구독 범위의
+    최신 레코드 하나(스냅샷). 메모리만 조회합니다.
     """
+    store = POSITION_STORES[event]
+    since = _parse_version(last_event_id)
+    if since is not None:
+        return store.changes_since(since, note_path or None, user or None, as_json=True)
+    current = store.get_json(note_path or None, user or None)
+    return [current] if current else []
+
+
+def _position_query(store: PositionStore):
+    """
+    GET 위치 조회 공통 처리
+
+    since가 있으면 {version, entries} 델타, 없으면 notePath/user 범위의 최신 레코드.
+    """
+    note_path = request.args.get('notePath') or None
+    user = request.args.get('user') or None
+    if 'since' in request.args:
+        since = _parse_version(request.args.get('since'))
+        if since is None:
+            return jsonify({'error': 'since must be an integer'}), 400
+        return jsonify({
+            'version': store.version,
+            'entries': store.changes_since(since, note_path, user)
+        })
+    return jsonify(store.get(note_path, user))
+
+
+def _async_sse_redirect():
+    """
+    SSE 엔진이 켜져 있으면 같은 경로의 엔진 URL로 307 리다이렉트 (아니면 None)
+
+    다른 출처로 리다이렉트된 EventSource 요청은 Origin: null로 도착하므로, 요청 출처가 허용
+    목록에 있거나(없으면 같은 출처) 할 때만 엔진이 확인할 단기 토큰을 붙입니다.
+    """
+    if async_sse is None or not SSE_ASYNC_REDIRECT:
+        return None
+    base = SSE_ASYNC_PUBLIC_URL
+    if not base:
+        host = request.host
+        if not host.endswith(']'):
+            host = host.rsplit(':', 1)[0]
+        base = f"{request.scheme}://{host}:{SSE_ASYNC_PORT}"
+    params = [(name, value) for name, value in request.args.items(multi=True) if name != REDIRECT_TOKEN_PARAM]
+    origin = request.headers.get('Origin')
+    if origin is None or async_sse.allows_origin(origin):
+        params.append((REDIRECT_TOKEN_PARAM, async_sse.redirect_token(request.path)))
+    query = urlencode(params)
+    return redirect(base + request.path + (f"?{query}" if query else ''), code=307)
+
+
+def _sse_response(event: str) -> Response:
+    """
+    요청 스레드 방식 SSE 스트림 (SSE 엔진을 쓰지 않을 때)
+
+    연결마다 우편함 하나와 요청 스레드 하나를 점유합니다.
+    쿼리 파라미터 notePath/user가 있으면 해당 노트/사용자의 이벤트만 받습니다.
+    각 이벤트의 id는 위치 버전이므로 재연결 시 Last-Event-ID 이후 변경분만 다시 받습니다.
+    """
+    note_path = request.args.get('notePath')
+    user = request.args.get('user')
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+
     def generate():
-        client_queue = queue.Queue(maxsize=100)
-        sse_manager.add_client(client_queue)
+        client_queue = Mailbox()
+        sse_manager.add_client(client_queue, event, note_path, user)
 
         try:
-            # 연결 즉시 현재 상태 전송
-            if PLAYBACK_POSITION_FILE.exists():
-                current_data = PLAYBACK_POSITION_FILE.read_text(encoding='utf-8')
-                # JSON 여러 줄 제거 (SSE 호환성을 위해 한 줄로)
-                import json
-                try:
-                    parsed = json.loads(current_data)
-                    current_data = json.dumps(parsed, ensure_ascii=False, separators=(',', ':'))
-                except:
-                    pass  # 이미 문자열이면 그대로 사용
-                yield f"event: playback\ndata: {current_data}\n\n"
-                logger.info("Sent current playback position to new client")
+            # 연결 즉시 현재 상태 전송 (재연결이면 놓친 변경분)
+            initial = _initial_position_events(event, note_path, user, last_event_id)
+            for data, version in initial:
+                yield format_event(event, data, version)
+            if initial:
+                logger.info(f"Sent {len(initial)} {event} position(s) to new client")
+            else:
+                # WSGI 서버는 첫 본문 조각과 함께 헤더를 보내므로, 보낼 위치가 없어도 바로 연결을 열어 둠
+                yield ": keep-alive\n\n"
 
             # 메인 SSE 루프
             while True:
                 try:
-                    # 클라이언트 큐에서 메시지 대기 (타임아웃으로 keep-alive 전송)
-                    data = client_queue.get(timeout=sse_manager.keep_alive_interval)
-                    yield f"event: playback\ndata: {data}\n\n"
-                    logger.debug(f"Sent playback update: {data[:50]}...")
+                    # 우편함에서 최신 메시지 대기 (타임아웃으로 keep-alive 전송)
+                    data, version = client_queue.get(timeout=sse_manager.keep_alive_interval)
+                    yield format_event(event, data, version)
+                    logger.debug(f"Sent {event} update: {data[:50]}...")
                 except queue.Empty:
                     # keep-alive 전송 (연결 유지)
                     yield ": keep-alive\n\n"
@@ -502,51 +1197,34 @@ def sse_playback():
     )
 
 
-@app.route('/api/events/scroll', methods=['GET'])
-def sse_scroll():
+@app.route('/api/events/playback', methods=['GET'])
+def sse_playback():
     """
-    SSE 엔드포인트 - 스크롤 위치 실시간 스트림
+    SSE 엔드포인트 - 재생 위치 실시간 스트림
+
+    Query Parameters:
+        notePath: 이 노트의 재생 위치만 구독 (선택)
+        user: 이 사용자의 재생 위치만 구독 (선택)
 
     Returns:
-        text/event-stream 응답
+        text/event-stream 응답 (SSE 엔진 사용 시 엔진으로 307 리다이렉트)
     """
-    def generate():
-        client_queue = queue.Queue(maxsize=100)
-        sse_manager.add_client(client_queue)
+    return _async_sse_redirect() or _sse_response('playback')
 
-        try:
-            # 연결 즉시 현재 상태 전송
-            if SCROLL_POSITION_FILE.exists():
-                current_data = SCROLL_POSITION_FILE.read_text(encoding='utf-8')
-                yield f"event: scroll\ndata: {current_data}\n\n"
-                logger.info("Sent current scroll position to new client")
 
-            # 메인 SSE 루프
-            while True:
-                try:
-                    data = client_queue.get(timeout=sse_manager.keep_alive_interval)
-                    yield f"event: scroll\ndata: {data}\n\n"
-                    logger.debug(f"Sent scroll update: {data[:50]}...")
-                except queue.Empty:
-                    yield ": keep-alive\n\n"
-        except GeneratorExit:
-            logger.info("Client disconnected gracefully")
-        except Exception as e:
-            logger.error(f"SSE generator error: {e}")
-        finally:
-            sse_manager.remove_client(client_queue)
-            logger.info("SSE connection cleaned up")
+@app.route('/api/events/scroll', methods=['GET'])
+def sse_scroll():
+    """
+    SSE 엔드포인트 - 스크롤 위치 실시간 스트림
 
-    return Response(
-        generate(),
-        mimetype='text/event-stream',
-        headers={
-            'Cache-Control': 'no-cache',
-            'Connection': 'keep-alive',
-            'X-Accel-Buffering': 'no',
-            'X-Content-Type-Options': 'nosniff'
-        }
-    )
+    Query Parameters:
+        notePath: 이 노트의 스크롤 위치만 구독 (선택)
+        user: 이 사용자의 스크롤 위치만 구독 (선택)
+
+    Returns:
+        text/event-stream 응답 (SSE 엔진 사용 시 엔진으로 307 리다이렉트)
+    """
+    return _async_sse_redirect() or _sse_response('scroll')
 
 
 # =============================================================================
@@ -558,22 +1236,17 @@ def get_playback_position():
     """
     재생 위치 조회 (기존 호환성 유지)
 
+    Query Parameters:
+        notePath: 이 노트의 위치 (선택, 없으면 가장 최근 위치)
+        user: 이 사용자의 위치 (선택)
+        since: 이 버전 이후 바뀐 위치 목록 (선택)
+
     Returns:
-        JSON 형식의 재생 위치 데이터
+        JSON 형식의 재생 위치 데이터 (since 지정 시 {"version", "entries"})
     """
     try:
-        if not PLAYBACK_POSITION_FILE.exists():
-            return jsonify({
-                'lastPlayedIndex': -1,
-                'notePath': '',
-                'noteTitle': '',
-                'timestamp': 0,
-                'deviceId': ''
-            })
-
-        data = json.loads(PLAYBACK_POSITION_FILE.read_text(encoding='utf-8'))
-        logger.info(f"GET playback position: index={data.get('lastPlayedIndex', -1)}")
-        return jsonify(data)
+        logger.info(f"GET playback position: {request.args.to_dict()}")
+        return _position_query(playback_store)
 
     except Exception as e:
         logger.error(f"Error getting playback position: {e}")
@@ -590,7 +1263,8 @@ def save_playback_position():
             "lastPlayedIndex": int,
             "notePath": string,
             "noteTitle": string,
-            "deviceId": string
+            "deviceId": string,
+            "user": string (선택, 구독 필터용)
         }
 
     Returns:
@@ -605,6 +1279,7 @@ def save_playback_position():
         note_path = body.get('notePath', '')
         note_title = body.get('noteTitle', '')
         device_id = body.get('deviceId', 'unknown')
+        user = body.get('user')
 
         # 입력 검증
         if not isinstance(last_played_index, int):
@@ -621,10 +1296,11 @@ def save_playback_position():
             'timestamp': timestamp,
             'deviceId': device_id
         }
+        if user:
+            position_data['user'] = str(user)
 
-        # 파일에 저장
-        json_data = json.dumps(position_data, ensure_ascii=False, indent=2)
-        PLAYBACK_POSITION_FILE.write_text(json_data, encoding='utf-8')
+        # 저장 (디스크 기록은 write-behind)
+        position_data = playback_store.set(position_data)
 
         # SSE 브로드캐스트
         broadcast_count = sse_manager.broadcast_playback_position(position_data)
@@ -638,6 +1314,7 @@ def save_playback_position():
         return jsonify({
             'success': True,
             'timestamp': timestamp,
+            'version': position_data['version'],
             'broadcastCount': broadcast_count
         })
 
@@ -655,21 +1332,17 @@ def get_scroll_position():
     """
     스크롤 위치 조회 (기존 호환성 유지)
 
+    Query Parameters:
+        notePath: 이 노트의 위치 (선택, 없으면 가장 최근 위치)
+        user: 이 사용자의 위치 (선택)
+        since: 이 버전 이후 바뀐 위치 목록 (선택)
+
     Returns:
-        JSON 형식의 스크롤 위치 데이터
+        JSON 형식의 스크롤 위치 데이터 (since 지정 시 {"version", "entries"})
     """
     try:
-        if not SCROLL_POSITION_FILE.exists():
-            return jsonify({
-                'scrollTop': 0,
-                'notePath': '',
-                'timestamp': 0,
-                'deviceId': ''
-            })
-
-        data = json.loads(SCROLL_POSITION_FILE.read_text(encoding='utf-8'))
-        logger.info(f"GET scroll position: scrollTop={data.get('scrollTop', 0)}")
-        return jsonify(data)
+        logger.info(f"GET scroll position: {request.args.to_dict()}")
+        return _position_query(scroll_store)
 
     except Exception as e:
         logger.error(f"Error getting scroll position: {e}")
@@ -685,7 +1358,8 @@ def save_scroll_position():
         {
             "scrollTop": int,
             "notePath": string,
-            "deviceId": string
+            "deviceId": string,
+            "user": string (선택, 구독 필터용)
         }
 
     Returns:
@@ -699,6 +1373,7 @@ def save_scroll_position():
         scroll_top = body.get('scrollTop', 0)
         note_path = body.get('notePath', '')
         device_id = body.get('deviceId', 'unknown')
+        user = body.get('user')
 
         # 입력 검증
         if not isinstance(scroll_top, (int, float)):
@@ -714,10 +1389,11 @@ def save_scroll_position():
             'timestamp': timestamp,
             'deviceId': device_id
         }
+        if user:
+            scroll_data['user'] = str(user)
 
-        # 파일에 저장
-        json_data = json.dumps(scroll_data, ensure_ascii=False, indent=2)
-        SCROLL_POSITION_FILE.write_text(json_data, encoding='utf-8')
+        # 저장 (디스크 기록은 write-behind)
+        scroll_data = scroll_store.set(scroll_data)
 
         # SSE 브로드캐스트
         broadcast_count = sse_manager.broadcast_scroll_position(scroll_data)
@@ -731,6 +1407,7 @@ def save_scroll_position():
         return jsonify({
             'success': True,
             'timestamp': timestamp,
+            'version': scroll_data['version'],
             'broadcastCount': broadcast_count
         })
 
@@ -740,15 +1417,134 @@ def save_scroll_position():
 
 
 # =============================================================================
-# 메인 실행
+# 시작/종료 (python server.py와 gunicorn 워커 공통)
 # =============================================================================
 
-if __name__ == '__main__':
-    # VAD 모델 사전 로딩 (첫 요청 지연 방지, 실패해도 서버 시작)
+_services_started = False
+
+
+def start_services():
+    """
+    워커 프로세스 준비: VAD 모델 사전 로딩, asyncio SSE/TTS 엔진 시작, 콜드 스타트 기록
+
+    gunicorn에서는 워커마다 post_worker_init 훅에서 한 번 호출됩니다 (gunicorn.conf.py).
+    """
+    global async_sse, async_tts, cold_start_seconds, _services_started
+    if _services_started:
+        return
+    _services_started = True
+
+    # VAD 모델 사전 로딩 (첫 요청 지연 방지, 실패해도 서버 시작). sse 역할은 VAD를 쓰지 않음
+    if TTS_PROXY_ROLE != 'sse':
+        try:
+            vad_preload()
+        except Exception as e:
+            logger.warning(f"VAD 모델 사전 로딩 실패 (서버는 정상 시작): {e}")
+        # 이전 실행에서 트리밍하지 못한 캐시 항목 재등록 (공유 디렉토리에서는 워커 하나만 순회)
+        if VAD_ENABLED:
+            threading.Thread(target=_requeue_untrimmed, name='vad-requeue', daemon=True).start()
+
+    # asyncio SSE 엔진 시작 (실패하면 요청 스레드 방식으로 계속)
+    if SSE_ASYNC_PORT and TTS_PROXY_ROLE != 'tts':
+        try:
+            async_sse = AsyncSSEServer(
+                host=SSE_ASYNC_HOST,
+                port=SSE_ASYNC_PORT,
+                keep_alive_interval=sse_manager.keep_alive_interval,
+                cors_origins=CORS_ORIGINS.split(','),
+                redirect_secret=SSE_ASYNC_REDIRECT_SECRET if SSE_ASYNC_REDIRECT else None,
+                initial_data=_initial_position_events,
+                reuse_port=SSE_ASYNC_REUSE_PORT
+            )
+            async_sse.start()
+            sse_manager.attach(async_sse)
+        except Exception as e:
+            async_sse = None
+            logger.warning(f"SSE 엔진 시작 실패 (요청 스레드 방식 사용): {e}")
+
+    # asyncio TTS 엔진 시작 (실패해도 Flask TTS 엔드포인트는 그대로 동작)
+    if TTS_ASYNC_PORT and TTS_PROXY_ROLE != 'sse':
+        try:
+            from tts_async import AsyncTTSServer, AsyncBackendClient
+            async_tts = AsyncTTSServer(
+                cache_mgr,
+                AsyncBackendClient(
+                    TTS_BACKEND_URL,
+                    max_in_flight=TTS_ASYNC_MAX_IN_FLIGHT,
+                    connect_timeout=TTS_CONNECT_TIMEOUT,
+                    read_timeout=TTS_READ_TIMEOUT,
+                    max_retries=TTS_MAX_RETRIES,
+                    retry_base_delay=TTS_RETRY_BASE_DELAY
+                ),
+                build_payload=_build_payload,
+                validate_voice=_validate_voice,
+                parse_stream_flag=_parse_stream_flag,
+                vad_header=_vad_header,
+                schedule_trim=_schedule_trim,
+                host=TTS_ASYNC_HOST,
+                port=TTS_ASYNC_PORT,
+                model_override=TTS_MODEL,
+                stream_default=TTS_STREAM_DEFAULT,
+                chunk_size=TTS_STREAM_CHUNK_SIZE,
+                cpu_workers=TTS_ASYNC_CPU_WORKERS,
+                cors_origins=CORS_ORIGINS.split(','),
+                reuse_port=TTS_ASYNC_REUSE_PORT
+            )
+            async_tts.start()
+        except Exception as e:
+            async_tts = None
+            logger.warning(f"TTS 엔진 시작 실패 (Flask 엔드포인트만 사용): {e}")
+
+    # 프로세스 시작부터 요청 수신 준비까지 걸린 시간 (/health에 보고)
+    age = process_stats.process_age()
+    cold_start_seconds = round(age, 3) if age is not None else None
+    logger.info(f"콜드 스타트: {cold_start_seconds}s, 메모리: {process_stats.memory_usage()}")
+
+
+_shutdown_lock = threading.Lock()
+_shutdown_done = False
+
+
+def shutdown_services():
+    """
+    정상 종료: SSE/TTS 엔진과 Redis 구독 중지 후 캐시 통계·사용량·인덱스와 위치 기록
+
+    gunicorn worker_exit 훅과 atexit에서 모두 호출되며 한 번만 실행됩니다.
+    """
+    global _shutdown_done
+    with _shutdown_lock:
+        if _shutdown_done:
+            return
+        _shutdown_done = True
+
+    if async_sse is not None:
+        try:
+            async_sse.stop()
+        except Exception as e:
+            logger.warning(f"SSE 엔진 종료 실패: {e}")
+    if async_tts is not None:
+        try:
+            async_tts.stop()
+        except Exception as e:
+            logger.warning(f"TTS 엔진 종료 실패: {e}")
+    if isinstance(sse_manager, RedisSSEManager):
+        sse_manager.stop()
     try:
-        vad_preload()
+        cache_mgr.flush()
     except Exception as e:
-        logger.warning(f"VAD 모델 사전 로딩 실패 (서버는 정상 시작): {e}")
+        logger.error(f"캐시 통계 기록 실패: {e}")
+    _flush_positions()
+    logger.info("종료 전 상태 기록 완료")
+
+
+atexit.register(shutdown_services)
+
+
+if __name__ == '__main__':
+    # docker stop(SIGTERM)에서도 atexit 핸들러(상태 기록)가 실행되도록 정상 종료로 변환
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    start_services()
 
     logger.info("=" * 60)
     logger.info("tts-proxy 통합 서버 시작")
@@ -758,19 +1554,25 @@ if __name__ == '__main__':
     logger.info(f"캐시 디렉토리: {cache_mgr.cache_dir.absolute()}")
     logger.info(f"TTS 백엔드: {TTS_BACKEND_URL}")
     logger.info(f"Redis 활성화: {REDIS_ENABLED}")
+    logger.info(f"역할: {TTS_PROXY_ROLE}")
     logger.info("")
     logger.info("TTS 엔드포인트:")
     logger.info(f"  - POST /api/tts")
     logger.info(f"  - POST /api/tts-stream")
     logger.info(f"  - POST /v1/audio/speech")
+    logger.info(f"  - POST /api/tts/batch")
     logger.info(f"  - GET/PUT/DELETE /api/cache/<key>")
     logger.info(f"  - DELETE /api/cache-clear")
     logger.info(f"  - GET /api/stats")
     logger.info(f"  - GET /api/usage")
+    if async_tts is not None:
+        logger.info(f"  - TTS 엔진: {TTS_ASYNC_HOST}:{TTS_ASYNC_PORT} (/api/tts, /api/tts-stream, /v1/audio/speech)")
     logger.info("")
     logger.info("SSE 엔드포인트:")
     logger.info(f"  - GET /api/events/playback")
     logger.info(f"  - GET /api/events/scroll")
+    if async_sse is not None:
+        logger.info(f"  - SSE 엔진: {SSE_ASYNC_HOST}:{SSE_ASYNC_PORT} (redirect={SSE_ASYNC_REDIRECT})")
     logger.info("")
     logger.info("위치 동기화 엔드포인트:")
     logger.info(f"  - GET/PUT /api/playback-position")
@@ -780,5 +1582,5 @@ if __name__ == '__main__':
     logger.info(f"  - GET /health")
     logger.info("=" * 60)
 
-    # 개발 서버 실행 (프로덕션에서는 gunicorn 등 사용 권장)
+    # 개발 서버 실행 (프로덕션: gunicorn -c gunicorn.conf.py server:app)
     app.run(host='0.0.0.0', port=PORT, threaded=True, debug=False)
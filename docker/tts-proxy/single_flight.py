@@ -0,0 +1,200 @@
+"""
+동시 요청 병합 (Single-flight) 모듈
+
+같은 키에 대한 동시 작업 중 하나(leader)만 실제로 수행하고,
+나머지(follower)는 leader의 결과를 기다렸다가 공유합니다.
+SingleFlight는 스레드용, AsyncSingleFlight는 이벤트 루프 하나 안에서 쓰는 asyncio용입니다.
+"""
+import asyncio
+import threading
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """진행 중인 작업 하나의 상태"""
+
+    __slots__ = ('done', 'result', 'error', 'followers')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    키 단위 in-flight 레지스트리
+
+    leader가 예외를 던지면 같은 예외가 모든 follower에게 전달됩니다.
+    작업이 끝나면 키가 레지스트리에서 제거되므로 결과를 캐싱하지 않습니다.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str) -> Tuple[_Call, bool]:
+        """
+        키의 진행 중 작업에 합류하거나 새 leader로 등록
+
+        leader는 작업이 끝나면 반드시 resolve()를 호출해야 합니다.
+        스트리밍처럼 작업 수명이 함수 호출 하나로 끝나지 않을 때 do() 대신 사용합니다.
+
+        Returns:
+            (작업 핸들, leader 여부)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                return call, False
+            call = _Call()
+            self._calls[key] = call
+            return call, True
+
+    def wait(self, call: _Call, timeout: Optional[float] = None) -> Any:
+        """
+        follower: leader의 결과를 기다려 반환 (leader 예외는 그대로 전달)
+
+        Raises:
+            TimeoutError: timeout초 안에 leader가 결과를 게시하지 않음
+        """
+        if not call.done.wait(timeout):
+            raise TimeoutError(f"single-flight leader did not finish within {timeout:g}s")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def resolve(self, key: str, call: _Call, result: Any = None,
+                error: BaseException = None) -> None:
+        """leader: 결과를 게시하고 키를 레지스트리에서 제거"""
+        call.result = result
+        call.error = error
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.done.set()
+        if call.followers:
+            logger.info(f"Single-flight: {key[:16]}... shared with {call.followers} waiting request(s)")
+
+    def run(self, key: str, call: _Call, fn: Callable[[], Any]) -> Any:
+        """leader: fn을 실행하고 결과(또는 예외)를 게시"""
+        try:
+            result = fn()
+        except BaseException as e:
+            self.resolve(key, call, error=e)
+            raise
+        self.resolve(key, call, result=result)
+        return result
+
+    def do(self, key: str, fn: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        키에 대해 fn을 한 번만 실행
+
+        Args:
+            key: 병합 기준 키 (예: 캐시 키)
+            fn: leader가 실행할 함수
+            timeout: follower 대기 한도 (초). 넘으면 leader를 기다리지 않고 fn을 직접 실행
+
+        Returns:
+            (결과, 공유 여부) — follower이면 공유 여부가 True
+        """
+        call, leader = self.acquire(key)
+        if not leader:
+            try:
+                return self.wait(call, timeout), True
+            except TimeoutError:
+                logger.warning(f"Single-flight: {key[:16]}... leader timed out, running independently")
+                return fn(), False
+        return self.run(key, call, fn), False
+
+    def in_flight(self) -> int:
+        """현재 진행 중인 키 수"""
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    이벤트 루프용 키 단위 in-flight 레지스트리
+
+    SingleFlight와 같은 규칙이지만 follower는 스레드를 막지 않고 asyncio.Future를 기다립니다.
+    한 이벤트 루프 스레드 안에서만 호출하므로 락이 없습니다.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+        self._followers: Dict[str, int] = {}
+        self._tasks = set()  # 실행 중인 leader 작업 (태스크가 GC되지 않도록 참조 유지)
+
+    def acquire(self, key: str) -> Tuple[asyncio.Future, bool]:
+        """
+        키의 진행 중 작업에 합류하거나 새 leader로 등록
+
+        Returns:
+            (작업 Future, leader 여부)
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            self._followers[key] += 1
+            return future, False
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self._followers[key] = 0
+        return future, True
+
+    async def wait(self, future: asyncio.Future) -> Any:
+        """follower: leader의 결과를 기다려 반환 (follower가 취소되어도 작업은 계속됨)"""
+        return await asyncio.shield(future)
+
+    def resolve(self, key: str, future: asyncio.Future, result: Any = None,
+                error: BaseException = None) -> None:
+        """leader: 결과를 게시하고 키를 레지스트리에서 제거"""
+        followers = 0
+        if self._calls.get(key) is future:
+            del self._calls[key]
+            followers = self._followers.pop(key, 0)
+        if future.done():
+            return
+        if isinstance(error, asyncio.CancelledError):
+            future.cancel()
+        elif error is not None:
+            future.set_exception(error)
+            future.exception()  # follower가 없을 때 'exception was never retrieved' 경고 방지
+        else:
+            future.set_result(result)
+        if followers:
+            logger.info(f"Single-flight: {key[:16]}... shared with {followers} waiting request(s)")
+
+    async def run(self, key: str, future: asyncio.Future, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        leader: fn()을 별도 태스크로 실행하고 결과(또는 예외)를 게시
+
+        leader 요청이 취소되어도(클라이언트 연결 끊김) 작업은 계속되어 follower가 결과를 받습니다.
+        """
+        task = asyncio.ensure_future(self._execute(key, future, fn))
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return await asyncio.shield(task)
+
+    async def _execute(self, key: str, future: asyncio.Future, fn: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await fn()
+        except BaseException as e:
+            self.resolve(key, future, error=e)
+            raise
+        self.resolve(key, future, result=result)
+        return result
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled():
+            task.exception()  # leader가 먼저 취소된 경우 'exception was never retrieved' 경고 방지
+
+    def in_flight(self) -> int:
+        """현재 진행 중인 키 수"""
+        return len(self._calls)
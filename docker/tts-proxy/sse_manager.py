@@ -2,12 +2,19 @@
 SSE 클라이언트 연결 관리자
 
 Server-Sent Events (SSE) 연결을 관리하고 메시지를 브로드캐스트합니다.
-단일 프로세스 환경에서 인메모리 큐를 사용하며, Redis Pub/Sub 확장이 가능합니다.
+단일 프로세스 환경에서 인메모리 큐를 사용하며, 다중 워커 환경에서는 Redis Pub/Sub으로
+워커 간 위치 변경을 중계합니다.
 """
+import os
+import time
+import uuid
 import queue
+import socket
+import itertools
 import threading
 import logging
-from typing import Set, Optional
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Optional, Tuple
 import json
 
 # 로깅 설정
@@ -15,78 +22,283 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(level
 logger = logging.getLogger(__name__)
 
 
+# 구독 키: (이벤트 타입, notePath, user). None은 해당 조건으로 거르지 않음을 뜻함
+TopicKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+# 모든 이벤트를 받는 구독 (이벤트 타입 없이 add_client한 경우)
+ALL_TOPICS: TopicKey = (None, None, None)
+
+
+def topic_key(event: Optional[str] = None, note_path: Optional[str] = None,
+              user: Optional[str] = None) -> TopicKey:
+    """구독 키 생성 (빈 문자열은 필터 없음으로 취급)"""
+    return (event or None, note_path or None, user or None)
+
+
+def matching_topics(event: str, note_path: Optional[str] = None, user: Optional[str] = None) -> List[TopicKey]:
+    """
+    메시지를 받아야 하는 구독 키 목록
+
+    이벤트 타입이 같고, notePath/user 필터가 없거나 메시지 값과 일치하는 구독만 해당합니다.
+    """
+    keys = [ALL_TOPICS, (event, None, None)]
+    if note_path:
+        keys.append((event, note_path, None))
+    if user:
+        keys.append((event, None, user))
+        if note_path:
+            keys.append((event, note_path, user))
+    return keys
+
+
+def format_event(event: str, data: str, event_id: Optional[int] = None) -> str:
+    """SSE 이벤트 프레임 (event_id가 있으면 id 줄 포함 → 재연결 시 Last-Event-ID로 돌아옴)"""
+    if event_id is None:
+        return f"event: {event}\ndata: {data}\n\n"
+    return f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+
+
+class Mailbox:
+    """
+    latest-value-wins 클라이언트 우편함
+
+    슬롯(이벤트 타입, notePath)마다 아직 전송하지 않은 최신 메시지 하나만 보관합니다.
+    느린 클라이언트는 밀린 메시지 대신 가장 최근 위치를 받으며, 우편함이 가득 차서
+    연결이 끊기는 일이 없습니다. get()은 queue.Queue와 같이 시간 초과 시 queue.Empty를 발생시킵니다.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._pending: Dict[Hashable, Any] = {}
+
+    def put(self, data: Any, slot: Hashable = None) -> bool:
+        """
+        메시지 보관 (같은 슬롯의 미전송 메시지는 교체)
+
+        Returns:
+            기존 미전송 메시지를 교체했으면 True
+        """
+        with self._cond:
+            replaced = self._pending.pop(slot, None) is not None
+            self._pending[slot] = data
+            self._cond.notify()
+        return replaced
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """가장 오래 기다린 슬롯의 메시지 반환 (timeout 안에 없으면 queue.Empty)"""
+        with self._cond:
+            if not self._pending and not self._cond.wait_for(lambda: self._pending, timeout):
+                raise queue.Empty
+            slot = next(iter(self._pending))
+            return self._pending.pop(slot)
+
+
+class _Throttle:
+    """
+    키별 throttle (leading + trailing)
+
+    간격 안에 처음 들어온 값은 즉시 내보내고, 이후 값은 최신 값 하나만 남겨 간격이
+    끝날 때 내보냅니다. 호출 빈도와 무관하게 키당 전송 횟수가 간격당 최대 1회로 제한됩니다.
+    """
+
+    def __init__(self, interval_ms: float, emit: Callable[[Any], int]):
+        self.interval = interval_ms / 1000
+        self._emit = emit
+        self._lock = threading.Lock()
+        self._last_sent: Dict[Hashable, float] = {}
+        self._pending: Dict[Hashable, Any] = {}
+        self.coalesced = 0
+
+    def submit(self, key: Hashable, value: Any) -> int:
+        """
+        값 제출
+
+        Returns:
+            즉시 전송했으면 emit 결과, 다음 간격으로 미뤘으면 0
+        """
+        now = time.monotonic()
+        with self._lock:
+            if key in self._pending:
+                self._pending[key] = value
+                self.coalesced += 1
+                return 0
+            wait = self._last_sent.get(key, now - self.interval) + self.interval - now
+            if wait > 0:
+                self._pending[key] = value
+                timer = threading.Timer(wait, self._flush, (key,))
+                timer.daemon = True
+                timer.start()
+                return 0
+            self._last_sent[key] = now
+            if len(self._last_sent) > 1024:
+                self._prune(now)
+        return self._emit(value)
+
+    def _flush(self, key: Hashable) -> None:
+        with self._lock:
+            value = self._pending.pop(key, None)
+            self._last_sent[key] = time.monotonic()
+        if value is not None:
+            try:
+                self._emit(value)
+            except Exception as e:
+                logger.error(f"Throttled broadcast error: {e}")
+
+    def _prune(self, now: float) -> None:
+        """간격이 지난 키의 전송 시각 제거 (노트 수만큼 늘어나지 않도록)"""
+        expired = [key for key, sent in self._last_sent.items()
+                   if now - sent >= self.interval and key not in self._pending]
+        for key in expired:
+            del self._last_sent[key]
+
+
 class SSEManager:
     """
     SSE 클라이언트 연결과 메시지 브로드캐스트를 관리하는 클래스
 
     단일 프로세스 환경에서는 인메모리 큐를 사용합니다.
     다중 프로세스 환경에서는 RedisSSEManager를 사용하세요.
+
+    클라이언트는 구독 키(이벤트 타입, notePath, user)별로 나뉘어 있어 메시지는 일치하는
+    구독에만 전달됩니다. 구독 테이블은 copy-on-write로 관리되어 브로드캐스트가 락을
+    잡지 않으며, attach()로 등록한 AsyncSSEServer에도 같은 메시지가 전달됩니다.
+
+    위치 브로드캐스트는 이벤트 타입별 throttle을 거치며, 클라이언트 우편함(Mailbox)은
+    최신 값만 보관하므로 쓰기 빈도와 무관하게 전송 비용이 일정합니다.
     """
 
-    def __init__(self, keep_alive_interval: int = 30):
+    def __init__(self, keep_alive_interval: int = 30, throttle_ms: Optional[Dict[str, float]] = None):
         """
         SSE 매니저 초기화
 
         Args:
             keep_alive_interval: keep-alive 메시지 전송 간격 (초)
+            throttle_ms: 이벤트 타입별 최소 전송 간격 (ms, 예: {'scroll': 100}). 0이면 즉시 전송
         """
-        self.clients: Set[queue.Queue] = set()
+        self.topics: Dict[TopicKey, FrozenSet[Mailbox]] = {}
+        self.client_topics: Dict[Mailbox, TopicKey] = {}
         self.lock = threading.Lock()
+        self.engines: List = []
         self.keep_alive_interval = keep_alive_interval
+        self.throttles: Dict[str, _Throttle] = {
+            event: _Throttle(interval, lambda data, event=event: self._send_position(event, data))
+            for event, interval in (throttle_ms or {}).items() if interval > 0
+        }
+
+        self._stats_lock = threading.Lock()
+        self._delivered = 0
+        self._coalesced = 0
+        self._dropped = 0
         logger.info("SSE Manager initialized (in-memory mode)")
 
-    def add_client(self, client_queue: queue.Queue) -> None:
+    def add_client(self, client_queue: Mailbox, event: Optional[str] = None,
+                   note_path: Optional[str] = None, user: Optional[str] = None) -> None:
         """
         새로운 SSE 클라이언트 연결 추가
 
         Args:
-            client_queue: 클라이언트별 큐
+            client_queue: 클라이언트별 우편함
+            event: 구독할 이벤트 타입 ('playback'/'scroll', 없으면 모든 이벤트)
+            note_path: 이 노트의 이벤트만 구독 (선택)
+            user: 이 사용자의 이벤트만 구독 (선택)
         """
+        key = topic_key(event, note_path, user)
         with self.lock:
-            self.clients.add(client_queue)
-            logger.info(f"Client added. Total clients: {len(self.clients)}")
+            topics = dict(self.topics)
+            topics[key] = topics.get(key, frozenset()) | {client_queue}
+            self.topics = topics
+            self.client_topics[client_queue] = key
+            logger.info(f"Client added to {key}. Total clients: {len(self.client_topics)}")
 
-    def remove_client(self, client_queue: queue.Queue) -> None:
+    def remove_client(self, client_queue: Mailbox) -> None:
         """
         SSE 클라이언트 연결 제거
 
         Args:
-            client_queue: 제거할 클라이언트 큐
+            client_queue: 제거할 클라이언트 우편함
         """
         with self.lock:
-            if client_queue in self.clients:
-                self.clients.remove(client_queue)
-                logger.info(f"Client removed. Total clients: {len(self.clients)}")
+            if self._remove_locked(client_queue):
+                logger.info(f"Client removed. Total clients: {len(self.client_topics)}")
+
+    def _remove_locked(self, client_queue: Mailbox) -> bool:
+        key = self.client_topics.pop(client_queue, None)
+        if key is None:
+            return False
+        topics = dict(self.topics)
+        remaining = topics.get(key, frozenset()) - {client_queue}
+        if remaining:
+            topics[key] = remaining
+        else:
+            topics.pop(key, None)
+        self.topics = topics
+        return True
+
+    def attach(self, engine) -> None:
+        """
+        브로드캐스트를 함께 받을 SSE 엔진 등록 (예: AsyncSSEServer)
+
+        Args:
+            engine: publish(data, event, note_path, user, event_id) -> int 와
+                get_client_count() -> int 를 제공하는 객체
+        """
+        self.engines.append(engine)
 
-    def broadcast(self, data: str) -> int:
+    def broadcast(self, data: str, event: Optional[str] = None,
+                  note_path: Optional[str] = None, user: Optional[str] = None,
+                  event_id: Optional[int] = None) -> int:
         """
-        모든 연결된 SSE 클라이언트에게 메시지 브로드캐스트
+        구독 키가 일치하는 SSE 클라이언트에게 메시지 브로드캐스트
+
+        우편함에는 (data, event_id) 튜플이 들어갑니다.
 
         Args:
             data: 브로드캐스트할 JSON 문자열
+            event: 이벤트 타입 (없으면 모든 클라이언트에게 전송)
+            note_path: 메시지의 노트 경로
+            user: 메시지의 사용자
+            event_id: SSE 이벤트 id (위치 레코드 버전)
 
         Returns:
             성공적으로 전송된 클라이언트 수
         """
         success_count = 0
+        coalesced = 0
         dead_clients = set()
-
-        with self.lock:
-            for client_queue in self.clients:
+        slot = (event, note_path)
+        message = (data, event_id)
+
+        # 스냅샷 순회: 연결 추가/제거와 경합하지 않음
+        topics = self.topics
+        if event is None:
+            targets = list(topics.values())
+        else:
+            targets = [topics[key] for key in matching_topics(event, note_path, user) if key in topics]
+
+        for clients in targets:
+            for client_queue in clients:
                 try:
-                    client_queue.put_nowait(data)
+                    # 밀린 메시지는 최신 값으로 교체 (느린 클라이언트도 끊지 않음)
+                    coalesced += client_queue.put(message, slot)
                     success_count += 1
-                except queue.Full:
-                    logger.warning("Client queue full, marking as dead")
-                    dead_clients.add(client_queue)
                 except Exception as e:
                     logger.error(f"Error broadcasting to client: {e}")
                     dead_clients.add(client_queue)
 
-            # 죽은 클라이언트 제거
-            for client_queue in dead_clients:
-                self.clients.remove(client_queue)
-                logger.info(f"Removed dead client. Total clients: {len(self.clients)}")
+        # 죽은 클라이언트 제거
+        if dead_clients:
+            with self.lock:
+                for client_queue in dead_clients:
+                    self._remove_locked(client_queue)
+                logger.info(f"Removed {len(dead_clients)} dead client(s). Total clients: {len(self.client_topics)}")
+
+        with self._stats_lock:
+            self._delivered += success_count
+            self._coalesced += coalesced
+            self._dropped += len(dead_clients)
+
+        for engine in self.engines:
+            success_count += engine.publish(data, event, note_path, user, event_id)
 
         if success_count > 0:
             logger.debug(f"Broadcast to {success_count} clients")
@@ -98,26 +310,40 @@ class SSEManager:
         재생 위치 데이터 브로드캐스트
 
         Args:
-            position_data: 재생 위치 데이터 (lastPlayedIndex, notePath, noteTitle, timestamp, deviceId)
+            position_data: 재생 위치 데이터 (lastPlayedIndex, notePath, noteTitle, timestamp, deviceId, user)
 
         Returns:
             성공적으로 전송된 클라이언트 수
         """
-        json_data = json.dumps(position_data, ensure_ascii=False)
-        return self.broadcast(json_data)
+        return self._submit_position('playback', position_data)
 
     def broadcast_scroll_position(self, scroll_data: dict) -> int:
         """
         스크롤 위치 데이터 브로드캐스트
 
         Args:
-            scroll_data: 스크롤 위치 데이터 (scrollTop, notePath, timestamp, deviceId)
+            scroll_data: 스크롤 위치 데이터 (scrollTop, notePath, timestamp, deviceId, user)
 
         Returns:
             성공적으로 전송된 클라이언트 수
         """
-        json_data = json.dumps(scroll_data, ensure_ascii=False)
-        return self.broadcast(json_data)
+        return self._submit_position('scroll', scroll_data)
+
+    def _submit_position(self, event: str, data: dict) -> int:
+        """throttle을 거쳐 위치 전송 (간격 안의 중간 값은 최신 값으로 합쳐짐, 미뤄지면 0 반환)"""
+        throttle = self.throttles.get(event)
+        if throttle is None:
+            return self._send_position(event, data)
+        return throttle.submit((data.get('notePath'), data.get('user')), data)
+
+    def _send_position(self, event: str, data: dict) -> int:
+        """throttle을 통과한 위치 전송 (RedisSSEManager는 다른 워커로 발행도 함)"""
+        return self.deliver_position(event, data)
+
+    def deliver_position(self, event: str, data: dict) -> int:
+        """위치 데이터를 이 프로세스의 구독자에게 전송 (다른 워커에서 중계된 위치 포함)"""
+        json_data = json.dumps(data, ensure_ascii=False)
+        return self.broadcast(json_data, event, data.get('notePath'), data.get('user'), data.get('version'))
 
     def get_client_count(self) -> int:
         """
@@ -126,20 +352,62 @@ class SSEManager:
         Returns:
             연결된 클라이언트 수
         """
-        with self.lock:
-            return len(self.clients)
+        return len(self.client_topics) + sum(engine.get_client_count() for engine in self.engines)
+
+    def get_topic_count(self) -> int:
+        """구독자가 있는 구독 키 수 (엔진 포함)"""
+        return len(self.topics) + sum(engine.get_topic_count() for engine in self.engines)
+
+    def get_delivery_stats(self) -> dict:
+        """
+        전송 통계 (엔진 포함)
+
+        - delivered: 우편함/연결에 넣은 메시지 수
+        - coalesced: 전송 전 더 최신 값으로 교체된 메시지 수 (우편함 + 느린 연결)
+        - throttled: throttle 간격 안에서 합쳐져 전송되지 않은 위치 수
+        - droppedClients: 오류/정체로 연결을 끊은 클라이언트 수
+        """
+        with self._stats_lock:
+            stats = {
+                'delivered': self._delivered,
+                'coalesced': self._coalesced,
+                'throttled': sum(throttle.coalesced for throttle in self.throttles.values()),
+                'droppedClients': self._dropped,
+            }
+        for engine in self.engines:
+            engine_stats = engine.get_stats()
+            stats['delivered'] += engine_stats.get('delivered', 0)
+            stats['coalesced'] += engine_stats.get('coalesced', 0)
+            stats['droppedClients'] += engine_stats.get('droppedClients', 0)
+        stats['throttleMs'] = {event: int(throttle.interval * 1000) for event, throttle in self.throttles.items()}
+        return stats
 
 
 class RedisSSEManager(SSEManager):
     """
     Redis Pub/Sub을 사용하는 SSE 매니저
 
-    다중 프로세스/다중 서버 환경에서 사용합니다.
-    Redis가 다운되면 인메모리 모드로 자동 폴백합니다.
+    다중 프로세스/다중 서버 환경에서 사용합니다. 위치 변경은 이 워커의 클라이언트에게 바로
+    전송하고, 출처(origin) id를 붙여 Redis에 발행합니다. 워커마다 구독 스레드 하나가
+    다른 워커의 발행을 받아 로컬 클라이언트에게 전달하며, 자기가 발행한 메시지는 버립니다.
+    Redis가 다운되면 로컬 전송만 하고, 구독 스레드가 백오프로 재연결합니다. 발행이 실패하면
+    백오프 간격이 지난 뒤의 다음 발행에서 다시 시도합니다.
+
+    발행은 요청 스레드가 아닌 발행 스레드 하나가 크기 제한 대기열에서 꺼내 순서대로 수행하므로,
+    Redis가 응답하지 않아도(socket_timeout까지) 위치 PUT은 막히지 않습니다. 대기열이 가득 차면
+    가장 오래된 메시지를 버립니다.
     """
 
+    CHANNEL_PREFIX = 'tts:'
+    # 출처별 마지막 순번 보관 한도 (워커 재시작으로 출처 id가 바뀌므로 오래된 출처는 제거)
+    ORIGIN_TTL = 3600.0
+    MAX_ORIGINS = 256
+    # 발행 대기열 한도와 Redis 명령 응답 대기 한도 (초)
+    PUBLISH_QUEUE_MAX = 1000
+    SOCKET_TIMEOUT = 2.0
+
     def __init__(self, redis_host: str = 'localhost', redis_port: int = 6379,
-                 keep_alive_interval: int = 30):
+                 keep_alive_interval: int = 30, throttle_ms: Optional[Dict[str, float]] = None):
         """
         Redis SSE 매니저 초기화
 
@@ -147,32 +415,83 @@ class RedisSSEManager(SSEManager):
             redis_host: Redis 호스트
             redis_port: Redis 포트
             keep_alive_interval: keep-alive 메시지 전송 간격 (초)
+            throttle_ms: 이벤트 타입별 최소 전송 간격 (ms)
         """
-        super().__init__(keep_alive_interval)
+        super().__init__(keep_alive_interval, throttle_ms)
         self.redis_host = redis_host
         self.redis_port = redis_port
         self.redis_client = None
         self.redis_available = False
 
+        # 워커 식별자: 자기 메시지 제거 + 출처별 순번으로 중복/역순 메시지 제거.
+        # 순번 부여와 발행을 한 락 안에서 수행해 발행 순서와 순번 순서를 일치시킴
+        self.origin_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._seq = itertools.count(1)
+        self._publish_lock = threading.Lock()
+        # 출처 → (마지막 순번, 마지막 수신 시각), 수신 순서 유지 (구독 스레드에서만 수정)
+        self._last_seq: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+
+        # 발행 실패 후 재시도 시각 (그 전까지는 로컬 전송만)
+        self._publish_retry_at = 0.0
+        self._publish_backoff = 0.5
+
+        self._subscriber = None
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._redis_stats = {
+            'published': 0,
+            'received': 0,
+            'duplicates': 0,
+            'reconnects': 0,
+            'publishErrors': 0,
+            'publishDropped': 0,
+        }
+        # (채널, 메시지) 발행 대기열 (None은 발행 스레드 종료 신호)
+        self._outbox: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue(self.PUBLISH_QUEUE_MAX)
+        self._publisher = None
+
         try:
             import redis
+            from redis.retry import Retry
+            from redis.backoff import NoBackoff
+            # 재시도는 발행 백오프/구독 재연결이 담당 (라이브러리 재시도가 겹치면 한 명령이 timeout의 수십 배 동안 멈춤)
             self.redis_client = redis.Redis(
                 host=redis_host,
                 port=redis_port,
-                decode_responses=True
+                decode_responses=True,
+                socket_connect_timeout=2,
+                socket_timeout=self.SOCKET_TIMEOUT,
+                retry=Retry(NoBackoff(), 0),
+                health_check_interval=30
             )
+            # 시작 시 Redis가 없어도 복구 후 발행할 수 있도록 발행 스레드는 먼저 시작
+            self._publisher = threading.Thread(target=self._publish_loop, name='redis-publisher', daemon=True)
+            self._publisher.start()
             # Redis 연결 테스트
             self.redis_client.ping()
             self.redis_available = True
-            logger.info(f"Redis SSE Manager initialized (redis://{redis_host}:{redis_port})")
+            logger.info(f"Redis SSE Manager initialized (redis://{redis_host}:{redis_port}, origin={self.origin_id})")
         except Exception as e:
             logger.warning(f"Redis unavailable, falling back to in-memory mode: {e}")
             self.redis_available = False
 
+    def _count(self, field: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._redis_stats[field] += amount
+
+    def _can_publish(self) -> bool:
+        """사용 가능하거나 발행 실패 후 백오프 간격이 지났으면 True"""
+        if self.redis_client is None:
+            return False
+        return self.redis_available or time.monotonic() >= self._publish_retry_at
+
     def publish(self, channel: str, data: str) -> int:
         """
         Redis 채널에 메시지 발행
 
+        실패하면 백오프 간격(0.5초부터 최대 30초) 동안 발행을 건너뛰고, 그 뒤의 발행에서
+        다시 시도합니다. 성공하면 사용 가능 상태로 돌아갑니다.
+
         Args:
             channel: Redis 채널명
             data: 발행할 데이터
@@ -180,86 +499,176 @@ class RedisSSEManager(SSEManager):
         Returns:
             구독자 수 (Redis 사용 불가 시 0)
         """
-        if not self.redis_available:
+        if not self._can_publish():
             return 0
 
         try:
             result = self.redis_client.publish(channel, data)
-            logger.debug(f"Published to {channel}: {result} subscribers")
-            return result
         except Exception as e:
-            logger.error(f"Redis publish error: {e}")
+            logger.error(f"Redis publish error, retrying after {self._publish_backoff:.1f}s: {e}")
             self.redis_available = False
+            self._publish_retry_at = time.monotonic() + self._publish_backoff
+            self._publish_backoff = min(self._publish_backoff * 2, 30.0)
+            self._count('publishErrors')
             return 0
+        self.redis_available = True
+        self._publish_backoff = 0.5
+        self._count('published')
+        logger.debug(f"Published to {channel}: {result} subscribers")
+        return result
 
-    def broadcast_playback_position(self, position_data: dict) -> int:
+    def _send_position(self, event: str, data: dict) -> int:
         """
-        재생 위치 데이터 Redis Pub/Sub 브로드캐스트
-
-        Args:
-            position_data: 재생 위치 데이터
+        위치 데이터를 로컬 구독자에게 전송하고 Redis에 발행 (채널: tts:<event>)
 
         Returns:
-            구독자 수
+            이 워커에서 전송된 클라이언트 수
         """
-        json_data = json.dumps(position_data, ensure_ascii=False)
-
-        # Redis 사용 가능하면 발행
-        if self.redis_available:
-            subscribers = self.publish('tts:playback', json_data)
-            if subscribers > 0:
-                return subscribers
-
-        # Redis 불가능하거나 구독자 없으면 인메모리 브로드캐스트
-        return super().broadcast(json_data)
-
-    def broadcast_scroll_position(self, scroll_data: dict) -> int:
-        """
-        스크롤 위치 데이터 Redis Pub/Sub 브로드캐스트
-
-        Args:
-            scroll_data: 스크롤 위치 데이터
-
-        Returns:
-            구독자 수
-        """
-        json_data = json.dumps(scroll_data, ensure_ascii=False)
-
-        # Redis 사용 가능하면 발행
-        if self.redis_available:
-            subscribers = self.publish('tts:scroll', json_data)
-            if subscribers > 0:
-                return subscribers
-
-        # Redis 불가능하거나 구독자 없으면 인메모리 브로드캐스트
-        return super().broadcast(json_data)
-
-    def subscribe_to_redis(self, channels: list, callback) -> None:
+        sent = self.deliver_position(event, data)
+        if self._publisher is not None and self._can_publish():
+            with self._publish_lock:
+                envelope = {
+                    'origin': self.origin_id,
+                    'seq': next(self._seq),
+                    'event': event,
+                    'data': data,
+                }
+                self._enqueue((self.CHANNEL_PREFIX + event, json.dumps(envelope, ensure_ascii=False)))
+        return sent
+
+    def _enqueue(self, item: Optional[Tuple[str, str]]) -> None:
+        """발행 대기열에 추가 (가득 차면 가장 오래된 메시지를 버림). _publish_lock 안에서 호출."""
+        while True:
+            try:
+                self._outbox.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._outbox.get_nowait()
+                    self._count('publishDropped')
+                except queue.Empty:
+                    pass
+
+    def _publish_loop(self) -> None:
+        """발행 스레드: 대기열 순서(= 순번 순서)대로 발행"""
+        while True:
+            item = self._outbox.get()
+            if item is None:
+                return
+            self.publish(*item)
+
+    def _accept(self, envelope: dict) -> bool:
+        """다른 워커의 새 메시지인지 판단 (자기 메시지, 중복/역순 메시지는 False)"""
+        origin = envelope.get('origin')
+        if origin == self.origin_id:
+            return False
+        seq = envelope.get('seq')
+        if not isinstance(origin, str) or not isinstance(seq, int):
+            return True  # 출처 정보 없는 발행자 (이전 버전)
+        now = time.monotonic()
+        last = self._last_seq.get(origin)
+        if last is not None and seq <= last[0]:
+            self._count('duplicates')
+            return False
+        self._last_seq[origin] = (seq, now)
+        self._last_seq.move_to_end(origin)
+        # 오래 조용한 출처(재시작된 워커) 제거
+        while self._last_seq:
+            oldest, (_, seen) = next(iter(self._last_seq.items()))
+            if len(self._last_seq) <= self.MAX_ORIGINS and now - seen <= self.ORIGIN_TTL:
+                break
+            del self._last_seq[oldest]
+        return True
+
+    def subscribe_to_redis(self, channels: list, callback: Callable[[str, dict], None]) -> None:
         """
-        Redis 채널 구독 (별도 스레드에서 실행)
+        Redis 채널 구독 (워커당 스레드 하나, 연결이 끊기면 백오프로 재연결)
 
         Args:
-            channels: 구독할 채널 목록
-            callback: 메시지 수신 시 호출할 콜백 함수
+            channels: 구독할 채널 목록 (예: ['tts:playback', 'tts:scroll'])
+            callback: 다른 워커의 위치 수신 시 호출 (이벤트 타입, 위치 데이터).
+                구독 스레드에서 호출되므로 오래 막히면 안 됨
         """
-        if not self.redis_available:
-            logger.warning("Redis unavailable, cannot subscribe")
+        if self.redis_client is None:
+            logger.warning("Redis client unavailable, cannot subscribe")
+            return
+        if self._subscriber is not None:
             return
 
-        import redis
-
-        pubsub = self.redis_client.pubsub()
-        pubsub.subscribe(*channels)
-
-        def redis_listener():
-            logger.info(f"Redis listener started for channels: {channels}")
-            for message in pubsub.listen():
-                if message['type'] == 'message':
-                    channel = message['channel']
-                    data = message['data']
-                    logger.debug(f"Received from {channel}: {data}")
-                    # 인메모리 클라이언트에게 전달
-                    callback(data)
-
-        thread = threading.Thread(target=redis_listener, daemon=True)
-        thread.start()
+        self._subscriber = threading.Thread(
+            target=self._listen, args=(list(channels), callback),
+            name='redis-subscriber', daemon=True
+        )
+        self._subscriber.start()
+
+    def _listen(self, channels: list, callback: Callable[[str, dict], None]) -> None:
+        backoff = 0.5
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(*channels)
+                self.redis_available = True
+                backoff = 0.5
+                logger.info(f"Redis listener subscribed to {channels}")
+
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is None or message['type'] != 'message':
+                        continue
+                    self._dispatch(message['channel'], message['data'], callback)
+            except Exception as e:
+                self.redis_available = False
+                self._count('reconnects')
+                logger.warning(f"Redis listener error, reconnecting in {backoff:.1f}s: {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def _dispatch(self, channel: str, raw: str, callback: Callable[[str, dict], None]) -> None:
+        try:
+            envelope = json.loads(raw)
+        except ValueError:
+            logger.warning(f"Ignoring malformed message on {channel}")
+            return
+        if not isinstance(envelope, dict):
+            logger.warning(f"Ignoring non-object message on {channel}")
+            return
+        if 'data' not in envelope:
+            envelope = {'data': envelope}
+        if not self._accept(envelope):
+            return
+        self._count('received')
+        event = envelope.get('event') or channel[len(self.CHANNEL_PREFIX):]
+        try:
+            callback(event, envelope['data'])
+        except Exception as e:
+            logger.error(f"Redis message handler error: {e}")
+
+    def stop(self) -> None:
+        """구독 스레드 종료, 발행 스레드는 대기열에 남은 메시지를 발행한 뒤 종료"""
+        self._stop.set()
+        if self._publisher is not None:
+            with self._publish_lock:
+                self._enqueue(None)
+            self._publisher.join(timeout=2)
+        if self._subscriber is not None:
+            self._subscriber.join(timeout=2)
+
+    def get_redis_stats(self) -> dict:
+        """Redis 연결/중계 상태"""
+        with self._stats_lock:
+            stats = dict(self._redis_stats)
+        return dict(
+            stats,
+            origin=self.origin_id,
+            available=self.redis_available,
+            subscribed=self._subscriber is not None and self._subscriber.is_alive(),
+            publishQueueDepth=self._outbox.qsize(),
+            peers=len(self._last_seq),
+        )
@@ -0,0 +1,393 @@
+"""
+asyncio 기반 SSE 서버
+
+모든 SSE 연결을 하나의 이벤트 루프 스레드에서 처리합니다. 연결마다 스레드나 큐를
+두지 않으므로 유휴 연결이 많아도 메모리는 연결당 프로토콜 객체 하나로 일정하고,
+브로드캐스트는 루프에 한 번 전달된 뒤 루프 스레드 안에서 락 없이 전송됩니다.
+
+SSEManager.attach()로 등록하면 기존 broadcast 경로가 그대로 이 서버에도 전달됩니다.
+"""
+import hmac
+import time
+import asyncio
+import fnmatch
+import hashlib
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Set
+from urllib.parse import parse_qs, urlsplit
+
+from sse_manager import TopicKey, topic_key, matching_topics, format_event
+
+logger = logging.getLogger(__name__)
+
+# 경로 → SSE 이벤트 이름
+SSE_ROUTES = {
+    '/api/events/playback': 'playback',
+    '/api/events/scroll': 'scroll',
+}
+
+_MAX_REQUEST_BYTES = 8192
+# 리다이렉트 토큰: 프록시가 출처를 확인한 뒤 엔진 URL에 붙이는 서명 (Origin: null 요청 허용 근거)
+REDIRECT_TOKEN_PARAM = 'sseToken'
+_REDIRECT_TOKEN_TTL = 30
+_KEEP_ALIVE = b': keep-alive\n\n'
+
+
+def _encode_event(event: str, data: str, event_id: Optional[int] = None) -> bytes:
+    return format_event(event, data, event_id).encode('utf-8')
+
+
+class _SSEConnection(asyncio.Protocol):
+    """
+    SSE 연결 하나 (요청 파싱 → 응답 헤더 → 이벤트 전송)
+
+    초기 상태 전송 전이거나 송신 버퍼가 high-water mark를 넘어 쓰기가 멈춘 동안에는
+    슬롯(이벤트, notePath)별 최신 이벤트 하나만 보관했다가 재개 시 전송합니다 (latest-value-wins).
+    """
+
+    __slots__ = ('server', 'transport', 'request', 'event', 'key', 'ready', 'paused', 'paused_at', 'pending')
+
+    def __init__(self, server: 'AsyncSSEServer'):
+        self.server = server
+        self.transport = None
+        self.request = b''
+        self.event = None
+        self.key = None
+        self.ready = False
+        self.paused = False
+        self.paused_at = 0.0
+        self.pending: Dict[tuple, bytes] = {}
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.set_write_buffer_limits(high=self.server.max_buffer_bytes)
+
+    def pause_writing(self):
+        self.paused = True
+        self.paused_at = time.monotonic()
+
+    def resume_writing(self):
+        self.paused = False
+        self.flush()
+
+    def data_received(self, data: bytes):
+        if self.event is not None:
+            return  # SSE 스트림 시작 후 클라이언트 입력은 무시
+        self.request += data
+        if b'\r\n\r\n' not in self.request:
+            if len(self.request) > _MAX_REQUEST_BYTES:
+                self._reject(431, 'Request Header Fields Too Large')
+            return
+        self.server._handle_request(self)
+
+    def connection_lost(self, exc):
+        self.server._discard(self)
+
+    def _reject(self, status: int, reason: str, headers: str = ''):
+        self.transport.write(
+            f"HTTP/1.1 {status} {reason}\r\n{headers}Content-Length: 0\r\nConnection: close\r\n\r\n".encode()
+        )
+        self.transport.close()
+
+    def send(self, payload: bytes, slot: tuple = None) -> bool:
+        """
+        이벤트 전송 (쓰기가 멈춘 동안은 슬롯별 최신 값만 보관)
+
+        Returns:
+            보관 중이던 이전 이벤트를 교체했으면 True
+        """
+        if self.ready and not self.paused:
+            self.transport.write(payload)
+            return False
+        replaced = self.pending.pop(slot, None) is not None
+        self.pending[slot] = payload
+        return replaced
+
+    def flush(self) -> None:
+        """보관 중인 이벤트를 도착 순서대로 전송 (다시 멈추면 중단)"""
+        while self.pending and self.ready and not self.paused:
+            slot = next(iter(self.pending))
+            self.transport.write(self.pending.pop(slot))
+
+
+class AsyncSSEServer:
+    """
+    단일 이벤트 루프 SSE 서버 (별도 스레드에서 실행)
+
+    publish()는 어느 스레드에서든 호출할 수 있으며, 루프에 call_soon_threadsafe로 한 번
+    전달된 뒤 구독 키가 일치하는 클라이언트에만 전송됩니다. 클라이언트는 쿼리 파라미터
+    notePath/user로 구독 범위를 좁힐 수 있습니다. 송신 버퍼가 max_buffer_bytes를
+    넘은 느린 클라이언트는 최신 이벤트만 받고, keep-alive 두 주기 이상 버퍼가 비워지지
+    않으면 연결을 끊습니다.
+    """
+
+    def __init__(self, host: str = '0.0.0.0', port: int = 5052, keep_alive_interval: int = 30,
+                 cors_origins: Optional[List[str]] = None, redirect_secret: Optional[bytes] = None,
+                 initial_data: Optional[Callable[..., list]] = None,
+                 max_buffer_bytes: int = 64 * 1024, reuse_port: bool = False):
+        """
+        Args:
+            host: 바인드 주소
+            port: 바인드 포트
+            keep_alive_interval: keep-alive 주석 전송 간격 (초)
+            cors_origins: 허용 출처 패턴 목록 (fnmatch, 예: 'http://localhost:*')
+            redirect_secret: 리다이렉트 토큰 서명 키. 설정하면 유효한 토큰이 붙은 Origin: null 요청
+                (다른 출처로 리다이렉트된 EventSource 요청)만 허용 (없으면 null 출처 거부)
+            initial_data: (이벤트, notePath, user, Last-Event-ID) → 연결 직후 보낼 [(JSON, id), ...].
+                루프 스레드에서 호출되므로 메모리 조회만 해야 함
+            max_buffer_bytes: 클라이언트별 송신 버퍼 한도
+            reuse_port: SO_REUSEPORT로 바인드 (여러 워커 프로세스가 같은 포트를 나눠 받음)
+        """
+        self.host = host
+        self.port = port
+        self.keep_alive_interval = keep_alive_interval
+        self.cors_origins = cors_origins or []
+        self.redirect_secret = redirect_secret
+        self.initial_data = initial_data
+        self.max_buffer_bytes = max_buffer_bytes
+        self.reuse_port = reuse_port
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._clients = set()
+        self._topics: Dict[TopicKey, Set[_SSEConnection]] = {}
+        self._started = threading.Event()
+        self._thread = None
+
+        self._published = 0
+        self._delivered = 0
+        self._coalesced = 0
+        self._dropped = 0
+        self._peak_clients = 0
+
+    # -------------------------------------------------------------------------
+    # 수명 주기
+    # -------------------------------------------------------------------------
+
+    def start(self) -> None:
+        """이벤트 루프 스레드 시작 (바인드 완료까지 대기)"""
+        self._thread = threading.Thread(target=self._run, name='sse-loop', daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._server is None:
+            raise RuntimeError(f"SSE server failed to bind {self.host}:{self.port}")
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        try:
+            self._server = loop.run_until_complete(
+                loop.create_server(lambda: _SSEConnection(self), self.host, self.port, backlog=1024,
+                                   reuse_port=self.reuse_port or None)
+            )
+        except OSError as e:
+            logger.error(f"SSE server bind error: {e}")
+            self._started.set()
+            return
+        loop.call_later(self.keep_alive_interval, self._keep_alive)
+        logger.info(f"Async SSE server listening on {self.host}:{self.port}")
+        self._started.set()
+        loop.run_forever()
+
+    def stop(self) -> None:
+        """리스너와 모든 연결을 닫고 루프 종료"""
+        if self._loop is None or self._server is None:
+            return
+
+        def shutdown():
+            self._server.close()
+            for client in list(self._clients):
+                client.transport.close()
+            self._loop.stop()
+
+        self._loop.call_soon_threadsafe(shutdown)
+        self._thread.join(timeout=5)
+
+    # -------------------------------------------------------------------------
+    # 요청 처리 (루프 스레드)
+    # -------------------------------------------------------------------------
+
+    def allows_origin(self, origin: str) -> bool:
+        """허용 출처 패턴과 일치하는지 (null 제외)"""
+        return origin != 'null' and any(fnmatch.fnmatchcase(origin, pattern) for pattern in self.cors_origins)
+
+    def _sign(self, path: str, expires: int) -> str:
+        return hmac.new(self.redirect_secret, f"{path}|{expires}".encode('utf-8'), hashlib.sha256).hexdigest()[:32]
+
+    def redirect_token(self, path: str) -> Optional[str]:
+        """
+        리다이렉트 URL에 붙일 단기 토큰 (_REDIRECT_TOKEN_TTL초 유효, 경로에 묶임)
+
+        프록시는 요청 출처를 확인한 뒤에만 발급해야 합니다. 재연결은 EventSource가 엔진 URL로
+        직접 보내므로 실제 출처가 실려 오며, 토큰은 첫 연결에만 쓰입니다.
+        """
+        if self.redirect_secret is None:
+            return None
+        expires = int(time.time()) + _REDIRECT_TOKEN_TTL
+        return f"{expires}.{self._sign(path, expires)}"
+
+    def _valid_token(self, path: str, token: Optional[str]) -> bool:
+        if self.redirect_secret is None or not token:
+            return False
+        expires, _, signature = token.partition('.')
+        if not expires.isdigit() or int(expires) < time.time():
+            return False
+        return hmac.compare_digest(signature, self._sign(path, int(expires)))
+
+    def _cors_headers(self, origin: Optional[str], path: str, token: Optional[str]) -> str:
+        if not origin:
+            return ''
+        if self.allows_origin(origin) or (origin == 'null' and self._valid_token(path, token)):
+            return f"Access-Control-Allow-Origin: {origin}\r\nVary: Origin\r\n"
+        return ''
+
+    def _handle_request(self, conn: _SSEConnection) -> None:
+        head = conn.request.split(b'\r\n\r\n', 1)[0].decode('latin-1')
+        lines = head.split('\r\n')
+        try:
+            method, target, _ = lines[0].split(' ', 2)
+        except ValueError:
+            conn._reject(400, 'Bad Request')
+            return
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        cors = self._cors_headers(headers.get('origin'), url.path, query.get(REDIRECT_TOKEN_PARAM, [None])[0])
+
+        if method == 'OPTIONS':
+            conn._reject(204, 'No Content', cors + (
+                "Access-Control-Allow-Methods: GET, OPTIONS\r\n"
+                "Access-Control-Allow-Headers: Cache-Control, Last-Event-ID\r\n" if cors else ''
+            ))
+            return
+        event = SSE_ROUTES.get(url.path)
+        if method != 'GET' or event is None:
+            conn._reject(404, 'Not Found', cors)
+            return
+
+        # 재연결: EventSource가 보내는 Last-Event-ID (폴리필은 lastEventId 쿼리)
+        last_event_id = headers.get('last-event-id') or query.get('lastEventId', [None])[0]
+
+        conn.event = event
+        conn.key = topic_key(event, query.get('notePath', [''])[0], query.get('user', [''])[0])
+        self._topics.setdefault(conn.key, set()).add(conn)
+        conn.request = None
+        conn.transport.write((
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: text/event-stream; charset=utf-8\r\n"
+            "Cache-Control: no-cache\r\n"
+            "Connection: keep-alive\r\n"
+            "X-Accel-Buffering: no\r\n"
+            "X-Content-Type-Options: nosniff\r\n"
+            f"{cors}\r\n"
+        ).encode('latin-1'))
+        self._clients.add(conn)
+        self._peak_clients = max(self._peak_clients, len(self._clients))
+
+        initial = []
+        if self.initial_data is not None:
+            try:
+                initial = self.initial_data(*conn.key, last_event_id)
+            except Exception as e:
+                logger.error(f"SSE initial data error: {e}")
+        for data, event_id in initial:
+            conn.transport.write(_encode_event(event, data, event_id))
+        conn.ready = True
+        conn.flush()
+
+    def _discard(self, conn: _SSEConnection) -> None:
+        self._clients.discard(conn)
+        subscribers = self._topics.get(conn.key)
+        if subscribers is not None:
+            subscribers.discard(conn)
+            if not subscribers:
+                del self._topics[conn.key]
+
+    # -------------------------------------------------------------------------
+    # 브로드캐스트
+    # -------------------------------------------------------------------------
+
+    def _targets(self, event: Optional[str], note_path: Optional[str], user: Optional[str]) -> List[_SSEConnection]:
+        if event is None:
+            return list(self._clients)
+        targets = []
+        for key in matching_topics(event, note_path, user):
+            targets.extend(self._topics.get(key, ()))
+        return targets
+
+    def publish(self, data: str, event: Optional[str] = None,
+                note_path: Optional[str] = None, user: Optional[str] = None,
+                event_id: Optional[int] = None) -> int:
+        """
+        구독 키가 일치하는 클라이언트에 이벤트 전송 예약 (스레드 안전)
+
+        Args:
+            data: JSON 문자열
+            event: 이벤트 타입 (없으면 모든 클라이언트에게 각자의 이벤트 이름으로 전송)
+            note_path: 메시지의 노트 경로
+            user: 메시지의 사용자
+            event_id: SSE 이벤트 id
+
+        Returns:
+            예약 시점에 일치하는 연결 수 (근사값)
+        """
+        if self._loop is None or self._server is None:
+            return 0
+        self._loop.call_soon_threadsafe(self._fanout, data, event, note_path, user, event_id)
+        if event is None:
+            return len(self._clients)
+        topics = self._topics
+        return sum(len(topics.get(key, ())) for key in matching_topics(event, note_path, user))
+
+    def _fanout(self, data: str, event: Optional[str], note_path: Optional[str], user: Optional[str],
+                event_id: Optional[int]) -> None:
+        self._published += 1
+        slot = (event, note_path)
+        encoded: Dict[str, bytes] = {}
+        for conn in self._targets(event, note_path, user):
+            payload = encoded.get(conn.event)
+            if payload is None:
+                payload = encoded[conn.event] = _encode_event(conn.event, data, event_id)
+            self._delivered += 1
+            self._coalesced += conn.send(payload, slot)
+
+    def _keep_alive(self) -> None:
+        """keep-alive 전송 + 오래 멈춘 연결 정리"""
+        stalled_before = time.monotonic() - self.keep_alive_interval * 2
+        for conn in list(self._clients):
+            if conn.paused:
+                if conn.paused_at < stalled_before:
+                    logger.warning("SSE client stalled, closing connection")
+                    self._dropped += 1
+                    self._discard(conn)
+                    conn.transport.abort()
+            elif conn.ready:
+                conn.transport.write(_KEEP_ALIVE)
+        self._loop.call_later(self.keep_alive_interval, self._keep_alive)
+
+    # -------------------------------------------------------------------------
+    # 상태
+    # -------------------------------------------------------------------------
+
+    def get_client_count(self) -> int:
+        return len(self._clients)
+
+    def get_topic_count(self) -> int:
+        return len(self._topics)
+
+    def get_stats(self) -> dict:
+        return {
+            'port': self.port,
+            'clients': len(self._clients),
+            'topics': len(self._topics),
+            'peakClients': self._peak_clients,
+            'published': self._published,
+            'delivered': self._delivered,
+            'coalesced': self._coalesced,
+            'droppedClients': self._dropped,
+        }
@@ -0,0 +1,13 @@
+"""
+tts-proxy 단위 테스트 공통 설정
+
+모듈들이 패키지가 아닌 최상위 파일이므로 tts-proxy 디렉토리를 import 경로에 추가합니다.
+torch/ffmpeg 없이 실행할 수 있는 부분만 다룹니다.
+
+실행 (docker/tts-proxy에서):
+    python -m pytest -q tests
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
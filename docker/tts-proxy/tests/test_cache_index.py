@@ -0,0 +1,76 @@
+from cache_index import CacheIndex
+
+
+def _index(*sizes):
+    """키 k0, k1, ... 을 주어진 크기로 순서대로 추가 (last_access도 그 순서)"""
+    index = CacheIndex()
+    for i, size in enumerate(sizes):
+        index.add(f'k{i}', size)
+        index._entries[f'k{i}'].last_access = 1000.0 + i
+    return index
+
+
+def test_add_remove_tracks_total_bytes():
+    index = _index(100, 200)
+    index.add('k0', 50)  # 덮어쓰기
+    assert index.total_bytes == 250
+    assert index.remove('k1').size == 200
+    assert index.remove('k1') is None
+    assert (index.count(), index.total_bytes) == (1, 50)
+
+
+def test_lru_candidates_oldest_first():
+    index = _index(10, 10, 10, 10)
+    index.touch('k0')
+    assert index.eviction_candidates('lru', bytes_to_free=15, files_to_free=0) == ['k1', 'k2']
+    assert index.eviction_candidates('lru', bytes_to_free=0, files_to_free=1) == ['k1']
+    assert index.eviction_candidates('lru', bytes_to_free=0, files_to_free=0) == []
+
+
+def test_lfu_candidates_fewest_hits_then_oldest():
+    index = _index(10, 10, 10)
+    for _ in range(3):
+        index.touch('k0')
+    index.touch('k1')
+    assert index.eviction_candidates('lfu', bytes_to_free=0, files_to_free=2) == ['k2', 'k1']
+
+
+def test_candidates_beyond_partial_selection():
+    # 부분 선택(64개)으로 모자라면 범위를 넓혀 필요한 만큼 고름
+    index = _index(*([1] * 300))
+    selected = index.eviction_candidates('lru', bytes_to_free=200, files_to_free=0)
+    assert selected == [f'k{i}' for i in range(200)]
+
+
+def test_find_prefix():
+    index = CacheIndex()
+    for key in ('abcd1', 'abce2', 'abd00'):
+        index.add(key, 1)
+    assert index.find_prefix('abc') == 'abcd1'
+    assert index.find_prefix('abce') == 'abce2'
+    assert index.find_prefix('abf') is None
+    index.remove('abcd1')
+    assert index.find_prefix('abc') == 'abce2'
+    index.clear()
+    assert index.find_prefix('ab') is None
+
+
+def test_persisted_access_history_survives_reload(tmp_path):
+    db = tmp_path / 'cache-index.db'
+    index = CacheIndex(db)
+    index.load([('a', 10, 1.0), ('b', 20, 2.0)])
+    index.touch('a')
+    index.flush()
+
+    reloaded = CacheIndex(db)
+    # 'b'는 디스크에서 크기가 바뀌었고 'c'는 새 파일, 'a'는 그대로
+    reloaded.load([('a', 10, 1.0), ('b', 25, 3.0), ('c', 5, 4.0)])
+    assert reloaded._entries['a'].hits == 1
+    assert reloaded._entries['b'].hits == 0 and reloaded._entries['b'].size == 25
+    assert reloaded.total_bytes == 40
+
+    # 사라진 파일은 저장된 메타데이터에서도 제거
+    again = CacheIndex(db)
+    again.load([('c', 5, 4.0)])
+    assert again.count() == 1
+    assert CacheIndex(db)._load_rows().keys() == {'c'}
@@ -0,0 +1,43 @@
+import json
+
+from cache_manager import CacheManager
+
+
+def test_usage_from_two_workers_is_merged(tmp_path):
+    a = CacheManager(tmp_path)
+    b = CacheManager(tmp_path)
+    for _ in range(3):
+        a.update_usage('abcd')
+    for _ in range(2):
+        b.update_usage('xy')
+
+    # 각 워커가 여러 번 flush해도 서로의 기록을 덮어쓰거나 두 번 더하지 않음
+    a.flush()
+    b.flush()
+    a.flush()
+    b.flush()
+
+    stored = json.loads((tmp_path / 'usage.json').read_text())
+    assert (stored['totalCharacters'], stored['totalRequests']) == (16, 5)
+    assert a.get_usage()['totalRequests'] == b.get_usage()['totalRequests'] == 5
+
+    b.update_usage('z')
+    assert b.get_usage()['totalCharacters'] == 17
+    # 새 워커는 flush된 값만 읽음
+    assert CacheManager(tmp_path).get_usage()['totalCharacters'] == 16
+
+
+def test_stats_from_two_workers_are_merged(tmp_path):
+    a = CacheManager(tmp_path)
+    b = CacheManager(tmp_path)
+    a.update_stats(cache_hit=True)
+    a.update_stats(cache_hit=True)
+    b.update_stats(backend_request=True)
+    a.flush()
+    b.flush()
+    a.flush()
+
+    stored = json.loads((tmp_path / 'stats.json').read_text())
+    assert (stored['totalRequests'], stored['cacheHits'], stored['backendRequests']) == (3, 2, 1)
+    assert a.stats['totalRequests'] == b.stats['totalRequests'] == 3
+    assert CacheManager(tmp_path).stats['cacheHits'] == 2
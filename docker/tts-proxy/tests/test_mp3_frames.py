@@ -0,0 +1,95 @@
+import pytest
+
+import mp3_frames
+
+# MPEG1 Layer III, 128kbps, 44.1kHz, 스테레오, CRC 없음 → 417바이트, 1152샘플
+HEADER = b'\xff\xfb\x90\x00'
+FRAME_SIZE = 417
+FRAME_MS = 1152 * 1000.0 / 44100
+XING_OFFSET = 4 + 32  # 헤더 + MPEG1 스테레오 side information
+
+
+def _frame(fill: int) -> bytes:
+    return HEADER + bytes([fill]) * (FRAME_SIZE - 4)
+
+
+def _tag_frame(tag: bytes, offset: int) -> bytes:
+    body = bytearray(_frame(0))
+    body[offset:offset + 4] = tag
+    return bytes(body)
+
+
+def _stream(count: int) -> bytes:
+    return b''.join(_frame(i + 1) for i in range(count))
+
+
+def _fills(data: bytes) -> list:
+    return [data[frame.offset + 4] for frame in mp3_frames.iter_frames(data)]
+
+
+def test_parse_header():
+    frame = mp3_frames.parse_header(_frame(1), 0)
+    assert (frame.size, frame.samples, frame.sample_rate) == (FRAME_SIZE, 1152, 44100)
+    assert frame.duration_ms == pytest.approx(FRAME_MS)
+    assert mp3_frames.parse_header(b'\x00' * 8, 0) is None
+    assert mp3_frames.parse_header(HEADER[:3], 0) is None
+
+
+def test_iter_frames_stops_at_truncated_frame():
+    data = _stream(3) + _frame(9)[:100]
+    assert _fills(data) == [1, 2, 3]
+    assert mp3_frames.duration_ms(data) == pytest.approx(3 * FRAME_MS)
+    assert mp3_frames.has_frames(data)
+    assert not mp3_frames.has_frames(_frame(1)[:100])
+
+
+@pytest.mark.parametrize('tag, offset', [(b'Xing', XING_OFFSET), (b'Info', XING_OFFSET), (b'VBRI', 36)])
+def test_info_frame_excluded(tag, offset):
+    data = _tag_frame(tag, offset) + _stream(4)
+    first = next(mp3_frames.iter_frames(data))
+    assert mp3_frames.is_info_frame(data, first)
+    assert mp3_frames.duration_ms(data) == pytest.approx(4 * FRAME_MS)
+    # 절단 후에는 총 길이가 맞지 않으므로 태그 프레임을 버림
+    assert _fills(mp3_frames.cut(data, 0, 2 * FRAME_MS)) == [1, 2]
+
+
+def test_tag_bytes_elsewhere_are_audio():
+    data = _tag_frame(b'Xing', 100) + _stream(2)
+    first = next(mp3_frames.iter_frames(data))
+    assert not mp3_frames.is_info_frame(data, first)
+    assert mp3_frames.duration_ms(data) == pytest.approx(3 * FRAME_MS)
+
+
+def test_cut_range():
+    data = _stream(6)
+    assert _fills(mp3_frames.cut(data, FRAME_MS, 3 * FRAME_MS)) == [2, 3]
+    # 구간 안에서 시작하는 프레임만 남김
+    assert _fills(mp3_frames.cut(data, FRAME_MS / 2, 3 * FRAME_MS)) == [2, 3]
+    assert mp3_frames.cut(data, 10 * FRAME_MS, 20 * FRAME_MS) == b''
+
+
+def test_cut_without_end_keeps_partial_tail():
+    partial = _frame(9)[:100]
+    data = _stream(3) + partial
+    result = mp3_frames.cut(data, FRAME_MS)
+    assert result == _stream(3)[FRAME_SIZE:] + partial
+    # 모든 완전 프레임이 잘려도 잔여 바이트는 남김
+    assert mp3_frames.cut(data, 10 * FRAME_MS) == partial
+    assert mp3_frames.cut_head(data, FRAME_MS) == result
+
+
+def test_cut_preserves_id3():
+    id3 = b'ID3\x04\x00\x00\x00\x00\x00\x05' + b'\x00' * 5
+    data = id3 + _stream(3)
+    assert mp3_frames.audio_start(data) == len(id3)
+    result = mp3_frames.cut(data, FRAME_MS, 2 * FRAME_MS)
+    assert result == id3 + _frame(2)
+    assert mp3_frames.cut(data, 10 * FRAME_MS, 20 * FRAME_MS) == id3
+
+
+def test_frame_start_ms():
+    data = _tag_frame(b'Info', XING_OFFSET) + _stream(4)
+    assert mp3_frames.frame_start_ms(data, 0) == 0
+    assert mp3_frames.frame_start_ms(data, FRAME_MS / 2) == pytest.approx(FRAME_MS)
+    assert mp3_frames.frame_start_ms(data, 2 * FRAME_MS) == pytest.approx(2 * FRAME_MS)
+    assert mp3_frames.frame_start_ms(data, 10 * FRAME_MS) == pytest.approx(4 * FRAME_MS)
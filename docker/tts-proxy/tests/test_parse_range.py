@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip('aiohttp')
+pytest.importorskip('requests')
+pytest.importorskip('pydub')
+
+from tts_async import _parse_range, _etag_matches  # noqa: E402
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-99', (0, 99)),
+    ('bytes=100-', (100, 999)),
+    ('bytes=-100', (900, 999)),
+    ('bytes=-5000', (0, 999)),       # 길이보다 긴 suffix는 전체
+    ('bytes=990-5000', (990, 999)),  # 끝은 길이에 맞춤
+    ('bytes= 5-9', (5, 9)),
+])
+def test_satisfiable_ranges(header, expected):
+    assert _parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize('header', ['bytes=1000-', 'bytes=50-10', 'bytes=-0'])
+def test_unsatisfiable_ranges(header):
+    assert _parse_range(header, 1000) is False
+
+
+@pytest.mark.parametrize('header', [None, '', 'items=0-1', 'bytes=0-1,5-6', 'bytes=abc', 'bytes=a-b'])
+def test_ignored_ranges(header):
+    # 해석할 수 없거나 여러 범위면 전체 응답
+    assert _parse_range(header, 1000) is None
+
+
+def test_etag_matches():
+    assert _etag_matches('"abc"', 'abc')
+    assert _etag_matches('W/"abc", "def"', 'def')
+    assert _etag_matches('*', 'abc')
+    assert not _etag_matches('"abc-untrimmed"', 'abc')
+    assert not _etag_matches(None, 'abc')
@@ -0,0 +1,118 @@
+import json
+
+from position_store import PositionStore
+
+DEFAULT = {'position': 0}
+
+
+def _store(tmp_path, **kwargs):
+    # 타이머 기록이 테스트 중에 끼어들지 않도록 간격을 길게 두고 flush()를 직접 호출
+    kwargs.setdefault('flush_interval', 3600)
+    return PositionStore(tmp_path / 'position.json', DEFAULT, **kwargs)
+
+
+def test_set_stays_in_memory_until_flush(tmp_path):
+    store = _store(tmp_path)
+    assert store.get() == DEFAULT
+    record = store.set({'notePath': 'a.md', 'position': 3})
+    assert record['version'] == 1
+    assert store.get('a.md') == record
+    assert not store.path.exists()
+
+    store.flush()
+    stored = json.loads(store.path.read_text(encoding='utf-8'))
+    assert stored == {'version': 1, 'entries': [record]}
+    assert not list(tmp_path.glob('.*.tmp'))
+
+
+def test_reload_keeps_records_and_version(tmp_path):
+    store = _store(tmp_path)
+    store.set({'notePath': 'a.md', 'position': 1})
+    store.set({'notePath': 'b.md', 'position': 2})
+    store.set({'notePath': 'a.md', 'position': 5})
+    store.flush()
+
+    reloaded = _store(tmp_path)
+    assert reloaded.version == 3
+    assert reloaded.count() == 2
+    assert reloaded.get('a.md')['position'] == 5
+    # 가장 최근 레코드가 필터 없는 조회 결과
+    assert reloaded.get()['notePath'] == 'a.md'
+
+
+def test_flush_without_changes_does_not_write(tmp_path):
+    store = _store(tmp_path)
+    store.flush()
+    assert not store.path.exists()
+
+
+def test_load_legacy_single_position(tmp_path):
+    (tmp_path / 'position.json').write_text(json.dumps({'notePath': 'a.md', 'position': 7}))
+    store = _store(tmp_path)
+    assert store.version == 1
+    assert store.get('a.md') == {'notePath': 'a.md', 'position': 7, 'version': 1}
+
+
+def test_max_entries_evicts_least_recently_changed(tmp_path):
+    store = _store(tmp_path, max_entries=2)
+    store.set({'notePath': 'a.md', 'position': 1})
+    store.set({'notePath': 'b.md', 'position': 1})
+    store.set({'notePath': 'a.md', 'position': 2})
+    store.set({'notePath': 'c.md', 'position': 1})
+    assert store.count() == 2
+    assert store.get('b.md') == DEFAULT
+    assert store.get('a.md')['position'] == 2
+
+
+def _three_notes(store):
+    store.set({'user': 'u1', 'notePath': 'a.md', 'position': 1})
+    store.set({'user': 'u2', 'notePath': 'b.md', 'position': 1})
+    store.set({'user': 'u1', 'notePath': 'c.md', 'position': 1})
+
+
+def test_changes_since(tmp_path):
+    store = _store(tmp_path)
+    _three_notes(store)
+    assert [r['version'] for r in store.changes_since(0)] == [1, 2, 3]
+    assert [r['notePath'] for r in store.changes_since(1)] == ['b.md', 'c.md']
+    assert store.changes_since(3) == []
+    assert [r['notePath'] for r in store.changes_since(0, user='u1')] == ['a.md', 'c.md']
+    assert [r['version'] for r in store.changes_since(0, note_path='b.md')] == [2]
+
+    # 다시 바뀐 노트는 새 버전으로 끝에 옴
+    store.set({'user': 'u1', 'notePath': 'a.md', 'position': 9})
+    assert [(r['notePath'], r['version']) for r in store.changes_since(2)] == [('c.md', 3), ('a.md', 4)]
+
+
+def test_changes_since_as_json(tmp_path):
+    store = _store(tmp_path)
+    _three_notes(store)
+    changes = store.changes_since(2, as_json=True)
+    assert [version for _, version in changes] == [3]
+    assert json.loads(changes[0][0]) == store.get('c.md', 'u1')
+    assert store.get_json('c.md', 'u1') == changes[0]
+    assert store.get_json('missing.md') is None
+
+
+def test_apply_uses_lamport_version(tmp_path):
+    store = _store(tmp_path)
+    _three_notes(store)
+    # 원본 버전이 더 크면 따라가고, 작으면 로컬 + 1
+    applied = store.apply({'user': 'u3', 'notePath': 'd.md', 'position': 1, 'version': 10, 'timestamp': 1})
+    assert applied['version'] == 10
+    applied = store.apply({'user': 'u3', 'notePath': 'e.md', 'position': 1, 'version': 2, 'timestamp': 1})
+    assert applied['version'] == 11
+    assert store.version == 11
+    assert [r['notePath'] for r in store.changes_since(3)] == ['d.md', 'e.md']
+
+
+def test_apply_ignores_older_timestamp(tmp_path):
+    store = _store(tmp_path)
+    store.set({'notePath': 'a.md', 'position': 5, 'timestamp': 200})
+    assert store.apply({'notePath': 'a.md', 'position': 1, 'version': 7, 'timestamp': 100}) is None
+    assert store.get('a.md')['position'] == 5
+    assert store.version == 1
+
+    applied = store.apply({'notePath': 'a.md', 'position': 8, 'version': 7, 'timestamp': 300})
+    assert applied == {'notePath': 'a.md', 'position': 8, 'version': 7, 'timestamp': 300}
+    assert store.get('a.md') == applied
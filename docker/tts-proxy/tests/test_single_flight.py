@@ -0,0 +1,219 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from single_flight import AsyncSingleFlight, SingleFlight
+
+
+def _start_leader(flight, key, release, result=None, error=None):
+    """release가 설정될 때까지 결과를 게시하지 않는 leader 스레드"""
+    call, leader = flight.acquire(key)
+    assert leader
+
+    def work():
+        release.wait(5)
+        if error is not None:
+            raise error
+        return result
+
+    def run():
+        try:
+            flight.run(key, call, work)
+        except Exception:
+            pass
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_follower_shares_leader_result():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader = _start_leader(flight, 'k', release, result=b'audio')
+
+    call, is_leader = flight.acquire('k')
+    assert not is_leader
+    release.set()
+    assert flight.wait(call, 5) == b'audio'
+    leader.join()
+    assert flight.in_flight() == 0
+
+
+def test_leader_error_propagates_to_followers():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader = _start_leader(flight, 'k', release, error=ValueError('backend down'))
+
+    call, _ = flight.acquire('k')
+    release.set()
+    with pytest.raises(ValueError, match='backend down'):
+        flight.wait(call, 5)
+    leader.join()
+    # 실패한 키는 레지스트리에서 빠지므로 다음 요청이 새 leader가 됨
+    assert flight.acquire('k')[1]
+
+
+def test_follower_wait_times_out():
+    flight = SingleFlight()
+    call, _ = flight.acquire('k')
+    follower, leader = flight.acquire('k')
+    assert follower is call and not leader
+    with pytest.raises(TimeoutError):
+        flight.wait(follower, 0.05)
+
+
+def test_do_runs_independently_after_timeout():
+    flight = SingleFlight()
+    flight.acquire('k')  # 멈춘 leader
+    result, shared = flight.do('k', lambda: 'own', timeout=0.05)
+    assert (result, shared) == ('own', False)
+
+
+def test_do_runs_once_for_concurrent_callers():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return 'shared'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do('k', work, timeout=5)))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    # 나머지 네 요청이 모두 follower로 합류한 뒤 leader를 끝냄
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        call = flight._calls.get('k')
+        if call is not None and call.followers == 4:
+            break
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert all(result == 'shared' for result, _ in results)
+
+
+def test_async_followers_share_leader_result():
+    async def main():
+        flight = AsyncSingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await release.wait()
+            return b'audio'
+
+        future, leader = flight.acquire('k')
+        assert leader
+        leader_task = asyncio.ensure_future(flight.run('k', future, work))
+        followers = []
+        for _ in range(3):
+            joined, is_leader = flight.acquire('k')
+            assert joined is future and not is_leader
+            followers.append(asyncio.ensure_future(flight.wait(joined)))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(leader_task, *followers)
+        assert results == [b'audio'] * 4
+        assert calls == [1]
+        assert flight.in_flight() == 0
+
+    asyncio.run(main())
+
+
+def test_async_leader_error_reaches_followers():
+    async def main():
+        flight = AsyncSingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise RuntimeError('backend down')
+
+        future, _ = flight.acquire('k')
+        joined, _ = flight.acquire('k')
+        follower = asyncio.ensure_future(flight.wait(joined))
+        with pytest.raises(RuntimeError):
+            await flight.run('k', future, work)
+        with pytest.raises(RuntimeError):
+            await follower
+        # 실패한 키는 다음 요청이 새 leader로 다시 시도
+        assert flight.acquire('k')[1]
+
+    asyncio.run(main())
+
+
+def test_async_leader_cancel_keeps_work_running():
+    async def main():
+        flight = AsyncSingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return b'audio'
+
+        future, _ = flight.acquire('k')
+        leader_task = asyncio.ensure_future(flight.run('k', future, work))
+        joined, _ = flight.acquire('k')
+        follower = asyncio.ensure_future(flight.wait(joined))
+        await asyncio.sleep(0)
+
+        # leader 요청이 끊겨도 작업은 계속되어 follower가 결과를 받음
+        leader_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader_task
+        release.set()
+        assert await asyncio.wait_for(follower, 1) == b'audio'
+        assert flight.in_flight() == 0
+
+    asyncio.run(main())
+
+
+def test_async_follower_cancel_does_not_cancel_leader():
+    async def main():
+        flight = AsyncSingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return b'audio'
+
+        future, _ = flight.acquire('k')
+        leader_task = asyncio.ensure_future(flight.run('k', future, work))
+        joined, _ = flight.acquire('k')
+        follower = asyncio.ensure_future(flight.wait(joined))
+        await asyncio.sleep(0)
+        follower.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        assert await leader_task == b'audio'
+        assert not future.cancelled()
+
+    asyncio.run(main())
+
+
+def test_async_resolve_with_cancelled_error_cancels_followers():
+    async def main():
+        flight = AsyncSingleFlight()
+        future, _ = flight.acquire('k')
+        joined, _ = flight.acquire('k')
+        follower = asyncio.ensure_future(flight.wait(joined))
+        await asyncio.sleep(0)
+        flight.resolve('k', future, error=asyncio.CancelledError())
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        assert flight.in_flight() == 0
+        # 이미 게시된 Future는 다시 resolve해도 바뀌지 않음
+        flight.resolve('k', future, result=b'late')
+        assert future.cancelled()
+
+    asyncio.run(main())
@@ -0,0 +1,733 @@
+"""
+asyncio 기반 TTS 서버
+
+/api/tts(GET/POST), /api/tts-stream, /v1/audio/speech를 Flask 엔드포인트와 같은 요청/응답
+형식으로 하나의 이벤트 루프 스레드에서 처리합니다. 백엔드 요청과 재시도 대기(백오프)는
+루프를 막지 않으므로 느린 백엔드를 기다리는 요청이 많아도 요청마다 스레드를 점유하지
+않습니다. CPU를 쓰는 VAD 트리밍은 전용 스레드 풀로, 캐시 디스크 입출력은 루프 기본
+실행기로 넘깁니다.
+
+aiohttp가 필요하며, 서버는 TTS_ASYNC_PORT를 설정했을 때만 이 모듈을 import합니다.
+"""
+import time
+import random
+import asyncio
+import fnmatch
+import logging
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+import aiohttp
+from aiohttp import web
+
+import mp3_frames
+from metrics import STAGE_SECONDS, AUDIO_BYTES
+from backend_client import BackendError
+from single_flight import AsyncSingleFlight
+from vad_processor import (
+    trim_silence, trim_leading_silence, UntrimmedAudio, VAD_ENABLED, VAD_ASYNC, VAD_STREAM_HEAD_MS
+)
+
+logger = logging.getLogger(__name__)
+
+_BACKEND_SECONDS = STAGE_SECONDS.labels('backend')
+_HEADERS_SECONDS = STAGE_SECONDS.labels('backend_headers')
+_BACKEND_BYTES = AUDIO_BYTES.labels('backend_in')
+_CACHE_HIT_BYTES = AUDIO_BYTES.labels('cache_hit_out')
+
+
+class AsyncBackendStream:
+    """
+    스트리밍 백엔드 응답 래퍼 (BackendStream의 asyncio 버전)
+
+    close() 시 응답을 반환하고 동시 요청 슬롯을 돌려줍니다. 끝까지 읽은 연결은 풀로 돌아갑니다.
+    """
+
+    def __init__(self, response: aiohttp.ClientResponse, release: Callable[[], None]):
+        self._response = response
+        self._release = release
+        self._closed = False
+
+    async def iter_chunks(self, chunk_size: int):
+        async for chunk in self._response.content.iter_chunked(chunk_size):
+            _BACKEND_BYTES.inc(len(chunk))
+            yield chunk
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._response.release()
+        finally:
+            self._release()
+
+
+class AsyncBackendClient:
+    """
+    aiohttp 연결 풀 기반 TTS 백엔드 클라이언트 (BackendClient의 asyncio 버전)
+
+    동시 요청 수는 max_in_flight로 제한되며, 슬롯을 기다리는 요청은 스레드 없이 루프에서
+    대기합니다. open()/close()와 synthesize()는 같은 이벤트 루프에서 호출해야 합니다.
+    """
+
+    def __init__(self, base_url: str, max_in_flight: int = 8,
+                 connect_timeout: float = 5.0, read_timeout: float = 120.0,
+                 max_retries: int = 3, retry_base_delay: float = 1.0):
+        """
+        Args:
+            base_url: 백엔드 기본 URL
+            max_in_flight: 동시 백엔드 요청 상한 (연결 풀 크기와 동일)
+            connect_timeout: TCP 연결 타임아웃 (초)
+            read_timeout: 응답 대기 타임아웃 (초, 읽기 사이 간격 기준)
+            max_retries: 최대 시도 횟수
+            retry_base_delay: 지수 백오프 기본 지연 (초)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.max_in_flight = max_in_flight
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._waiting = 0
+        self._requests = 0
+        self._retries = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def open(self) -> None:
+        """연결 풀 생성 (루프 안에서 호출)"""
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_in_flight),
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.connect_timeout,
+                                          sock_read=self.read_timeout)
+        )
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _acquire(self) -> None:
+        """동시 요청 슬롯 획득 (대기 시간 기록)"""
+        started = time.monotonic()
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        waited = time.monotonic() - started
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        self._requests += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._slots.release()
+
+    async def synthesize(self, payload: dict, stream: bool = False):
+        """
+        지수 백오프 재시도로 /v1/audio/speech 요청
+
+        재시도 대기(asyncio.sleep) 중에는 슬롯을 반환하므로 다른 요청이 진행할 수 있습니다.
+
+        Args:
+            payload: 요청 본문
+            stream: True이면 본문을 읽지 않은 AsyncBackendStream 반환 (호출자가 close 책임)
+
+        Returns:
+            오디오 바이트, stream=True이면 AsyncBackendStream
+
+        Raises:
+            BackendError: 모든 재시도 실패 시
+        """
+        url = f"{self.base_url}/v1/audio/speech"
+        last_error = None
+        for attempt in range(self.max_retries):
+            await self._acquire()
+            started = time.perf_counter()
+            try:
+                response = await self._session.post(url, json=payload)
+                if stream:
+                    try:
+                        response.raise_for_status()
+                    except BaseException:
+                        response.release()
+                        raise
+                    _HEADERS_SECONDS.observe(time.perf_counter() - started)
+                    return AsyncBackendStream(response, self._release)
+                async with response:
+                    response.raise_for_status()
+                    audio_data = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._release()
+                last_error = e
+                if attempt < self.max_retries - 1:
+                    self._retries += 1
+                    delay = self.retry_base_delay * (2 ** attempt) + random.uniform(0, 0.5)
+                    logger.warning(
+                        f"TTS backend retry {attempt + 1}/{self.max_retries} "
+                        f"after {delay:.1f}s: {e}"
+                    )
+                    await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                self._release()
+                raise
+            self._release()
+            _BACKEND_SECONDS.observe(time.perf_counter() - started)
+            _BACKEND_BYTES.inc(len(audio_data))
+            return audio_data
+
+        logger.error(f"TTS backend failed after {self.max_retries} retries: {last_error}")
+        raise BackendError(str(last_error) or type(last_error).__name__)
+
+    def get_metrics(self) -> dict:
+        """슬롯 사용량 및 대기 시간 지표 (루프 스레드 밖에서 읽으면 근사값)"""
+        requests_count = self._requests
+        return {
+            'maxInFlight': self.max_in_flight,
+            'inFlight': self._in_flight,
+            'peakInFlight': self._peak_in_flight,
+            'waiting': self._waiting,
+            'requests': requests_count,
+            'retries': self._retries,
+            'waitTimeAvgMs': round(self._wait_total / requests_count * 1000, 2) if requests_count else 0.0,
+            'waitTimeMaxMs': round(self._wait_max * 1000, 2),
+            'utilization': round(self._in_flight / self.max_in_flight, 3),
+            'connectTimeout': self.connect_timeout,
+            'readTimeout': self.read_timeout,
+        }
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return True
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag.strip('"') == etag:
+            return True
+    return False
+
+
+def _parse_range(header: Optional[str], length: int):
+    """
+    단일 바이트 범위 해석 (bytes=a-b, bytes=a-, bytes=-n)
+
+    Returns:
+        (시작, 끝) 포함 범위, 헤더가 없거나 해석할 수 없으면 None, 만족할 수 없으면 False
+    """
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    start, sep, end = header[6:].strip().partition('-')
+    if not sep:
+        return None
+    try:
+        if not start:
+            suffix = int(end)
+            if suffix <= 0:
+                return False
+            return max(0, length - suffix), length - 1
+        first = int(start)
+        last = int(end) if end else length - 1
+    except ValueError:
+        return None
+    if first >= length or last < first:
+        return False
+    return first, min(last, length - 1)
+
+
+class AsyncTTSServer:
+    """
+    단일 이벤트 루프 TTS 서버 (별도 스레드에서 실행)
+
+    처리 순서와 응답 헤더(X-Cache, X-Stream, X-Coalesced, X-VAD-Trim, ETag/Range)는 Flask의
+    _handle_tts_request와 같습니다. 캐시·통계·백그라운드 트리밍은 Flask 경로와 같은 객체를
+    공유하며, 같은 캐시 키의 동시 미스는 이 루프 안에서 AsyncSingleFlight로 병합합니다
+    (Flask 경로와 동시에 같은 키를 합성하면 병합되지 않고 캐시만 한 번 더 기록됩니다).
+    """
+
+    def __init__(self, cache_mgr, backend: AsyncBackendClient,
+                 build_payload: Callable[..., dict], validate_voice: Callable[[str], str],
+                 parse_stream_flag: Callable[[object], Optional[bool]],
+                 vad_header: Callable[..., str], schedule_trim: Callable[[str, bytes, tuple], None],
+                 host: str = '0.0.0.0', port: int = 5053, model_override: str = '',
+                 stream_default: bool = False, chunk_size: int = 8192, cpu_workers: int = 4,
+                 cors_origins: Optional[List[str]] = None, reuse_port: bool = False,
+                 shutdown_timeout: float = 10.0):
+        """
+        Args:
+            cache_mgr: CacheManager (Flask 경로와 공유)
+            backend: 비동기 백엔드 클라이언트 (루프 시작 시 open)
+            build_payload: (text, voice, model, rate) → 백엔드 요청 본문
+            validate_voice: voice 검증 (허용 목록 밖이면 기본값)
+            parse_stream_flag: stream 파라미터 해석
+            vad_header: X-VAD-Trim 헤더 값 계산 (server._vad_header)
+            schedule_trim: (키, 오디오, 파일 토큰) → 캐시에 저장된 미트리밍 오디오의 백그라운드 트리밍 예약
+            host: 바인드 주소
+            port: 바인드 포트
+            model_override: 비어 있지 않으면 요청의 model 대신 사용 (TTS_MODEL)
+            stream_default: stream 파라미터가 없을 때 스트리밍 여부
+            chunk_size: 스트리밍 시 백엔드 읽기 단위 (바이트)
+            cpu_workers: VAD 트리밍 스레드 수
+            cors_origins: 허용 출처 패턴 목록 (fnmatch)
+            reuse_port: SO_REUSEPORT로 바인드 (여러 워커 프로세스가 같은 포트를 나눠 받음)
+            shutdown_timeout: 종료 시 진행 중인 요청을 기다리는 시간 (초)
+        """
+        self.cache_mgr = cache_mgr
+        self.backend = backend
+        self.build_payload = build_payload
+        self.validate_voice = validate_voice
+        self.parse_stream_flag = parse_stream_flag
+        self.vad_header = vad_header
+        self.schedule_trim = schedule_trim
+        self.host = host
+        self.port = port
+        self.model_override = model_override
+        self.stream_default = stream_default
+        self.chunk_size = chunk_size
+        self.cors_origins = cors_origins or []
+        self.reuse_port = reuse_port
+        self.shutdown_timeout = shutdown_timeout
+
+        self._flight = AsyncSingleFlight()
+        self._cpu_executor = ThreadPoolExecutor(max_workers=cpu_workers, thread_name_prefix='tts-async-vad')
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._started = threading.Event()
+        self._thread = None
+
+        self._requests = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._streams = 0
+
+    # -------------------------------------------------------------------------
+    # 수명 주기
+    # -------------------------------------------------------------------------
+
+    def start(self) -> None:
+        """이벤트 루프 스레드 시작 (바인드 완료까지 대기)"""
+        self._thread = threading.Thread(target=self._run, name='tts-async-loop', daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._runner is None:
+            raise RuntimeError(f"Async TTS server failed to bind {self.host}:{self.port}")
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._startup())
+        except OSError as e:
+            logger.error(f"Async TTS server bind error: {e}")
+            loop.run_until_complete(self._cleanup())
+            self._started.set()
+            return
+        logger.info(f"Async TTS server listening on {self.host}:{self.port}")
+        self._started.set()
+        loop.run_forever()
+        loop.close()
+
+    async def _startup(self) -> None:
+        await self.backend.open()
+        app = web.Application(middlewares=[self._middleware])
+        app.on_response_prepare.append(self._add_cors_headers)
+        app.router.add_get('/api/tts', self._tts_get)
+        app.router.add_post('/api/tts', self._tts_post)
+        app.router.add_post('/api/tts-stream', self._tts_stream)
+        app.router.add_post('/v1/audio/speech', self._openai_speech)
+        runner = web.AppRunner(app, access_log=None, shutdown_timeout=self.shutdown_timeout)
+        await runner.setup()
+        self._runner = runner
+        site = web.TCPSite(runner, self.host, self.port, backlog=1024,
+                           reuse_port=self.reuse_port or None)
+        try:
+            await site.start()
+        except OSError:
+            self._runner = None
+            await runner.cleanup()
+            raise
+
+    async def _cleanup(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+        await self.backend.close()
+
+    def stop(self) -> None:
+        """리스너를 닫고 진행 중인 요청을 shutdown_timeout까지 기다린 뒤 루프 종료"""
+        if self._loop is None or self._runner is None:
+            return
+
+        async def shutdown():
+            try:
+                await self._cleanup()
+            finally:
+                self._loop.stop()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop)
+        self._thread.join(timeout=self.shutdown_timeout + 5)
+        self._cpu_executor.shutdown(wait=False)
+
+    # -------------------------------------------------------------------------
+    # 공통 처리
+    # -------------------------------------------------------------------------
+
+    def _cors_headers(self, origin: Optional[str]) -> dict:
+        if origin and any(fnmatch.fnmatchcase(origin, pattern) for pattern in self.cors_origins):
+            return {'Access-Control-Allow-Origin': origin, 'Vary': 'Origin'}
+        return {}
+
+    async def _add_cors_headers(self, request: web.Request, response: web.StreamResponse) -> None:
+        response.headers.update(self._cors_headers(request.headers.get('Origin')))
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        if request.method == 'OPTIONS':
+            headers = {}
+            if self._cors_headers(request.headers.get('Origin')):
+                headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+                requested = request.headers.get('Access-Control-Request-Headers')
+                if requested:
+                    headers['Access-Control-Allow-Headers'] = requested
+            return web.Response(status=200, headers=headers)
+
+        self._requests += 1
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        try:
+            return await handler(request)
+        except web.HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"TTS request error: {e}")
+            self.cache_mgr.update_stats(error=True)
+            return web.json_response({'error': str(e)}, status=500)
+        finally:
+            self._in_flight -= 1
+
+    async def _run_io(self, fn, *args):
+        """캐시 디스크 입출력 (루프 기본 실행기)"""
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def _run_cpu(self, fn, *args):
+        """VAD 트리밍 (전용 스레드 풀)"""
+        return await asyncio.get_running_loop().run_in_executor(self._cpu_executor, fn, *args)
+
+    @staticmethod
+    async def _read_body(request: web.Request) -> Optional[dict]:
+        try:
+            body = await request.json()
+        except ValueError:
+            return None
+        return body if isinstance(body, dict) else None
+
+    # -------------------------------------------------------------------------
+    # 엔드포인트 (요청 형식은 Flask 엔드포인트와 동일)
+    # -------------------------------------------------------------------------
+
+    async def _tts_get(self, request: web.Request) -> web.StreamResponse:
+        """GET /api/tts (audio.src 지원)"""
+        text = request.query.get('text', '').strip()
+        if not text:
+            return web.json_response({'error': 'text is required'}, status=400)
+        voice = self.validate_voice(request.query.get('voice', 'alloy'))
+        stream = self.parse_stream_flag(request.query.get('stream'))
+        return await self._handle(request, text, voice, stream=stream)
+
+    async def _tts_post(self, request: web.Request) -> web.StreamResponse:
+        """POST /api/tts (rate, useCache 지원)"""
+        body = await self._read_body(request)
+        if not body:
+            return web.json_response({'error': 'No data provided'}, status=400)
+        text = body.get('text', '').strip()
+        if not text:
+            return web.json_response({'error': 'text is required'}, status=400)
+        voice = self.validate_voice(body.get('voice', 'alloy'))
+        stream = self.parse_stream_flag(body.get('stream', request.query.get('stream')))
+        return await self._handle(request, text, voice, rate=body.get('rate'),
+                                  use_cache=body.get('useCache', True), stream=stream)
+
+    async def _tts_stream(self, request: web.Request) -> web.StreamResponse:
+        """POST /api/tts-stream (Azure TTS API 호환)"""
+        body = await self._read_body(request)
+        if not body:
+            return web.json_response({'error': 'No data provided'}, status=400)
+        text = body.get('text', '').strip()
+        if not text:
+            return web.json_response({'error': 'text is required'}, status=400)
+        voice = self.validate_voice(body.get('voice', 'alloy'))
+        stream = self.parse_stream_flag(body.get('stream', request.query.get('stream')))
+        return await self._handle(request, text, voice, stream=stream)
+
+    async def _openai_speech(self, request: web.Request) -> web.StreamResponse:
+        """POST /v1/audio/speech (OpenAI Audio Speech API 호환)"""
+        body = await self._read_body(request)
+        if not body:
+            return web.json_response({'error': 'No data provided'}, status=400)
+        model = body.get('model', 'tts-1')
+        text = body.get('input', '').strip()
+        voice = self.validate_voice(body.get('voice', 'alloy'))
+        if not text:
+            return web.json_response({'error': 'input is required'}, status=400)
+        stream = self.parse_stream_flag(body.get('stream', request.query.get('stream')))
+        return await self._handle(request, text, voice, model=model, stream=stream)
+
+    # -------------------------------------------------------------------------
+    # TTS 파이프라인
+    # -------------------------------------------------------------------------
+
+    async def _handle(self, request: web.Request, text: str, voice: str, model: str = 'tts-1',
+                      rate: str = None, use_cache: bool = True,
+                      stream: bool = None) -> web.StreamResponse:
+        """캐시 확인 → 백엔드 요청 → VAD 트리밍 → 캐시 저장 → 응답 (server._handle_tts_request와 동일)"""
+        cache = self.cache_mgr
+        effective_model = self.model_override or model
+        if stream is None:
+            stream = self.stream_default
+
+        cache_key = cache.generate_cache_key(text, voice, rate)
+
+        if use_cache:
+            source = await self._run_io(cache.lookup, cache_key)
+            if source is not None:
+                response = await self._cached_audio_response(request, cache_key, source)
+                if response is not None:
+                    logger.info(f"Cache HIT: {cache_key[:16]}...")
+                    cache.update_stats(cache_hit=True)
+                    return response
+
+        logger.info(f"Cache MISS: {cache_key[:16]}..., requesting backend...")
+
+        future, leader = self._flight.acquire(cache_key) if use_cache else (None, True)
+        if leader and stream:
+            return await self._stream_response(request, text, voice, effective_model, rate,
+                                               cache_key, use_cache, future)
+
+        async def synthesize():
+            return await self._synthesize(text, voice, effective_model, rate, cache_key, use_cache)
+
+        try:
+            if not leader:
+                audio_data = await self._flight.wait(future)
+            elif future is not None:
+                audio_data = await self._flight.run(cache_key, future, synthesize)
+            else:
+                audio_data = await synthesize()
+        except BackendError as e:
+            cache.update_stats(error=True)
+            return web.json_response({'error': f'TTS backend error: {e}'}, status=502)
+
+        headers = {
+            'X-Cache': 'MISS',
+            'X-VAD-Trim': self.vad_header(fresh=True, use_cache=use_cache, audio_data=audio_data),
+            'X-Content-Type-Options': 'nosniff'
+        }
+        if not leader:
+            logger.info(f"Coalesced MISS: {cache_key[:16]}... (shared leader result)")
+            cache.update_stats(cache_hit=False, coalesced=True)
+            headers['X-Coalesced'] = 'true'
+        return web.Response(body=audio_data, content_type='audio/mpeg', headers=headers)
+
+    async def _cached_audio_response(self, request: web.Request, cache_key: str,
+                                     source) -> Optional[web.Response]:
+        """
+        캐시 히트 응답 (Range/206, ETag/If-None-Match/304 지원)
+
+        파일 경로이면 실행기에서 읽습니다. 그 사이 삭제되었으면 None (미스로 처리).
+        """
+        if isinstance(source, Path):
+            try:
+                source = await self._run_io(source.read_bytes)
+            except FileNotFoundError:
+                return None
+        _CACHE_HIT_BYTES.inc(len(source))
+
+        vad_state = self.vad_header(cache_key)
+        etag = cache_key if vad_state != 'untrimmed' else f"{cache_key}-untrimmed"
+        headers = {
+            'ETag': f'"{etag}"',
+            'Accept-Ranges': 'bytes',
+            'Cache-Control': 'no-cache',
+            'X-VAD-Trim': vad_state,
+            'X-Cache': 'HIT',
+            'X-Content-Type-Options': 'nosniff'
+        }
+        if _etag_matches(request.headers.get('If-None-Match'), etag):
+            return web.Response(status=304, headers=headers)
+
+        byte_range = _parse_range(request.headers.get('Range'), len(source))
+        if byte_range is False:
+            headers['Content-Range'] = f'bytes */{len(source)}'
+            return web.Response(status=416, headers=headers)
+        if byte_range is None:
+            return web.Response(body=source, content_type='audio/mpeg', headers=headers)
+        start, end = byte_range
+        headers['Content-Range'] = f'bytes {start}-{end}/{len(source)}'
+        return web.Response(status=206, body=source[start:end + 1], content_type='audio/mpeg',
+                            headers=headers)
+
+    async def _synthesize(self, text: str, voice: str, effective_model: str, rate: str,
+                          cache_key: str, use_cache: bool) -> bytes:
+        """캐시 미스 처리 (server._synthesize와 동일, VAD/디스크 작업은 실행기에서)"""
+        cache = self.cache_mgr
+        # 레지스트리 등록 직전에 다른 요청이 저장을 마쳤을 수 있음
+        if use_cache:
+            audio_data = await self._run_io(cache.read, cache_key)
+            if audio_data is not None:
+                cache.update_stats(cache_hit=True)
+                return audio_data
+
+        cache.update_stats(cache_hit=False, backend_request=True)
+        cache.update_usage(text)
+
+        payload = self.build_payload(text, voice, effective_model, rate)
+        audio_data = await self.backend.synthesize(payload)
+        if not (VAD_ASYNC and use_cache):
+            audio_data = await self._run_cpu(trim_silence, audio_data)
+        if use_cache:
+            untrimmed = VAD_ASYNC or isinstance(audio_data, UntrimmedAudio)
+            token = await self._run_io(cache.write, cache_key, audio_data, untrimmed)
+            logger.info(f"Saved to cache: {cache_key[:16]}...")
+            if untrimmed:
+                self.schedule_trim(cache_key, audio_data, token)
+        return audio_data
+
+    async def _trimmed_pieces(self, backend_stream: AsyncBackendStream):
+        """백엔드 청크 → 클라이언트 조각 (server._iter_trimmed_stream과 동일, 트리밍은 실행기에서)"""
+        head = bytearray()
+        head_done = not VAD_ENABLED or VAD_ASYNC
+        async for chunk in backend_stream.iter_chunks(self.chunk_size):
+            if not chunk:
+                continue
+            if head_done:
+                yield chunk
+                continue
+            head.extend(chunk)
+            if mp3_frames.duration_ms(head) >= VAD_STREAM_HEAD_MS:
+                head_done = True
+                yield await self._run_cpu(trim_leading_silence, bytes(head))
+
+        if not head_done and head:
+            yield await self._run_cpu(trim_silence, bytes(head))
+
+    async def _stream_response(self, request: web.Request, text: str, voice: str,
+                               effective_model: str, rate: str, cache_key: str,
+                               use_cache: bool, future: Optional[asyncio.Future]) -> web.StreamResponse:
+        """
+        캐시 미스 스트리밍 응답 (server._stream_tts_response와 동일)
+
+        클라이언트가 중간에 끊어도 나머지를 끝까지 읽어 캐시를 완성하고 follower에게 게시합니다.
+        """
+        cache = self.cache_mgr
+        published = False
+
+        def publish(result=None, error=None):
+            nonlocal published
+            published = True
+            if future is not None:
+                self._flight.resolve(cache_key, future, result=result, error=error)
+
+        try:
+            cache.update_stats(cache_hit=False, backend_request=True)
+            cache.update_usage(text)
+            payload = self.build_payload(text, voice, effective_model, rate)
+            backend_stream = await self.backend.synthesize(payload, stream=True)
+        except BaseException as e:
+            publish(error=e)
+            if not isinstance(e, BackendError):
+                raise
+            cache.update_stats(error=True)
+            return web.json_response({'error': f'TTS backend error: {e}'}, status=502)
+
+        response = web.StreamResponse(headers={
+            'Content-Type': 'audio/mpeg',
+            'X-Cache': 'MISS',
+            'X-Stream': 'true',
+            'X-VAD-Trim': self.vad_header(fresh=True, stream=True, use_cache=use_cache),
+            'X-Content-Type-Options': 'nosniff'
+        })
+        self._streams += 1
+        parts = []
+        error = None
+        client_gone = False
+        try:
+            try:
+                await response.prepare(request)
+            except ConnectionError:
+                client_gone = True
+            try:
+                async for piece in self._trimmed_pieces(backend_stream):
+                    parts.append(piece)
+                    if client_gone:
+                        continue
+                    try:
+                        await response.write(piece)
+                    except ConnectionError:
+                        client_gone = True
+                        logger.info(f"Stream client disconnected: {cache_key[:16]}..., finishing backend read")
+            except Exception as e:
+                error = e
+                logger.error(f"TTS stream error: {e}")
+            finally:
+                backend_stream.close()
+
+            if error is not None:
+                publish(error=BackendError(str(error) or type(error).__name__))
+            else:
+                audio_data = b''.join(parts)
+                if use_cache:
+                    token = await self._run_io(cache.write, cache_key, audio_data, VAD_ENABLED)
+                    logger.info(f"Saved to cache (stream): {cache_key[:16]}...")
+                    self.schedule_trim(cache_key, audio_data, token)
+                publish(result=audio_data)
+        except BaseException as e:
+            if not published:
+                publish(error=e)
+            raise
+        finally:
+            self._streams -= 1
+
+        if client_gone:
+            return response
+        if error is not None:
+            # 잘린 오디오가 정상 응답(chunked 종료)처럼 끝나지 않도록 종료 청크 없이 연결을 끊음
+            if request.transport is not None:
+                request.transport.close()
+            return response
+        try:
+            await response.write_eof()
+        except ConnectionError:
+            pass
+        return response
+
+    # -------------------------------------------------------------------------
+    # 통계
+    # -------------------------------------------------------------------------
+
+    def get_stats(self) -> dict:
+        """요청/스트림/백엔드 지표 (루프 스레드 밖에서 읽으면 근사값)"""
+        return {
+            'address': f"{self.host}:{self.port}",
+            'requests': self._requests,
+            'inFlight': self._in_flight,
+            'peakInFlight': self._peak_in_flight,
+            'streams': self._streams,
+            'synthesisInFlight': self._flight.in_flight(),
+            'backend': self.backend.get_metrics(),
+        }
@@ -5,115 +5,601 @@ TTS 출력 오디오의 앞뒤 불필요한 무음/숨소리를 자동 제거합
 """
 import io
 import os
-import struct
+import sys
+import time
+import queue
 import logging
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable, List
 
-import torch
+import numpy as np
 from pydub import AudioSegment
 
+import mp3_frames
+from metrics import STAGE_SECONDS, AUDIO_BYTES
+
 logger = logging.getLogger(__name__)
 
 # 설정
 VAD_ENABLED = os.environ.get('VAD_ENABLED', 'true').lower() == 'true'
 VAD_PADDING_MS = int(os.environ.get('VAD_PADDING_MS', '100'))
 VAD_SAMPLE_RATE = 16000
+# 스트리밍 모드에서 선행 무음 분석에 사용할 첫 구간 길이
+VAD_STREAM_HEAD_MS = int(os.environ.get('VAD_STREAM_HEAD_MS', '1500'))
+# 비동기 트리밍: 미트리밍 오디오를 먼저 응답하고 백그라운드에서 트리밍 후 캐시 교체
+VAD_ASYNC = os.environ.get('VAD_ASYNC', 'false').lower() == 'true'
+VAD_ASYNC_WORKERS = int(os.environ.get('VAD_ASYNC_WORKERS', '2'))
+# 무손실 트리밍: MP3 프레임 경계에서 잘라 재인코딩 생략 (false면 디코딩 후 192k 재인코딩)
+VAD_LOSSLESS_TRIM = os.environ.get('VAD_LOSSLESS_TRIM', 'true').lower() == 'true'
+# 가장자리 분석: 앞뒤 구간만 디코딩/VAD (0이면 항상 전체 분석). 무손실 트리밍에서만 사용
+VAD_EDGE_WINDOW_MS = int(os.environ.get('VAD_EDGE_WINDOW_MS', '3000'))
+# 끝 구간 앞에 더 붙여 디코딩하는 길이 (비트 저장소/디코더 워밍업용)
+_EDGE_WARMUP_MS = 100
+# VAD 추론 서비스: 전용 워커의 연산 스레드 수, micro-batch 최대 크기/수집 대기 시간
+VAD_TORCH_THREADS = int(os.environ.get('VAD_TORCH_THREADS', '2'))
+VAD_BATCH_MAX = int(os.environ.get('VAD_BATCH_MAX', '8'))
+VAD_BATCH_WAIT_MS = float(os.environ.get('VAD_BATCH_WAIT_MS', '5'))
+# 추론 결과 대기 한도 (초). 넘으면 트리밍을 포기하고 원본 오디오 사용
+VAD_INFERENCE_TIMEOUT = float(os.environ.get('VAD_INFERENCE_TIMEOUT', '10'))
+# 추론 백엔드: torch (TorchScript) 또는 onnx (onnxruntime, torch를 import하지 않음)
+VAD_BACKENDS = ('torch', 'onnx')
+VAD_BACKEND = os.environ.get('VAD_BACKEND', 'torch').strip().lower()
+if VAD_BACKEND not in VAD_BACKENDS:
+    raise ValueError(f"Unknown VAD_BACKEND '{VAD_BACKEND}' (expected one of: {', '.join(VAD_BACKENDS)})")
+# 모델 위치: 로컬 silero-vad 저장소 디렉토리 (onnx는 .onnx 파일도 가능).
+# 비어 있으면 torch.hub에서 내려받음 (네트워크 또는 hub 캐시 필요)
+VAD_MODEL_PATH = os.environ.get('VAD_MODEL_PATH', '')
+
+# get_speech_timestamps 파라미터 (torch/onnx 백엔드 공통)
+_VAD_THRESHOLD = 0.3
+_VAD_MIN_SPEECH_MS = 50
+_VAD_MIN_SILENCE_MS = 100
+_VAD_SPEECH_PAD_MS = 30
+# Silero v5 ONNX 입력: 16kHz에서 512샘플 창 + 직전 창의 64샘플 문맥, 상태 [2, batch, 128]
+_ONNX_WINDOW = 512
+_ONNX_CONTEXT = 64
+_ONNX_STATE_SIZE = 128
+# 저장소 디렉토리 안의 ONNX 가중치 위치
+_ONNX_REPO_FILE = Path('src', 'silero_vad', 'data', 'silero_vad.onnx')
 
 _vad_model = None
 _vad_utils = None
+_onnx_session = None
+_model_lock = threading.Lock()
+_model_load_seconds = None
+
+_DECODE_SECONDS = STAGE_SECONDS.labels('vad_decode')
+_QUEUE_SECONDS = STAGE_SECONDS.labels('vad_queue')
+_INFERENCE_SECONDS = STAGE_SECONDS.labels('vad_inference')
+_CUT_SECONDS = STAGE_SECONDS.labels('frame_cut')
+_REENCODE_SECONDS = STAGE_SECONDS.labels('reencode')
+_REMOVED_BYTES = AUDIO_BYTES.labels('vad_removed')
 
 
 def get_vad_model():
-    """Silero VAD 모델 lazy loading"""
-    global _vad_model, _vad_utils
+    """Silero VAD 모델 lazy loading (torch 백엔드)"""
+    global _vad_model, _vad_utils, _model_load_seconds
     if _vad_model is None:
-        logger.info("Loading Silero VAD model...")
-        model, utils = torch.hub.load(
-            repo_or_dir='snakers4/silero-vad',
-            model='silero_vad',
-            trust_repo=True
-        )
-        _vad_model = model
-        _vad_utils = utils
-        logger.info("Silero VAD model loaded")
+        with _model_lock:
+            if _vad_model is None:
+                started = time.monotonic()
+                import torch
+                if VAD_MODEL_PATH:
+                    logger.info(f"Loading Silero VAD model from {VAD_MODEL_PATH}...")
+                    model, utils = torch.hub.load(
+                        repo_or_dir=VAD_MODEL_PATH,
+                        model='silero_vad',
+                        source='local',
+                        trust_repo=True
+                    )
+                else:
+                    logger.info("Loading Silero VAD model...")
+                    model, utils = torch.hub.load(
+                        repo_or_dir='snakers4/silero-vad',
+                        model='silero_vad',
+                        trust_repo=True
+                    )
+                _vad_utils = utils
+                _vad_model = model
+                _model_load_seconds = time.monotonic() - started
+                logger.info(f"Silero VAD model loaded ({_model_load_seconds:.2f}s)")
     return _vad_model, _vad_utils
 
 
+def _onnx_model_file() -> Path:
+    """VAD_MODEL_PATH에서 ONNX 가중치 파일 경로 결정"""
+    if not VAD_MODEL_PATH:
+        raise RuntimeError("VAD_BACKEND=onnx requires VAD_MODEL_PATH (silero-vad repo dir or .onnx file)")
+    path = Path(VAD_MODEL_PATH)
+    return path / _ONNX_REPO_FILE if path.is_dir() else path
+
+
+def get_onnx_session():
+    """Silero VAD ONNX 세션 lazy loading (onnx 백엔드, torch 미사용)"""
+    global _onnx_session, _model_load_seconds
+    if _onnx_session is None:
+        with _model_lock:
+            if _onnx_session is None:
+                started = time.monotonic()
+                import onnxruntime
+                model_file = _onnx_model_file()
+                logger.info(f"Loading Silero VAD ONNX model from {model_file}...")
+                options = onnxruntime.SessionOptions()
+                options.intra_op_num_threads = VAD_TORCH_THREADS
+                options.inter_op_num_threads = 1
+                _onnx_session = onnxruntime.InferenceSession(
+                    str(model_file), sess_options=options, providers=['CPUExecutionProvider']
+                )
+                _model_load_seconds = time.monotonic() - started
+                logger.info(f"Silero VAD ONNX model loaded ({_model_load_seconds:.2f}s)")
+    return _onnx_session
+
+
 def is_loaded() -> bool:
     """VAD 모델이 로드되었는지 여부"""
-    return _vad_model is not None
+    return _onnx_session is not None if VAD_BACKEND == 'onnx' else _vad_model is not None
 
 
 def preload():
     """서버 시작 시 VAD 모델을 미리 로드 (첫 요청 지연 방지)"""
     if VAD_ENABLED and not is_loaded():
-        logger.info("Preloading VAD model at startup...")
-        get_vad_model()
+        logger.info(f"Preloading VAD model at startup (backend={VAD_BACKEND})...")
+        if VAD_BACKEND == 'onnx':
+            get_onnx_session()
+        else:
+            get_vad_model()
         logger.info("VAD model preloaded successfully")
 
 
-def _pydub_to_tensor(audio_segment: AudioSegment) -> torch.Tensor:
-    """pydub AudioSegment → torch float32 텐서 [1, samples]"""
-    samples = audio_segment.get_array_of_samples()
+def get_runtime_info() -> dict:
+    """VAD 백엔드/모델 소스/로드 시간 (torch가 실제로 import되었는지 포함)"""
+    return {
+        'backend': VAD_BACKEND,
+        'modelSource': VAD_MODEL_PATH or 'torch.hub',
+        'modelLoadSeconds': round(_model_load_seconds, 3) if _model_load_seconds is not None else None,
+        'torchImported': 'torch' in sys.modules,
+    }
+
+
+# pydub 샘플 폭(바이트) → numpy 정수 타입 (pydub raw_data는 little-endian signed PCM)
+_SAMPLE_DTYPES = {1: np.int8, 2: np.dtype('<i2'), 4: np.dtype('<i4')}
+
+
+def _pydub_to_array(audio_segment: AudioSegment) -> np.ndarray:
+    """
+    pydub AudioSegment → numpy float32 배열 [samples]
+
+    raw_data 버퍼를 numpy 뷰로 읽어 float32 변환 한 번만 수행합니다
+    (샘플별 Python 객체 생성 없음).
+    """
     max_val = float(2 ** (audio_segment.sample_width * 8 - 1))
-    tensor = torch.FloatTensor(list(samples)) / max_val
-    return tensor.unsqueeze(0)
+    dtype = _SAMPLE_DTYPES.get(audio_segment.sample_width)
+    if dtype is None:
+        # 24-bit 등 numpy 타입이 없는 폭은 pydub 배열 경유
+        samples = np.asarray(audio_segment.get_array_of_samples(), dtype=np.float32)
+    else:
+        samples = np.frombuffer(audio_segment.raw_data, dtype=dtype).astype(np.float32)
+    samples *= 1.0 / max_val
+    return samples
+
 
+def _decode_for_vad(audio_data: bytes) -> AudioSegment:
+    """분석용 디코딩: ffmpeg에서 바로 16kHz mono로 변환 (원본 해상도 디코딩/리샘플 생략)"""
+    with _DECODE_SECONDS.time():
+        return AudioSegment.from_file(
+            io.BytesIO(audio_data), format='mp3',
+            parameters=['-ac', '1', '-ar', str(VAD_SAMPLE_RATE)]
+        )
+
+
+def _onnx_speech_probs(session, waveforms: List[np.ndarray]) -> List[np.ndarray]:
+    """
+    여러 파형의 512샘플 창별 음성 확률 계산 (창마다 세션 호출 한 번으로 배치 처리)
+
+    짧은 파형은 뒤를 0으로 채워 길이를 맞추고, 채운 창의 확률은 버립니다.
+    행마다 상태/문맥이 분리되어 있어 파형끼리 영향을 주지 않습니다.
+    """
+    counts = [max(1, -(-len(waveform) // _ONNX_WINDOW)) for waveform in waveforms]
+    windows = max(counts)
+    batch = len(waveforms)
+
+    padded = np.zeros((batch, windows * _ONNX_WINDOW), dtype=np.float32)
+    for row, waveform in enumerate(waveforms):
+        padded[row, :len(waveform)] = waveform
+
+    state = np.zeros((2, batch, _ONNX_STATE_SIZE), dtype=np.float32)
+    context = np.zeros((batch, _ONNX_CONTEXT), dtype=np.float32)
+    sample_rate = np.array(VAD_SAMPLE_RATE, dtype=np.int64)
+    probs = np.empty((batch, windows), dtype=np.float32)
+    for i in range(windows):
+        x = np.concatenate([context, padded[:, i * _ONNX_WINDOW:(i + 1) * _ONNX_WINDOW]], axis=1)
+        out, state = session.run(None, {'input': x, 'state': state, 'sr': sample_rate})
+        probs[:, i] = out[:, 0]
+        context = x[:, -_ONNX_CONTEXT:]
+    return [probs[row, :count] for row, count in enumerate(counts)]
 
-def _tensor_to_pydub(tensor: torch.Tensor, sample_rate: int) -> AudioSegment:
-    """torch float32 텐서 [1, samples] → pydub AudioSegment (16-bit mono)"""
-    samples = (tensor.squeeze().clamp(-1, 1) * 32767).to(torch.int16)
-    raw_data = struct.pack(f'<{len(samples)}h', *samples.tolist())
-    return AudioSegment(
-        data=raw_data,
-        sample_width=2,
-        frame_rate=sample_rate,
-        channels=1
-    )
 
+def _speech_timestamps(probs: np.ndarray, num_samples: int) -> list:
+    """
+    창별 음성 확률 → 음성 구간 타임스탬프 (silero get_speech_timestamps와 같은 규칙)
 
-def trim_silence(audio_data: bytes) -> bytes:
+    Returns:
+        [{'start': 샘플, 'end': 샘플}, ...] (16kHz 샘플 단위)
+    """
+    neg_threshold = max(_VAD_THRESHOLD - 0.15, 0.01)
+    min_speech_samples = VAD_SAMPLE_RATE * _VAD_MIN_SPEECH_MS / 1000
+    min_silence_samples = VAD_SAMPLE_RATE * _VAD_MIN_SILENCE_MS / 1000
+    pad_samples = int(VAD_SAMPLE_RATE * _VAD_SPEECH_PAD_MS / 1000)
+
+    speeches = []
+    current = None
+    temp_end = 0
+    for i, prob in enumerate(probs):
+        position = _ONNX_WINDOW * i
+        if prob >= _VAD_THRESHOLD:
+            temp_end = 0
+            if current is None:
+                current = {'start': position}
+            continue
+        if prob < neg_threshold and current is not None:
+            if not temp_end:
+                temp_end = position
+            if position - temp_end < min_silence_samples:
+                continue
+            if temp_end - current['start'] > min_speech_samples:
+                speeches.append({'start': current['start'], 'end': temp_end})
+            current = None
+            temp_end = 0
+    if current is not None and num_samples - current['start'] > min_speech_samples:
+        speeches.append({'start': current['start'], 'end': num_samples})
+
+    # 앞뒤 여유 구간: 인접 구간 사이 무음이 짧으면 절반씩 나눠 붙임
+    for i, speech in enumerate(speeches):
+        if i == 0:
+            speech['start'] = max(0, speech['start'] - pad_samples)
+        if i == len(speeches) - 1:
+            speech['end'] = min(num_samples, speech['end'] + pad_samples)
+            continue
+        following = speeches[i + 1]
+        gap = following['start'] - speech['end']
+        if gap < 2 * pad_samples:
+            speech['end'] += gap // 2
+            following['start'] = max(0, following['start'] - gap // 2)
+        else:
+            speech['end'] = min(num_samples, speech['end'] + pad_samples)
+            following['start'] = max(0, following['start'] - pad_samples)
+    return speeches
+
+
+class _VADJob:
+    """VAD 추론 대기열 항목"""
+
+    __slots__ = ('waveform', 'enqueued_at', 'done', 'result', 'error', 'cancelled')
+
+    def __init__(self, waveform: np.ndarray):
+        self.waveform = waveform
+        self.enqueued_at = time.monotonic()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        # 요청 쪽이 기다리다 포기함 (아직 대기열에 있으면 워커가 건너뜀)
+        self.cancelled = False
+
+
+# 워커 초기화 실패 표시 (대기 중이던 요청은 호출 스레드에서 다시 추론)
+_SERVICE_FAILED = RuntimeError('VAD inference worker unavailable')
+
+
+class VADInferenceService:
+    """
+    VAD 추론 전용 워커
+
+    요청 스레드는 파형을 대기열에 넣고 결과를 기다립니다. 워커는 대기 중인 파형을
+    최대 batch_max개까지 모아(micro-batch) 고정된 스레드 수로 처리하므로, 동시 미스가
+    몰려도 CPU 사용량이 일정하고 상태를 가진 Silero 모델에 대한 동시 호출도 발생하지
+    않습니다. torch 백엔드는 배치 안의 파형을 연달아, onnx 백엔드는 한 번에 추론합니다.
+
+    워커 초기화에 실패하면 서비스를 실패 상태로 두고, 이후 요청은 호출 스레드에서 직접
+    추론합니다 (모델 동시 호출은 락으로 막음).
+    """
+
+    def __init__(self, num_threads: int = 2, batch_max: int = 8, batch_wait_ms: float = 5,
+                 timeout: float = 10):
+        self.num_threads = num_threads
+        self.batch_max = max(1, batch_max)
+        self.batch_wait = batch_wait_ms / 1000
+        self.timeout = timeout
+        self._queue: "queue.Queue[_VADJob]" = queue.Queue()
+        self._run = self._run_onnx if VAD_BACKEND == 'onnx' else self._run_torch
+        self._inline_lock = threading.Lock()
+        self.failed = None
+
+        self._metrics_lock = threading.Lock()
+        self._batches = 0
+        self._processed = 0
+        self._last_batch_size = 0
+        self._max_batch_size = 0
+        self._queue_wait_total = 0.0
+        self._inference_total = 0.0
+        self._timeouts = 0
+        self._skipped = 0
+
+        self._thread = threading.Thread(target=self._worker, name='vad-inference', daemon=True)
+        self._thread.start()
+
+    def detect(self, waveform: np.ndarray) -> list:
+        """
+        파형 [samples] (16kHz)의 음성 구간 타임스탬프 반환 (워커 처리 완료까지 대기)
+
+        Raises:
+            TimeoutError: timeout초 안에 워커가 처리하지 못함 (대기열에 남은 작업은 취소되어 추론하지 않음)
+        """
+        job = _VADJob(waveform)
+        if self.failed is not None:
+            return self._detect_inline(job)
+        self._queue.put(job)
+        if not job.done.wait(self.timeout):
+            job.cancelled = True
+            with self._metrics_lock:
+                self._timeouts += 1
+            raise TimeoutError(f"VAD inference timed out after {self.timeout:.0f}s "
+                               f"(queue depth {self._queue.qsize()})")
+        if job.error is _SERVICE_FAILED:
+            return self._detect_inline(_VADJob(waveform))
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def _detect_inline(self, job: _VADJob) -> list:
+        """워커 없이 호출 스레드에서 추론 (서비스 실패 시)"""
+        with self._inline_lock:
+            self._run([job])
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def _take(self, job: _VADJob, batch: list) -> None:
+        """취소되지 않은 작업만 배치에 추가 (취소된 작업은 추론 없이 버림)"""
+        if job.cancelled:
+            with self._metrics_lock:
+                self._skipped += 1
+        else:
+            batch.append(job)
+
+    def _collect_batch(self) -> list:
+        """첫 항목을 기다린 뒤 batch_wait 동안 추가 항목을 모음 (시간 초과로 취소된 작업은 제외)"""
+        batch = []
+        while not batch:
+            self._take(self._queue.get(), batch)
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_max:
+            remaining = deadline - time.monotonic()
+            try:
+                self._take(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait(), batch)
+            except queue.Empty:
+                break
+        return batch
+
+    def _run_torch(self, batch: list) -> None:
+        model, utils = get_vad_model()
+        get_speech_timestamps = utils[0]
+        import torch
+        for job in batch:
+            try:
+                if hasattr(model, 'reset_states'):
+                    model.reset_states()
+                job.result = get_speech_timestamps(
+                    torch.from_numpy(job.waveform),
+                    model,
+                    sampling_rate=VAD_SAMPLE_RATE,
+                    threshold=_VAD_THRESHOLD,
+                    min_speech_duration_ms=_VAD_MIN_SPEECH_MS,
+                )
+            except Exception as e:
+                job.error = e
+
+    def _run_onnx(self, batch: list) -> None:
+        waveforms = [job.waveform for job in batch]
+        for job, probs in zip(batch, _onnx_speech_probs(get_onnx_session(), waveforms)):
+            job.result = _speech_timestamps(probs, len(job.waveform))
+
+    def _worker(self):
+        try:
+            if VAD_BACKEND != 'onnx':
+                import torch
+                torch.set_num_threads(self.num_threads)
+        except Exception as e:
+            logger.error(f"VAD inference worker failed to start, inferring on request threads: {e}")
+            self.failed = e
+            # 실패 전에 들어온 요청은 호출 스레드에서 다시 처리하도록 돌려보냄
+            while True:
+                job = self._queue.get()
+                job.error = _SERVICE_FAILED
+                job.done.set()
+        run = self._run
+        logger.info(
+            f"VAD inference worker started (backend={VAD_BACKEND}, "
+            f"threads={self.num_threads}, batch_max={self.batch_max})"
+        )
+        while True:
+            batch = self._collect_batch()
+            started = time.monotonic()
+            queue_wait = 0.0
+            for job in batch:
+                queue_wait += started - job.enqueued_at
+                _QUEUE_SECONDS.observe(started - job.enqueued_at)
+            try:
+                run(batch)
+            except Exception as e:
+                for job in batch:
+                    if job.result is None:
+                        job.error = e
+            finally:
+                for job in batch:
+                    job.done.set()
+
+            with self._metrics_lock:
+                self._batches += 1
+                self._processed += len(batch)
+                self._last_batch_size = len(batch)
+                self._max_batch_size = max(self._max_batch_size, len(batch))
+                self._queue_wait_total += queue_wait
+                self._inference_total += time.monotonic() - started
+
+    def get_metrics(self) -> dict:
+        """대기열 깊이, 배치 크기, 대기/추론 시간 지표"""
+        with self._metrics_lock:
+            processed = self._processed
+            batches = self._batches
+            return {
+                'queueDepth': self._queue.qsize(),
+                'batches': batches,
+                'processed': processed,
+                'lastBatchSize': self._last_batch_size,
+                'maxBatchSize': self._max_batch_size,
+                'avgBatchSize': round(processed / batches, 2) if batches else 0.0,
+                'avgQueueWaitMs': round(self._queue_wait_total / processed * 1000, 2) if processed else 0.0,
+                'avgInferenceMs': round(self._inference_total / processed * 1000, 2) if processed else 0.0,
+                'timeouts': self._timeouts,
+                'skippedCancelled': self._skipped,
+                'backend': VAD_BACKEND,
+                'torchThreads': self.num_threads,
+                'failed': self.failed is not None,
+            }
+
+
+_vad_service = None
+_vad_service_lock = threading.Lock()
+
+
+def get_vad_service() -> VADInferenceService:
+    """VAD 추론 서비스 lazy 시작"""
+    global _vad_service
+    if _vad_service is None:
+        with _vad_service_lock:
+            if _vad_service is None:
+                _vad_service = VADInferenceService(VAD_TORCH_THREADS, VAD_BATCH_MAX, VAD_BATCH_WAIT_MS,
+                                                   VAD_INFERENCE_TIMEOUT)
+    return _vad_service
+
+
+def get_service_metrics() -> dict:
+    """VAD 추론 서비스 지표 (아직 시작 전이면 빈 dict)"""
+    return _vad_service.get_metrics() if _vad_service is not None else {}
+
+
+def _detect_speech(segment: AudioSegment) -> list:
+    """AudioSegment에서 음성 구간 타임스탬프(16kHz 샘플 단위) 감지"""
+    # VAD 분석용: 16kHz mono로 다운샘플링 (분석만 사용, 출력에는 사용하지 않음)
+    vad_segment = segment.set_frame_rate(VAD_SAMPLE_RATE).set_channels(1)
+    waveform = _pydub_to_array(vad_segment)
+
+    # 추론은 전용 워커에서 micro-batch로 실행 (대기열 대기 포함)
+    with _INFERENCE_SECONDS.time():
+        return get_vad_service().detect(waveform)
+
+
+def _to_ms(samples: int) -> float:
+    """VAD 타임스탬프(16kHz 샘플 단위) → 밀리초"""
+    return samples * 1000 / VAD_SAMPLE_RATE
+
+
+def _full_speech_bounds(audio_data: bytes):
+    """
+    전체 파형을 분석해 음성 구간 경계 계산
+
+    Returns:
+        (첫 음성 시작 ms, 마지막 음성 끝 ms, 전체 길이 ms) 또는 음성이 없으면 None
+    """
+    vad_segment = _decode_for_vad(audio_data)
+    speech_timestamps = _detect_speech(vad_segment)
+    if not speech_timestamps:
+        return None
+    return _to_ms(speech_timestamps[0]['start']), _to_ms(speech_timestamps[-1]['end']), len(vad_segment)
+
+
+def _edge_speech_bounds(audio_data: bytes):
+    """
+    앞뒤 VAD_EDGE_WINDOW_MS 구간만 프레임 단위로 잘라 디코딩/분석해 음성 구간 경계 계산
+
+    클립 길이와 무관하게 분석 비용이 일정합니다. 클립이 짧거나 어느 한쪽 구간에서
+    음성을 찾지 못하면(경계가 구간 밖에 있음) None을 반환해 전체 분석으로 넘깁니다.
+    """
+    window = VAD_EDGE_WINDOW_MS
+    total_ms = mp3_frames.duration_ms(audio_data)
+    if total_ms <= window * 2:
+        return None
+
+    head_ts = _detect_speech(_decode_for_vad(mp3_frames.cut(audio_data, 0, window)))
+    if not head_ts:
+        return None
+
+    tail_offset = mp3_frames.frame_start_ms(audio_data, total_ms - window - _EDGE_WARMUP_MS)
+    tail_ts = _detect_speech(_decode_for_vad(mp3_frames.cut(audio_data, tail_offset)))
+    if not tail_ts:
+        return None
+
+    return _to_ms(head_ts[0]['start']), tail_offset + _to_ms(tail_ts[-1]['end']), total_ms
+
+
+class UntrimmedAudio(bytes):
+    """
+    트리밍에 실패해 원본 그대로 반환된 오디오
+
+    bytes와 똑같이 쓰이며, 응답 헤더(X-VAD-Trim)와 캐시 저장에서 트리밍 전 상태로 표시하는 데 사용합니다.
+    """
+
+
+def trim_silence(audio_data: bytes, strict: bool = False) -> bytes:
     """
     Silero VAD로 앞뒤 무음/숨소리를 트리밍합니다.
 
     Args:
         audio_data: MP3 오디오 바이너리
+        strict: 트리밍 실패 시 원본을 반환하지 않고 예외를 그대로 전달
 
     Returns:
-        트리밍된 MP3 오디오 바이너리
+        트리밍된 MP3 오디오 바이너리 (트리밍할 무음이 없으면 원본 객체 그대로,
+        실패하면 원본 내용의 UntrimmedAudio)
     """
     if not VAD_ENABLED:
         return audio_data
 
     try:
-        model, utils = get_vad_model()
-        get_speech_timestamps = utils[0]
+        lossless = VAD_LOSSLESS_TRIM and mp3_frames.has_frames(audio_data)
 
-        # MP3 → 원본 AudioSegment 보존
-        original_segment = AudioSegment.from_mp3(io.BytesIO(audio_data))
-        original_rate = original_segment.frame_rate
-
-        # VAD 분석용: 16kHz mono로 다운샘플링 (분석만 사용, 출력에는 사용하지 않음)
-        vad_segment = original_segment.set_frame_rate(VAD_SAMPLE_RATE).set_channels(1)
-        waveform = _pydub_to_tensor(vad_segment)
-
-        # VAD로 음성 구간 감지
-        speech_timestamps = get_speech_timestamps(
-            waveform.squeeze(),
-            model,
-            sampling_rate=VAD_SAMPLE_RATE,
-            threshold=0.3,
-            min_speech_duration_ms=50,
-        )
+        # VAD로 음성 구간 감지 (가능하면 앞뒤 구간만, 아니면 전체를 16kHz mono로 분석)
+        bounds = _edge_speech_bounds(audio_data) if lossless and VAD_EDGE_WINDOW_MS > 0 else None
+        if bounds is None:
+            bounds = _full_speech_bounds(audio_data)
 
-        if not speech_timestamps:
+        if bounds is None:
             logger.warning("VAD: No speech detected, returning original audio")
             return audio_data
 
-        # VAD 타임스탬프(16kHz 기준)를 밀리초로 변환 → 원본 AudioSegment에서 트리밍
+        speech_start_ms, speech_end_ms, duration_ms = bounds
         padding_ms = VAD_PADDING_MS
-        start_ms = max(0, int(speech_timestamps[0]['start'] * 1000 / VAD_SAMPLE_RATE) - padding_ms)
-        end_ms = min(len(original_segment), int(speech_timestamps[-1]['end'] * 1000 / VAD_SAMPLE_RATE) + padding_ms)
+        start_ms = max(0, int(speech_start_ms) - padding_ms)
+        end_ms = min(duration_ms, int(speech_end_ms) + padding_ms)
+
+        # 압축 비트스트림을 프레임 경계에서 절단 (재인코딩 없음, 비트레이트 유지)
+        if lossless:
+            if start_ms <= 0 and end_ms >= duration_ms:
+                return audio_data
+            with _CUT_SECONDS.time():
+                trimmed = mp3_frames.cut(audio_data, start_ms, end_ms)
+            _REMOVED_BYTES.inc(len(audio_data) - len(trimmed))
+            logger.info(
+                f"VAD trim (frame cut): {int(duration_ms)}ms → ~{int(end_ms - start_ms)}ms, "
+                f"{len(audio_data)} → {len(trimmed)} bytes"
+            )
+            return trimmed
 
+        # 프레임을 해석할 수 없으면 원본 해상도로 디코딩 후 재인코딩
+        reencode_started = time.perf_counter()
+        original_segment = AudioSegment.from_mp3(io.BytesIO(audio_data))
         trimmed_segment = original_segment[start_ms:end_ms]
 
         # 트리밍 결과 로깅
@@ -128,8 +614,92 @@ def trim_silence(audio_data: bytes) -> bytes:
         # 원본 포맷 그대로 MP3 재인코딩 (원본 샘플레이트 유지)
         output_buffer = io.BytesIO()
         trimmed_segment.export(output_buffer, format='mp3', bitrate='192k')
+        _REENCODE_SECONDS.observe(time.perf_counter() - reencode_started)
         return output_buffer.getvalue()
 
     except Exception as e:
+        if strict:
+            raise
         logger.error(f"VAD trim failed, returning original audio: {e}")
-        return audio_data
+        return UntrimmedAudio(audio_data)
+
+
+def trim_leading_silence(head_data: bytes) -> bytes:
+    """
+    스트리밍 첫 구간의 선행 무음만 MP3 프레임 단위로 제거합니다.
+
+    재인코딩하지 않으므로 뒤이어 전달될 백엔드 청크와 그대로 이어붙일 수 있습니다.
+    구간 안에서 음성을 찾지 못하면 원본을 반환합니다.
+
+    Args:
+        head_data: 스트림 앞부분 MP3 바이트 (마지막 프레임이 잘려 있어도 됨)
+
+    Returns:
+        선행 무음 프레임이 제거된 MP3 바이트
+    """
+    if not VAD_ENABLED:
+        return head_data
+
+    try:
+        speech_timestamps = _detect_speech(_decode_for_vad(head_data))
+        if not speech_timestamps:
+            return head_data
+
+        start_ms = max(0, int(_to_ms(speech_timestamps[0]['start'])) - VAD_PADDING_MS)
+        with _CUT_SECONDS.time():
+            trimmed = mp3_frames.cut_head(head_data, start_ms)
+        _REMOVED_BYTES.inc(len(head_data) - len(trimmed))
+        logger.info(f"VAD stream head trim: removed ~{start_ms}ms leading silence")
+        return trimmed
+
+    except Exception as e:
+        logger.error(f"VAD head trim failed, returning original audio: {e}")
+        return head_data
+
+
+class BackgroundTrimmer:
+    """
+    요청 경로 밖에서 VAD 트리밍을 수행하는 워커 풀
+
+    같은 (키, 버전)의 작업은 하나만 대기열에 올라가며, 대기 중에 항목이 다시 저장되어
+    버전이 바뀌면 새 버전은 따로 등록됩니다. 트리밍을 마치면 결과(트리밍할 무음이
+    없었으면 원본 객체 그대로)로 on_trimmed 콜백을 호출하고, 실패하면 호출하지 않습니다.
+    """
+
+    def __init__(self, workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='vad-trim')
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, audio_data: bytes, on_trimmed: Callable[[str, bytes], None],
+               version: Hashable = None) -> bool:
+        """
+        트리밍 작업 등록
+
+        Args:
+            version: 같은 키의 저장본 구분 값 (캐시 파일 토큰)
+
+        Returns:
+            새로 등록했으면 True (같은 버전이 이미 대기 중이면 False)
+        """
+        job = (key, version)
+        with self._lock:
+            if job in self._pending:
+                return False
+            self._pending.add(job)
+        self._executor.submit(self._run, job, audio_data, on_trimmed)
+        return True
+
+    def _run(self, job: tuple, audio_data: bytes, on_trimmed: Callable[[str, bytes], None]) -> None:
+        key = job[0]
+        try:
+            on_trimmed(key, trim_silence(audio_data, strict=True))
+        except Exception as e:
+            logger.error(f"Background VAD trim failed for {key[:16]}...: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(job)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)